@@ -35,7 +35,9 @@ class AdminRequestAdmin(admin.ModelAdmin):
 
     list_display = ('user', 'company', 'status', 'requested_at', 'responded_at')
     list_filter = ('status', 'requested_at', 'responded_at')
+    list_select_related = ('user', 'company')
     search_fields = ('user__email', 'company__name', 'message')
+    autocomplete_fields = ('user', 'company')
     ordering = ('-requested_at',)
     readonly_fields = ('requested_at', 'responded_at')
 
@@ -2,6 +2,7 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from companies.models import Company
+from main.serializers import BulkIdsSerializer, SparseFieldsetMixin
 from .models import AdminRequest
 
 User = get_user_model()
@@ -165,7 +166,7 @@ class AdminRegistrationSerializer(serializers.Serializer):
         }
 
 
-class AdminRequestSerializer(serializers.ModelSerializer):
+class AdminRequestSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for AdminRequest model"""
 
     user_email = serializers.EmailField(source='user.email', read_only=True)
@@ -179,6 +180,7 @@ class AdminRequestSerializer(serializers.ModelSerializer):
             'status', 'message', 'response_message', 'requested_at', 'responded_at'
         )
         read_only_fields = ('id', 'requested_at', 'responded_at')
+        field_lookups = {'user_name': ('user__first_name', 'user__last_name')}
 
 
 class AdminRequestResponseSerializer(serializers.Serializer):
@@ -188,6 +190,10 @@ class AdminRequestResponseSerializer(serializers.Serializer):
     response_message = serializers.CharField(required=False, allow_blank=True)
 
 
+class AdminRequestBulkResponseSerializer(BulkIdsSerializer, AdminRequestResponseSerializer):
+    """Serializer for responding to many admin requests at once"""
+
+
 class ChangePasswordSerializer(serializers.Serializer):
     """Serializer for password change"""
 
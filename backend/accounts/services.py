@@ -0,0 +1,65 @@
+"""
+Bulk state transitions for admin access requests.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from companies.models import Company
+from main.realtime import company_channels, publish, row_event
+from outbox.models import OutboxEvent
+from .models import AdminRequest
+
+ALREADY_ANSWERED = 'This request has already been responded to.'
+
+
+def bulk_respond_to_admin_requests(ids, status, response_message='', responded_by=None):
+    """
+    Apply one decision to many admin requests with a fixed number of
+    set-based queries in one transaction. Approval grants each user access to
+    the requested company and activates them, as a single response does.
+    Returns ``{id: error}`` for the requests that were no longer pending.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        rows = {
+            pk: (user_id, company_id)
+            for pk, user_id, company_id in AdminRequest.objects.filter(
+                pk__in=ids, status='pending'
+            ).order_by('pk').select_for_update().values_list('pk', 'user_id', 'company_id')
+        }
+        errors = {pk: ALREADY_ANSWERED for pk in ids if pk not in rows}
+
+        AdminRequest.objects.filter(pk__in=rows).update(
+            status=status, response_message=response_message, responded_at=now
+        )
+
+        if status == 'approved' and rows:
+            Access = Company.approved_admins.through
+            Access.objects.bulk_create(
+                [Access(user_id=user_id, company_id=company_id) for user_id, company_id in rows.values()],
+                ignore_conflicts=True,
+            )
+            get_user_model().objects.filter(
+                pk__in={user_id for user_id, _ in rows.values()}, is_active=False
+            ).update(is_active=True)
+
+        OutboxEvent.objects.record_many(AdminRequest, (
+            (pk, f'admin_request.{status}', {
+                'previous_status': 'pending',
+                'status': status,
+                'user_id': user_id,
+                'company_id': company_id,
+                'responded_by': responded_by,
+            })
+            for pk, (user_id, company_id) in rows.items()
+        ))
+        # update() bypasses post_save, so publish explicitly
+        for pk, (user_id, company_id) in rows.items():
+            publish(
+                company_channels(company_id) | {f"user:{user_id}"},
+                row_event(AdminRequest, pk, status),
+            )
+
+    return errors
@@ -0,0 +1,17 @@
+"""
+Publish real-time events when admin access requests change.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from main.realtime import company_channels, model_event, publish
+from .models import AdminRequest
+
+
+def admin_request_channels(admin_request):
+    return company_channels(admin_request.company_id) | {f"user:{admin_request.user_id}"}
+
+
+@receiver(post_save, sender=AdminRequest)
+def publish_admin_request(sender, instance, created=False, **kwargs):
+    publish(admin_request_channels(instance), model_event(instance, created))
@@ -3,15 +3,20 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.utils import timezone
 from rest_framework_simplejwt.views import TokenObtainPairView
+from main.mixins import BulkRespondMixin, QueryPlanMixin, ReplicaReadMixin
+from outbox.models import OutboxEvent
 from .models import User, AdminRequest
+from .services import bulk_respond_to_admin_requests
 from .serializers import (
     UserSerializer,
     CompanyUserRegistrationSerializer,
     AdminRegistrationSerializer,
     AdminRequestSerializer,
     AdminRequestResponseSerializer,
+    AdminRequestBulkResponseSerializer,
     ChangePasswordSerializer
 )
 
@@ -34,7 +39,7 @@ class AdminRegistrationView(generics.CreateAPIView):
     serializer_class = AdminRegistrationSerializer
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """API endpoint for user management"""
 
     queryset = User.objects.all()
@@ -85,12 +90,20 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class AdminRequestViewSet(viewsets.ModelViewSet):
+class AdminRequestViewSet(ReplicaReadMixin, BulkRespondMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """API endpoint for admin access request management"""
 
     queryset = AdminRequest.objects.all()
     serializer_class = AdminRequestSerializer
     permission_classes = [IsAuthenticated]
+    bulk_respond_serializer_class = AdminRequestBulkResponseSerializer
+    bulk_respond_service = staticmethod(bulk_respond_to_admin_requests)
+    respond_owner_field = 'company__admin_user'
+
+    def get_serializer_class(self):
+        if self.action == 'bulk_respond':
+            return AdminRequestBulkResponseSerializer
+        return super().get_serializer_class()
 
     def get_queryset(self):
         """Filter admin requests based on user role"""
@@ -102,14 +115,14 @@ class AdminRequestViewSet(viewsets.ModelViewSet):
 
         if user.role == 'company_user':
             # Company users see requests for their companies
-            return AdminRequest.objects.filter(
+            return self.plan_queryset(AdminRequest.objects.filter(
                 company__admin_user=user
-            ).select_related('user', 'company')
+            ).select_related('user', 'company'))
         else:
             # Admins see their own requests
-            return AdminRequest.objects.filter(
+            return self.plan_queryset(AdminRequest.objects.filter(
                 user=user
-            ).select_related('user', 'company')
+            ).select_related('user', 'company'))
 
     @action(detail=False, methods=['get'])
     def pending(self, request):
@@ -139,17 +152,26 @@ class AdminRequestViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Update request status
-            admin_request.status = serializer.validated_data['status']
-            admin_request.response_message = serializer.validated_data.get('response_message', '')
-            admin_request.responded_at = timezone.now()
-            admin_request.save()
-
-            # If approved, add user to company's approved_admins and activate user
-            if admin_request.status == 'approved':
-                admin_request.company.approved_admins.add(admin_request.user)
-                admin_request.user.is_active = True
-                admin_request.user.save()
+            with transaction.atomic():
+                # Update request status
+                admin_request.status = serializer.validated_data['status']
+                admin_request.response_message = serializer.validated_data.get('response_message', '')
+                admin_request.responded_at = timezone.now()
+                admin_request.save()
+
+                # If approved, add user to company's approved_admins and activate user
+                if admin_request.status == 'approved':
+                    admin_request.company.approved_admins.add(admin_request.user)
+                    admin_request.user.is_active = True
+                    admin_request.user.save()
+
+                OutboxEvent.objects.record(admin_request, f'admin_request.{admin_request.status}', {
+                    'previous_status': 'pending',
+                    'status': admin_request.status,
+                    'user_id': admin_request.user_id,
+                    'company_id': admin_request.company_id,
+                    'responded_by': request.user.pk,
+                })
 
             response_serializer = AdminRequestSerializer(admin_request)
             return Response(response_serializer.data)
@@ -6,7 +6,9 @@ from .models import Company
 class CompanyAdmin(admin.ModelAdmin):
     list_display = ('name', 'email', 'admin_user', 'is_active', 'created_at')
     list_filter = ('is_active', 'created_at')
+    list_select_related = ('admin_user',)
     search_fields = ('name', 'email', 'admin_user__email')
+    autocomplete_fields = ('admin_user',)
     readonly_fields = ('created_at', 'updated_at')
     
     fieldsets = (
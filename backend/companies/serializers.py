@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from main.serializers import SparseFieldsetMixin
 from .models import Company
 
 
-class CompanySerializer(serializers.ModelSerializer):
+class CompanySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Company model"""
     
     admin_user_email = serializers.EmailField(source='admin_user.email', read_only=True)
@@ -16,6 +17,7 @@ class CompanySerializer(serializers.ModelSerializer):
             'is_active', 'created_at', 'updated_at'
         )
         read_only_fields = ('id', 'created_at', 'updated_at')
+        field_lookups = {'admin_user_name': ('admin_user__first_name', 'admin_user__last_name')}
 
 
 class CompanyCreateSerializer(serializers.ModelSerializer):
@@ -1,11 +1,12 @@
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from main.mixins import QueryPlanMixin, ReplicaReadMixin
 from .models import Company
 from .serializers import CompanySerializer, CompanyCreateSerializer
 
 
-class CompanyViewSet(viewsets.ModelViewSet):
+class CompanyViewSet(ReplicaReadMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """API endpoint for company management"""
     
     queryset = Company.objects.all()
@@ -26,10 +27,10 @@ class CompanyViewSet(viewsets.ModelViewSet):
 
         # Admins can see all companies
         if user.role == 'admin':
-            return Company.objects.all()
+            return self.plan_queryset(Company.objects.all())
 
         # Regular users can only see their own companies
-        return Company.objects.filter(admin_user=user)
+        return self.plan_queryset(Company.objects.filter(admin_user=user))
     
     def perform_create(self, serializer):
         """Set the admin_user to the current user"""
@@ -1,13 +1,35 @@
 from django.contrib import admin
-from .models import Employee, BenchRequest, ResourceListing, ResourceRequest
+from main.admin_filters import AutocompleteFilterMixin, AutocompleteListFilter
+from main.pagination import EstimatedCountPaginator
+from .models import Employee, EmployeeStatusChange, BenchRequest, ResourceListing, ResourceRequest
+
+
+class EmployeeStatusChangeInline(admin.TabularInline):
+    """Read-only status history"""
+
+    model = EmployeeStatusChange
+    fields = ('from_status', 'to_status', 'changed_at')
+    readonly_fields = fields
+    ordering = ('-changed_at', '-id')
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(Employee)
-class EmployeeAdmin(admin.ModelAdmin):
+class EmployeeAdmin(AutocompleteFilterMixin, admin.ModelAdmin):
     list_display = ('get_full_name', 'email', 'job_title', 'company', 'status', 'experience_level', 'is_active')
-    list_filter = ('status', 'experience_level', 'company', 'is_active', 'created_at')
+    list_filter = ('status', 'experience_level', ('company', AutocompleteListFilter), 'is_active', 'created_at')
+    list_select_related = ('company',)
     search_fields = ('first_name', 'last_name', 'email', 'job_title', 'skills')
+    autocomplete_fields = ('company',)
     readonly_fields = ('created_at', 'updated_at')
+    inlines = (EmployeeStatusChangeInline,)
+    # Planner estimates instead of COUNT(*) on large changelists
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     fieldsets = (
         ('Personal Information', {
@@ -29,11 +51,15 @@ class EmployeeAdmin(admin.ModelAdmin):
 
 
 @admin.register(BenchRequest)
-class BenchRequestAdmin(admin.ModelAdmin):
+class BenchRequestAdmin(AutocompleteFilterMixin, admin.ModelAdmin):
     list_display = ('employee', 'requesting_company', 'status', 'requested_at', 'responded_at')
-    list_filter = ('status', 'requested_at', 'responded_at')
+    list_filter = ('status', ('requesting_company', AutocompleteListFilter), 'requested_at', 'responded_at')
+    list_select_related = ('employee', 'requesting_company')
     search_fields = ('employee__first_name', 'employee__last_name', 'requesting_company__name')
+    autocomplete_fields = ('employee', 'requesting_company')
     readonly_fields = ('requested_at', 'responded_at')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     fieldsets = (
         ('Request Details', {
@@ -49,12 +75,17 @@ class BenchRequestAdmin(admin.ModelAdmin):
 
 
 @admin.register(ResourceListing)
-class ResourceListingAdmin(admin.ModelAdmin):
+class ResourceListingAdmin(AutocompleteFilterMixin, admin.ModelAdmin):
     list_display = ('title', 'company', 'total_resources', 'start_date', 'status', 'is_active', 'created_at')
-    list_filter = ('status', 'is_active', 'start_date', 'created_at', 'company')
+    list_filter = ('status', 'is_active', 'start_date', 'created_at', ('company', AutocompleteListFilter))
+    list_select_related = ('company',)
     search_fields = ('title', 'description', 'skills_summary', 'company__name')
     readonly_fields = ('total_resources', 'skills_summary', 'created_at', 'updated_at')
-    filter_horizontal = ('employees',)
+    # Planner estimates instead of COUNT(*) on large changelists
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    # Searched as you type; filter_horizontal would load every employee
+    autocomplete_fields = ('company', 'employees')
 
     fieldsets = (
         ('Basic Information', {
@@ -82,11 +113,16 @@ class ResourceListingAdmin(admin.ModelAdmin):
 
 
 @admin.register(ResourceRequest)
-class ResourceRequestAdmin(admin.ModelAdmin):
+class ResourceRequestAdmin(AutocompleteFilterMixin, admin.ModelAdmin):
     list_display = ('resource_listing', 'requesting_company', 'status', 'requested_at', 'responded_at')
-    list_filter = ('status', 'requested_at', 'responded_at', 'requesting_company')
+    list_filter = ('status', 'requested_at', 'responded_at', ('requesting_company', AutocompleteListFilter))
+    # ResourceListing.__str__ reads its company
+    list_select_related = ('resource_listing__company', 'requesting_company')
     search_fields = ('resource_listing__title', 'requesting_company__name')
+    autocomplete_fields = ('resource_listing', 'requesting_company')
     readonly_fields = ('requested_at', 'responded_at')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     fieldsets = (
         ('Request Details', {
@@ -0,0 +1,229 @@
+"""
+Bench duration and allocation throughput from the employee status history.
+
+Each query pairs history rows with the neighbouring row of the same employee
+using window functions (``LEAD``/``LAG`` partitioned by employee), and then
+aggregates in the same statement. Timelines are never walked in Python.
+
+Only rows in ``[start, end)`` are scanned, through the ``(company,
+changed_at)`` index. The state each employee was in at ``start`` comes from
+one probe of the ``(employee, changed_at)`` index per employee, so the cost of
+a report follows its range rather than the whole history. Employees probed are
+those now in scope and those with rows in the range.
+"""
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import connections, router
+from django.db.models import F, Window
+from django.db.models.functions import Lead
+from django.utils import timezone
+
+from .models import BENCH_STATUSES, Employee, EmployeeStatusChange
+
+SECONDS_PER_DAY = 86400
+
+# Seconds between two timestamp expressions
+SECONDS_BETWEEN = {
+    'postgresql': "EXTRACT(EPOCH FROM ({end}) - ({start}))",
+    'sqlite': "((julianday({end}) - julianday({start})) * 86400.0)",
+}
+
+# The rows in [start, end), and each employee's last row before ``start``
+# (the correlated LIMIT 1 runs as a nested loop over the employee index, like
+# a LATERAL join, and works on SQLite too). ``{rows}`` narrows both sides.
+SCANNED_SQL = """
+in_range AS (
+    SELECT employee_id, company_id, from_status, to_status, changed_at, id
+    FROM {history}
+    WHERE {scope} AND {rows} AND changed_at >= %s AND changed_at < %s
+), seed AS (
+    SELECT employee_id, company_id, from_status, to_status, changed_at, id
+    FROM {history}
+    WHERE id IN (
+        SELECT (
+            SELECT h.id FROM {history} h
+            WHERE h.employee_id = e.id AND {scope} AND {rows} AND h.changed_at < %s
+            ORDER BY h.changed_at DESC, h.id DESC
+            LIMIT 1
+        )
+        FROM {employees} e
+        WHERE {employees_scope} OR e.id IN (SELECT employee_id FROM in_range)
+    )
+), scanned AS (
+    SELECT * FROM seed
+    UNION ALL
+    SELECT * FROM in_range
+)"""
+
+# Clip each bench interval to [start, end) and total it per employee.
+# Rows after ``end`` are never scanned, so an interval still open at ``end``
+# has no successor and is closed at ``end``.
+BENCH_SECONDS_SQL = """
+WITH {scanned}, intervals AS (
+    SELECT employee_id, company_id, to_status, changed_at AS started_at,
+           LEAD(changed_at) OVER (PARTITION BY employee_id ORDER BY changed_at, id) AS ended_at
+    FROM scanned
+), clipped AS (
+    SELECT employee_id, company_id,
+           CASE WHEN started_at < %s THEN %s ELSE started_at END AS started_at,
+           COALESCE(ended_at, %s) AS ended_at
+    FROM intervals
+    WHERE to_status IN ({bench})
+), per_employee AS (
+    SELECT company_id, employee_id, SUM({seconds}) AS bench_seconds
+    FROM clipped
+    WHERE ended_at > started_at
+    GROUP BY company_id, employee_id
+)
+"""
+
+BENCH_SUMMARY_SQL = """
+SELECT company_id, COUNT(*), AVG(bench_seconds), MAX(bench_seconds), SUM(bench_seconds)
+FROM per_employee
+GROUP BY company_id
+ORDER BY company_id
+"""
+
+BENCH_PER_EMPLOYEE_SQL = "SELECT employee_id, bench_seconds FROM per_employee"
+
+# Keep only the rows where an employee enters or leaves the bench; on those,
+# LAG() of an allocation is when its bench spell began.
+FLIPS = "(to_status IN ({bench})) <> (from_status IN ({bench}))"
+
+ALLOCATIONS_SQL = """
+WITH {scanned}, flips AS (
+    SELECT to_status, changed_at,
+           LAG(changed_at) OVER (PARTITION BY employee_id ORDER BY changed_at, id) AS bench_since
+    FROM scanned
+)
+SELECT {period} AS period, COUNT(*), AVG({seconds})
+FROM flips
+WHERE to_status = 'allocated' AND changed_at >= %s
+GROUP BY 1
+ORDER BY 1
+"""
+
+
+def _connection(using):
+    # Follows the read router (replicas) unless an alias is given
+    return connections[using or router.db_for_read(EmployeeStatusChange)]
+
+
+def _scope(company_ids=None, employee_id=None, employee='employee_id', company='company_id'):
+    """WHERE clause (and params) limiting the rows scanned"""
+    if employee_id is not None:
+        return f"{employee} = %s", [employee_id]
+    if company_ids is None:
+        return "1 = 1", []
+    company_ids = list(company_ids) or [None]
+    return f"{company} IN ({', '.join(['%s'] * len(company_ids))})", company_ids
+
+
+def _format(sql, **extra):
+    return sql.format(bench=', '.join(f"'{status}'" for status in BENCH_STATUSES), **extra)
+
+
+def _scanned(connection, start, end, rows="1 = 1", company_ids=None, employee_id=None):
+    """``(sql, params)`` of the scanned CTE; ``start`` and ``end`` are already adapted"""
+    scope, scope_params = _scope(company_ids, employee_id)
+    employees_scope, employees_params = _scope(company_ids, employee_id, employee='e.id', company='e.company_id')
+    sql = _format(
+        SCANNED_SQL,
+        history=connection.ops.quote_name(EmployeeStatusChange._meta.db_table),
+        employees=connection.ops.quote_name(Employee._meta.db_table),
+        scope=scope,
+        employees_scope=employees_scope,
+        rows=_format(rows),
+    )
+    return sql, [*scope_params, start, end, *scope_params, start, *employees_params]
+
+
+def _days(seconds):
+    return round(float(seconds) / SECONDS_PER_DAY, 2) if seconds is not None else None
+
+
+def _bench_seconds(connection, start, end, company_ids=None, employee_id=None):
+    """``(sql, params)`` of the per_employee CTE"""
+    # Intervals still open are counted up to now, not into the future
+    end = min(end, timezone.now())
+    start, end = (connection.ops.adapt_datetimefield_value(value) for value in (start, end))
+    scanned, params = _scanned(connection, start, end, company_ids=company_ids, employee_id=employee_id)
+    seconds = SECONDS_BETWEEN[connection.vendor].format(start='started_at', end='ended_at')
+    sql = _format(BENCH_SECONDS_SQL, scanned=scanned, seconds=seconds)
+    return sql, [*params, start, start, end]
+
+
+def bench_duration_by_company(start, end, company_ids=None, using=None):
+    """
+    Per company: employees with bench time in ``[start, end)``, and their
+    average, longest and total bench days in that range
+    """
+    connection = _connection(using)
+    sql, params = _bench_seconds(connection, start, end, company_ids)
+    with connection.cursor() as cursor:
+        cursor.execute(sql + BENCH_SUMMARY_SQL, params)
+        rows = cursor.fetchall()
+    return [
+        {
+            'company': company_id,
+            'employees': employees,
+            'avg_bench_days': _days(average),
+            'max_bench_days': _days(longest),
+            'total_bench_days': _days(total),
+        }
+        for company_id, employees, average, longest, total in rows
+    ]
+
+
+def employee_bench_days(employee_id, end=None, using=None):
+    """Total days ``employee_id`` has spent on the bench up to ``end`` (now)"""
+    connection = _connection(using)
+    start = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+    sql, params = _bench_seconds(connection, start, end or timezone.now(), employee_id=employee_id)
+    with connection.cursor() as cursor:
+        cursor.execute(sql + BENCH_PER_EMPLOYEE_SQL, params)
+        row = cursor.fetchone()
+    return _days(row[1]) if row else 0.0
+
+
+def status_timeline(employee_id, using=None):
+    """``employee_id``'s status changes, each with when it was superseded"""
+    return list(
+        EmployeeStatusChange.objects.using(using)
+        .filter(employee_id=employee_id)
+        .annotate(ended_at=Window(Lead('changed_at'), order_by=[F('changed_at').asc(), F('id').asc()]))
+        .values('from_status', 'to_status', 'changed_at', 'ended_at')
+    )
+
+
+def allocation_throughput(start, end, period, company_ids=None, using=None):
+    """
+    Allocations from the bench per ``period`` ('day', 'week' or 'month') in
+    ``[start, end)``, with the average bench days that preceded them
+    """
+    connection = _connection(using)
+    start, end = (connection.ops.adapt_datetimefield_value(value) for value in (start, end))
+    scanned, params = _scanned(connection, start, end, FLIPS, company_ids=company_ids)
+    period_sql, period_params = connection.ops.datetime_trunc_sql(
+        period, 'changed_at', (), timezone.get_current_timezone_name()
+    )
+    seconds = SECONDS_BETWEEN[connection.vendor].format(start='bench_since', end='changed_at')
+    sql = _format(ALLOCATIONS_SQL, scanned=scanned, period=period_sql, seconds=seconds)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*params, *period_params, start])
+        rows = cursor.fetchall()
+    return [
+        {
+            'period': _period_start(value),
+            'allocations': allocations,
+            'avg_bench_days': _days(average),
+        }
+        for value, allocations, average in rows
+    ]
+
+
+def _period_start(value):
+    # A timestamp on PostgreSQL, text on SQLite
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.date().isoformat()
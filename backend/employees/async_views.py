@@ -0,0 +1,131 @@
+"""
+Native async read endpoints for the ASGI stack.
+
+These serve the hot read paths (employee list/detail, listing browse and
+pending bench requests) without crossing into a worker thread for the whole
+request. Querysets, filters and serializers come from the regular viewsets,
+so visibility rules and output are identical; only the database round-trips
+are awaited (``acount``, ``aget`` and ``async for``).
+"""
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from main.async_api import async_api_view, json_response
+from main.pagination import count_rows, settle_count
+from main.serializers import select_fields
+from .models import Employee
+from .views import BenchRequestViewSet, EmployeeViewSet, ResourceListingViewSet
+
+
+def _viewset(viewset_class, request, user, action, **kwargs):
+    """
+    Instantiate ``viewset_class`` for ``action`` without dispatching it, so
+    its (lazy) ``get_queryset``/``filter_queryset`` can be reused.
+    """
+    drf_request = Request(request)
+    drf_request.user = user
+    return viewset_class(
+        request=drf_request, action=action, format_kwarg=None, args=(), kwargs=kwargs
+    )
+
+
+async def _values(view, queryset, paginate=True):
+    """Async counterpart of ValuesListMixin.values_response"""
+    values_serializer_class = view.get_values_serializer_class()
+    fields = select_fields(view.request, values_serializer_class.field_names())
+    # ``async for`` over a queryset fetches all of its rows in a single
+    # sync_to_async call: one thread hop per query, not one per row
+    rows = values_serializer_class.values(queryset, fields)
+
+    if not paginate or view.paginator is None:
+        return values_serializer_class([row async for row in rows], fields).data
+
+    paginator = view.paginator
+    page_size = paginator.get_page_size(view.request)
+    # Planner estimates need a raw cursor, which has no async API
+    count, is_estimate, is_cached = await sync_to_async(count_rows)(rows)
+    try:
+        page_number = int(view.request.query_params.get(paginator.page_query_param, 1))
+    except ValueError:
+        raise exceptions.NotFound(paginator.invalid_page_message.format(
+            page_number=view.request.query_params.get(paginator.page_query_param),
+            message='That page number is not an integer',
+        ))
+    num_pages = max(1, -(-count // page_size))
+    empty = exceptions.NotFound(paginator.invalid_page_message.format(
+        page_number=page_number, message='That page contains no results',
+    ))
+    # With an estimated or cached count, rows may continue past its last page
+    settled = not is_estimate and not is_cached
+    if page_number < 1 or (page_number > num_pages and settled):
+        raise empty
+
+    offset = (page_number - 1) * page_size
+    if settled:
+        page = [row async for row in rows[offset:offset + page_size]]
+    else:
+        # One row past the page tells whether another page follows
+        page = [row async for row in rows[offset:offset + page_size + 1]]
+        if not page and page_number > 1:
+            raise empty
+        more = len(page) > page_size
+        page = page[:page_size]
+        count, is_estimate = settle_count(count, offset, len(page), more, is_estimate)
+        num_pages = max(1, -(-count // page_size))
+
+    url = view.request.build_absolute_uri()
+    next_url = None
+    if page_number < num_pages:
+        next_url = replace_query_param(url, paginator.page_query_param, page_number + 1)
+    previous_url = None
+    if page_number == 2:
+        previous_url = remove_query_param(url, paginator.page_query_param)
+    elif page_number > 2:
+        previous_url = replace_query_param(url, paginator.page_query_param, page_number - 1)
+
+    return {
+        'count': count,
+        'count_is_estimate': is_estimate,
+        'next': next_url,
+        'previous': previous_url,
+        'results': values_serializer_class(page, fields).data,
+    }
+
+
+@async_api_view
+async def employee_list(request, user):
+    """Async version of GET /api/employees/"""
+    view = _viewset(EmployeeViewSet, request, user, 'list')
+    queryset = view.filter_queryset(view.get_queryset())
+    return json_response(await _values(view, queryset))
+
+
+@async_api_view
+async def employee_detail(request, user, pk):
+    """Async version of GET /api/employees/<pk>/"""
+    view = _viewset(EmployeeViewSet, request, user, 'retrieve', pk=pk)
+    queryset = view.filter_queryset(view.get_queryset())
+    try:
+        employee = await queryset.aget(pk=pk)
+    except Employee.DoesNotExist:
+        raise Http404('No Employee matches the given query.')
+    return json_response(view.get_serializer(employee).data)
+
+
+@async_api_view
+async def resource_listing_list(request, user):
+    """Async version of GET /api/resource-listings/"""
+    view = _viewset(ResourceListingViewSet, request, user, 'list')
+    queryset = view.filter_queryset(view.get_queryset())
+    return json_response(await _values(view, queryset))
+
+
+@async_api_view
+async def pending_bench_requests(request, user):
+    """Async version of GET /api/requests/pending/"""
+    view = _viewset(BenchRequestViewSet, request, user, 'pending')
+    queryset = view.get_queryset().filter(status='pending')
+    return json_response(await _values(view, queryset, paginate=False))
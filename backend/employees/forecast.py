@@ -0,0 +1,166 @@
+"""
+Available headcount projected from ``bench_start_date`` and
+``expected_availability_end``.
+
+An employee on the bench (``available`` or ``requested``, and active) counts
+as available from their ``bench_start_date`` through their
+``expected_availability_end`` inclusive, or indefinitely without one.
+
+``load_columns`` reads those columns in a single query, grouped so that
+employees with identical values arrive as one weighted row. ``forecast`` then
+builds every curve with NumPy. Each availability interval adds +1 on its
+first day and -1 on the day after its last; a ``bincount`` per group and a
+``cumsum`` along the days turn that into daily headcounts. No day is visited
+in Python; per row there is only a dict lookup to number the skills strings
+and experience levels. Employees with several skills count once under each;
+skills are grouped case-insensitively ("Python" and "python" are one skill).
+"""
+from collections import namedtuple
+
+import numpy as np
+from django.db.models import Count
+
+from .models import BENCH_STATUSES, Employee, normalize_skills
+
+LEVELS = [level for level, _ in Employee.EXPERIENCE_LEVEL_CHOICES]
+
+# One entry per distinct (skills, experience_level, bench_start_date,
+# expected_availability_end): ``count`` employees share it
+BenchColumns = namedtuple('BenchColumns', 'skills levels starts ends counts')
+
+
+def load_columns(queryset):
+    """The forecast inputs of the bench employees in ``queryset``, as arrays"""
+    rows = list(
+        queryset.filter(is_active=True, status__in=BENCH_STATUSES)
+        .order_by()
+        .values('skills', 'experience_level', 'bench_start_date', 'expected_availability_end')
+        .annotate(count=Count('*'))
+        .values_list('skills', 'experience_level', 'bench_start_date', 'expected_availability_end', 'count')
+    )
+    skills, levels, starts, ends, counts = zip(*rows) if rows else ((), (), (), (), ())
+    return BenchColumns(
+        skills=np.array(skills, dtype=object),
+        levels=np.array(levels, dtype=object),
+        starts=np.array(starts, dtype='datetime64[D]'),
+        # None becomes NaT: no expected end
+        ends=np.array(ends, dtype='datetime64[D]'),
+        counts=np.array(counts, dtype=np.int64),
+    )
+
+
+def _offsets(columns, today, days):
+    """First day and day after the last, as offsets from ``today`` clipped to [0, days]"""
+    today = np.datetime64(today, 'D')
+    first = np.clip((columns.starts - today).astype(np.int64), 0, days)
+    after = np.where(
+        np.isnat(columns.ends),
+        days,
+        np.clip((columns.ends - today).astype(np.int64) + 1, 0, days),
+    )
+    return first, after
+
+
+def _curves(groups, n_groups, first, after, weights, days):
+    """Daily headcount per group: an ``(n_groups, days)`` array"""
+    width = days + 1
+    open_ = first < after
+    groups, first, after, weights = groups[open_], first[open_], after[open_], weights[open_]
+    changes = (
+        np.bincount(groups * width + first, weights=weights, minlength=n_groups * width)
+        - np.bincount(groups * width + after, weights=weights, minlength=n_groups * width)
+    )
+    return np.cumsum(changes.reshape(n_groups, width), axis=1)[:, :days].astype(np.int64)
+
+
+def _factorize(values):
+    """``(codes, distinct)``: ``values[i] == distinct[codes[i]]``"""
+    # A dict lookup per value beats sorting an object array
+    index = {}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in values), np.int64, len(values))
+    return codes, list(index)
+
+
+def _explode_skills(skills):
+    """
+    ``(rows, skill_ids, names)``: one ``(row, skill)`` pair per skill of every
+    row, with skills compared case-insensitively. Only the distinct skills
+    strings are parsed.
+    """
+    inverse, distinct = _factorize(skills)
+    spellings = {}
+    # Each skill is named by its first spelling in sorted order ("Python" over "python")
+    for spelling in sorted({skill for value in distinct for skill in normalize_skills(value)}):
+        spellings.setdefault(spelling.casefold(), spelling)
+    parsed = [list(dict.fromkeys(skill.casefold() for skill in normalize_skills(value))) for value in distinct]
+    keys = sorted(spellings)
+    names = [spellings[key] for key in keys]
+    ids = {key: i for i, key in enumerate(keys)}
+
+    lengths = np.array([len(row) for row in parsed], dtype=np.int64)
+    flat = np.array([ids[skill] for row in parsed for skill in row], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(lengths) else lengths
+
+    per_row = lengths[inverse]
+    rows = np.repeat(np.arange(len(skills)), per_row)
+    position = np.arange(per_row.sum()) - np.repeat(np.cumsum(per_row) - per_row, per_row)
+    return rows, flat[offsets[inverse[rows]] + position], names
+
+
+def forecast(columns, today, days, skill=None):
+    """
+    Daily available headcount for ``days`` days from ``today``: the total,
+    per experience level, and per skill and experience level (optionally
+    only ``skill``, case-insensitively). Each curve is an int array.
+    """
+    first, after = _offsets(columns, today, days)
+    weights = columns.counts.astype(np.float64)
+    codes, distinct = _factorize(columns.levels)
+    level_ids = np.array([LEVELS.index(level) for level in distinct], dtype=np.int64)[codes] if distinct else codes
+
+    rows, skill_ids, names = _explode_skills(columns.skills)
+    if skill is not None:
+        wanted = [i for i, name in enumerate(names) if name.casefold() == skill.casefold()]
+        keep = np.isin(skill_ids, wanted)
+        rows, skill_ids = rows[keep], skill_ids[keep]
+        # The totals only count employees with that skill
+        has_skill = np.zeros(len(weights), dtype=bool)
+        has_skill[rows] = True
+        weights = np.where(has_skill, weights, 0.0)
+
+    total = _curves(np.zeros(len(first), dtype=np.int64), 1, first, after, weights, days)[0]
+    by_level = _curves(level_ids, len(LEVELS), first, after, weights, days)
+    groups = skill_ids * len(LEVELS) + level_ids[rows]
+    by_skill = _curves(groups, len(names) * len(LEVELS), first[rows], after[rows], weights[rows], days)
+
+    results = [
+        {'skill': names[group // len(LEVELS)], 'experience_level': LEVELS[group % len(LEVELS)], 'available': curve}
+        for group, curve in enumerate(by_skill)
+        if curve.any()
+    ]
+    return {
+        'total': total,
+        'by_experience_level': {level: curve for level, curve in zip(LEVELS, by_level)},
+        'results': results,
+    }
+
+
+def availability_forecast(queryset, today, weeks, interval='week', skill=None):
+    """
+    ``forecast`` for the employees in ``queryset`` over ``weeks`` weeks, with
+    the headcount on every day or on the first day of every week
+    """
+    days = weeks * 7
+    step = 7 if interval == 'week' else 1
+    curves = forecast(load_columns(queryset), today, days, skill=skill)
+    dates = np.arange(np.datetime64(today, 'D'), np.datetime64(today, 'D') + days, step)
+    return {
+        'dates': [day.isoformat() for day in dates.astype(object)],
+        'total': curves['total'][::step].tolist(),
+        'by_experience_level': {
+            level: curve[::step].tolist() for level, curve in curves['by_experience_level'].items()
+        },
+        'results': [
+            {**result, 'available': result['available'][::step].tolist()} for result in curves['results']
+        ],
+    }
@@ -0,0 +1,85 @@
+"""
+Synthetic bench data shared by the benchmark commands.
+"""
+import itertools
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from companies.models import Company
+from employees.models import Employee, EmployeeStatusChange, BenchRequest, ResourceListing
+
+SKILLS = ('Python', 'Django', 'React', 'PostgreSQL', 'AWS', 'Docker', 'Java', 'Go', 'TypeScript')
+LEVELS = ('junior', 'mid', 'senior', 'lead')
+
+_run_counter = itertools.count()
+
+
+def create_dataset(rows, companies=5, prefix='bench'):
+    """
+    Create ``rows`` employees spread over ``companies`` companies, one listing
+    per company and a pending bench request per employee. Returns the user
+    managing every company.
+    """
+    tag = f"{prefix}{next(_run_counter)}"
+    User = get_user_model()
+    user = User.objects.create_user(
+        email=f"{tag}@example.com", password=None, first_name='Bench', last_name='Runner'
+    )
+    company_objs = Company.objects.bulk_create([
+        Company(
+            name=f"{tag} Company {i}",
+            email=f"{tag}-company{i}@example.com",
+            phone='555-0100',
+            address=f"{i} Example Street",
+            admin_user=user,
+        )
+        for i in range(companies)
+    ])
+
+    today = date.today()
+    employees = Employee.objects.bulk_create([
+        Employee(
+            first_name=f"First{i}",
+            last_name=f"Last{i}",
+            email=f"{tag}-employee{i}@example.com",
+            job_title='Software Engineer',
+            experience_years=i % 15,
+            experience_level=LEVELS[i % len(LEVELS)],
+            skills=', '.join(SKILLS[j % len(SKILLS)] for j in range(i % 4 + 1)),
+            company=company_objs[i % companies],
+            bench_start_date=today - timedelta(days=i % 90),
+            expected_availability_end=today + timedelta(days=i % 120) if i % 3 else None,
+        )
+        for i in range(rows)
+    ])
+    # bulk_create sends no post_save, so start the status history explicitly
+    EmployeeStatusChange.objects.record_many(
+        (employee.pk, employee.company_id, '', employee.status) for employee in employees
+    )
+
+    listings = ResourceListing.objects.bulk_create([
+        ResourceListing(
+            company=company,
+            title=f"{company.name} bench",
+            description='Synthetic listing',
+            start_date=today,
+        )
+        for company in company_objs
+    ])
+    through = ResourceListing.employees.through
+    through.objects.bulk_create([
+        through(resourcelisting_id=listings[i % companies].pk, employee_id=employee.pk)
+        for i, employee in enumerate(employees)
+    ])
+    # bulk_create on the through table sends no m2m_changed
+    ResourceListing.objects.filter(pk__in=[listing.pk for listing in listings]).refresh_computed_fields()
+
+    BenchRequest.objects.bulk_create([
+        BenchRequest(
+            employee=employee,
+            requesting_company=company_objs[(i + 1) % companies],
+            message='Synthetic request',
+        )
+        for i, employee in enumerate(employees)
+    ])
+    return user
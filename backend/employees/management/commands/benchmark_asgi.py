@@ -0,0 +1,108 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import AsyncClient, Client
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from ._synthetic import create_dataset
+
+# (sync endpoint, async endpoint)
+ENDPOINTS = (
+    ('/api/employees/', '/api/async/employees/'),
+    ('/api/resource-listings/', '/api/async/resource-listings/'),
+    ('/api/requests/pending/', '/api/async/requests/pending/'),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare concurrent read throughput of the sync viewsets under WSGI (threads) '
+        'and ASGI, and of the native async endpoints under ASGI'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=500, help='Synthetic employees to create')
+        parser.add_argument('--requests', type=int, default=300, help='Requests per endpoint and mode')
+        parser.add_argument('--concurrency', type=int, default=20, help='Requests in flight at once')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['requests'] < 1:
+            raise CommandError('--requests and --concurrency must be positive.')
+
+        # Concurrent clients use their own connections, so the dataset is
+        # committed and removed again afterwards.
+        user = create_dataset(options['seed'], prefix='asgi')
+        try:
+            token = str(RefreshToken.for_user(user).access_token)
+            headers = {'Authorization': f'Bearer {token}'}
+            for sync_path, async_path in ENDPOINTS:
+                self.stdout.write(f"\n{sync_path}")
+                self.report('WSGI, sync view', self.run_wsgi(sync_path, headers, options))
+                self.report('ASGI, sync view', asyncio.run(self.run_asgi(sync_path, headers, options)))
+                self.report('ASGI, async view', asyncio.run(self.run_asgi(async_path, headers, options)))
+        finally:
+            # Cascades to the synthetic companies, employees, listings and requests
+            user.delete()
+
+    def run_wsgi(self, path, headers, options):
+        """Serve ``path`` through the WSGI handler from a pool of threads"""
+        concurrency = options['concurrency']
+        shares = [options['requests'] // concurrency] * concurrency
+        for i in range(options['requests'] % concurrency):
+            shares[i] += 1
+
+        def worker(count):
+            client = Client()
+            latencies = []
+            try:
+                for _ in range(count):
+                    started = time.perf_counter()
+                    response = client.get(path, headers=headers)
+                    latencies.append(time.perf_counter() - started)
+                    self.check_response(response, path)
+            finally:
+                connection.close()
+            return latencies
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = [
+                latency
+                for chunk in executor.map(worker, [share for share in shares if share])
+                for latency in chunk
+            ]
+        return time.perf_counter() - started, latencies
+
+    async def run_asgi(self, path, headers, options):
+        """Serve ``path`` through the ASGI handler with asyncio.gather"""
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(options['concurrency'])
+
+        async def fetch():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                latency = time.perf_counter() - started
+            self.check_response(response, path)
+            return latency
+
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(fetch() for _ in range(options['requests'])))
+        return time.perf_counter() - started, latencies
+
+    def check_response(self, response, path):
+        if response.status_code != 200:
+            raise CommandError(f"{path} returned {response.status_code}: {response.content[:200]!r}")
+
+    def report(self, label, result):
+        elapsed, latencies = result
+        latencies = sorted(latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        self.stdout.write(
+            f"  {label:<18} {len(latencies) / elapsed:8.0f} req/s  "
+            f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms"
+        )
@@ -0,0 +1,84 @@
+import time
+from datetime import date, timedelta
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from employees.forecast import LEVELS, BenchColumns, forecast
+from employees.models import normalize_skills
+from ._synthetic import SKILLS
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the vectorized availability forecast on synthetic employees held in memory (no '
+        'grouping, the worst case) and check it against a day-by-day loop on a sample'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Synthetic employees')
+        parser.add_argument('--weeks', type=int, default=12, help='Weeks to project')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs (the best is reported)')
+        parser.add_argument('--check-rows', type=int, default=2000, help='Employees checked against the loop')
+
+    def handle(self, *args, **options):
+        if min(options['rows'], options['weeks'], options['repeat'], options['check_rows']) < 1:
+            raise CommandError('--rows, --weeks, --repeat and --check-rows must be positive.')
+
+        today = date.today()
+        days = options['weeks'] * 7
+        columns = self.synthetic_columns(options['rows'], today)
+
+        best = None
+        for _ in range(options['repeat']):
+            start = time.perf_counter()
+            forecast(columns, today, days)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        self.stdout.write(f"{options['rows']:,} employees, {days} days: {best * 1000:.1f} ms")
+
+        sample = BenchColumns(*(column[:options['check_rows']] for column in columns))
+        if self.curves_by_loop(sample, today, days) != self.curves(forecast(sample, today, days)):
+            raise CommandError('The vectorized forecast differs from the day-by-day loop.')
+        self.stdout.write(f"Matches the day-by-day loop on {len(sample.counts):,} employees")
+
+    def synthetic_columns(self, rows, today):
+        rng = np.random.default_rng(0)
+        skills = np.array([
+            ', '.join(SKILLS[(i + j) % len(SKILLS)] for j in range(i % 4 + 1)) for i in range(len(SKILLS) * 4)
+        ], dtype=object)
+        today = np.datetime64(today, 'D')
+        starts = today + rng.integers(-90, 60, rows)
+        ends = starts + rng.integers(0, 180, rows)
+        # A third have no expected end
+        ends[rng.random(rows) < 1 / 3] = np.datetime64('NaT')
+        return BenchColumns(
+            skills=skills[rng.integers(0, len(skills), rows)],
+            levels=np.array(LEVELS, dtype=object)[rng.integers(0, len(LEVELS), rows)],
+            starts=starts,
+            ends=ends,
+            counts=np.ones(rows, dtype=np.int64),
+        )
+
+    def curves(self, result):
+        curves = {('', ''): result['total'].tolist()}
+        for level, curve in result['by_experience_level'].items():
+            curves[('', level)] = curve.tolist()
+        for row in result['results']:
+            curves[(row['skill'].casefold(), row['experience_level'])] = row['available'].tolist()
+        return {key: curve for key, curve in curves.items() if any(curve)}
+
+    def curves_by_loop(self, columns, today, days):
+        curves = {}
+        for skills, level, start, end, count in zip(*columns):
+            start = start.astype(date)
+            end = None if np.isnat(end) else end.astype(date)
+            keys = [('', ''), ('', level)] + [
+                (skill, level) for skill in dict.fromkeys(skill.casefold() for skill in normalize_skills(skills))
+            ]
+            for offset in range(days):
+                day = today + timedelta(days=offset)
+                if start <= day and (end is None or day <= end):
+                    for key in keys:
+                        curves.setdefault(key, [0] * days)[offset] += int(count)
+        return curves
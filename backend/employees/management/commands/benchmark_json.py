@@ -0,0 +1,82 @@
+import io
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from employees.views import EmployeeViewSet
+from main.parsers import FastJSONParser
+from main.renderers import FastJSONRenderer, orjson
+from ._synthetic import create_dataset
+
+
+class Command(BaseCommand):
+    help = 'Compare the stdlib and orjson JSON renderer/parser on /api/employees/ payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help='Synthetic employees to create')
+        parser.add_argument('--repeat', type=int, default=200, help='Iterations per measurement')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError('orjson is not installed; FastJSONRenderer is using the stdlib fallback.')
+
+        factory = APIRequestFactory()
+        endpoints = (
+            ('/api/employees/', {'get': 'list'}),
+            ('/api/employees/available/', {'get': 'available'}),
+        )
+
+        # The dataset only lives inside this transaction; the factory's host
+        # is 'testserver', which ALLOWED_HOSTS must accept
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']), transaction.atomic():
+            user = create_dataset(options['rows'])
+
+            for path, actions in endpoints:
+                request = factory.get(path)
+                force_authenticate(request, user=user)
+                # Unpaginated: the whole dataset, not a 10-row page
+                payload = EmployeeViewSet.as_view(actions, pagination_class=None)(request).data
+
+                stdlib_output = JSONRenderer().render(payload)
+                fast_output = FastJSONRenderer().render(payload)
+                if stdlib_output != fast_output:
+                    raise CommandError(f"{path}: FastJSONRenderer output differs from JSONRenderer.")
+
+                self.report(
+                    f"render {path}",
+                    lambda: JSONRenderer().render(payload),
+                    lambda: FastJSONRenderer().render(payload),
+                    len(stdlib_output),
+                    options['repeat'],
+                )
+                self.report(
+                    f"parse  {path}",
+                    lambda: JSONParser().parse(io.BytesIO(stdlib_output)),
+                    lambda: FastJSONParser().parse(io.BytesIO(stdlib_output)),
+                    len(stdlib_output),
+                    options['repeat'],
+                )
+
+            transaction.set_rollback(True)
+
+    def report(self, label, stdlib, fast, size, repeat):
+        stdlib_time = self.measure(stdlib, repeat)
+        fast_time = self.measure(fast, repeat)
+        self.stdout.write(
+            f"{label:36} {size / 1024:>8.1f} KiB   "
+            f"stdlib: {stdlib_time * 1e6:>9.1f} us   "
+            f"orjson: {fast_time * 1e6:>9.1f} us   "
+            f"speedup: {stdlib_time / fast_time:.1f}x"
+        )
+
+    def measure(self, func, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) / repeat
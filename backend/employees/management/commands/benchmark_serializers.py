@@ -0,0 +1,81 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from employees.models import Employee, BenchRequest, ResourceListing
+from employees.serializers import (
+    EmployeeListSerializer,
+    EmployeeListValuesSerializer,
+    BenchRequestSerializer,
+    BenchRequestValuesSerializer,
+    ResourceListingListSerializer,
+    ResourceListingListValuesSerializer,
+)
+from ._synthetic import create_dataset
+
+
+class Command(BaseCommand):
+    help = 'Compare ModelSerializer and ValuesSerializer throughput on the list endpoints (rows/s)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000, help='Synthetic employees to create')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per serializer')
+
+    def handle(self, *args, **options):
+        cases = (
+            (
+                'EmployeeListSerializer',
+                lambda: Employee.objects.select_related('company'),
+                EmployeeListSerializer,
+                EmployeeListValuesSerializer,
+            ),
+            (
+                'BenchRequestSerializer',
+                lambda: BenchRequest.objects.select_related('employee', 'requesting_company', 'employee__company'),
+                BenchRequestSerializer,
+                BenchRequestValuesSerializer,
+            ),
+            (
+                'ResourceListingListSerializer',
+                lambda: ResourceListing.objects.select_related('company'),
+                ResourceListingListSerializer,
+                ResourceListingListValuesSerializer,
+            ),
+        )
+
+        # The dataset only lives inside this transaction
+        with transaction.atomic():
+            create_dataset(options['rows'])
+            renderer = JSONRenderer()
+
+            for label, queryset, model_serializer, values_serializer in cases:
+                model_output = renderer.render(model_serializer(queryset(), many=True).data)
+                values_output = renderer.render(values_serializer(values_serializer.values(queryset())).data)
+                if model_output != values_output:
+                    raise CommandError(f"{label}: ValuesSerializer output differs from the ModelSerializer.")
+
+                model_rate = self.rows_per_second(
+                    lambda: model_serializer(queryset(), many=True).data, options['repeat']
+                )
+                values_rate = self.rows_per_second(
+                    lambda: values_serializer(values_serializer.values(queryset())).data, options['repeat']
+                )
+                self.stdout.write(
+                    f"{label:32} model: {model_rate:>10,.0f} rows/s   "
+                    f"values: {values_rate:>10,.0f} rows/s   "
+                    f"speedup: {values_rate / model_rate:.1f}x   (output identical)"
+                )
+
+            transaction.set_rollback(True)
+
+    def rows_per_second(self, render, repeat):
+        best = None
+        rows = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = len(render())
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return rows / best if best else float('inf')
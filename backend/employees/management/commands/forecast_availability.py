@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from employees.forecast import availability_forecast
+from employees.models import Employee
+
+
+class Command(BaseCommand):
+    help = 'Print the projected available bench headcount per skill and experience level, week by week'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--weeks', type=int, default=12, help='Weeks to project')
+        parser.add_argument('--interval', choices=['day', 'week'], default='week', help='One column per day or week')
+        parser.add_argument('--company', type=int, action='append', help='Only this company (repeatable)')
+        parser.add_argument('--skill', help='Only employees with this skill')
+        parser.add_argument(
+            '--experience-level', choices=[level for level, _ in Employee.EXPERIENCE_LEVEL_CHOICES],
+            help='Only employees at this experience level',
+        )
+
+    def handle(self, *args, **options):
+        if options['weeks'] < 1:
+            raise CommandError('--weeks must be positive.')
+
+        queryset = Employee.objects.all()
+        if options['company']:
+            queryset = queryset.filter(company__in=options['company'])
+        if options['experience_level']:
+            queryset = queryset.filter(experience_level=options['experience_level'])
+
+        report = availability_forecast(
+            queryset, timezone.localdate(), options['weeks'], options['interval'], options['skill']
+        )
+        self.write_row('', [day[5:] for day in report['dates']])
+        self.write_row('All bench employees', report['total'])
+        for level, curve in report['by_experience_level'].items():
+            self.write_row(f"  {level}", curve)
+        for result in report['results']:
+            self.write_row(f"{result['skill']} ({result['experience_level']})", result['available'])
+
+    def write_row(self, label, values):
+        self.stdout.write(f"{label[:32]:32}" + ''.join(f"{value:>7}" for value in values))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from employees.models import ResourceListing
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute resource listings' total_resources and skills_summary from their employees, "
+        'in batches; only listings whose values are out of date are written'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Listings recomputed per statement')
+        parser.add_argument('--company', type=int, help='Only recompute this company\'s listings')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive.')
+
+        listings = ResourceListing.objects.order_by('pk')
+        if options['company'] is not None:
+            listings = listings.filter(company_id=options['company'])
+
+        checked = changed = 0
+        last_pk = 0
+        while True:
+            # Keyset pagination: each batch starts after the last id seen
+            batch = list(listings.filter(pk__gt=last_pk).values_list('pk', flat=True)[:batch_size])
+            if not batch:
+                break
+            changed += ResourceListing.objects.filter(pk__in=batch).refresh_computed_fields()
+            checked += len(batch)
+            last_pk = batch[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} listings; updated {changed}."))
@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from employees.models import BenchRequest, ResourceRequest
+from employees.services import close_ended_listings, expire_pending_requests
+
+
+class Command(BaseCommand):
+    help = (
+        'Expire pending bench and resource requests older than REQUEST_TTL_DAYS and close '
+        'resource listings past their expected end date. Meant to run on a schedule (e.g. cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ttl-days', type=int, default=settings.REQUEST_TTL_DAYS,
+            help='Age in days after which a pending request expires',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.SWEEP_BATCH_SIZE,
+            help='Rows locked and updated per transaction',
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0.0,
+            help='Seconds to sleep between batches, to yield to live traffic',
+        )
+
+    def handle(self, *args, **options):
+        if options['ttl_days'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--ttl-days and --batch-size must be positive.')
+
+        now = timezone.now()
+        cutoff = now - timedelta(days=options['ttl_days'])
+        batching = {'batch_size': options['batch_size'], 'pause': options['pause']}
+
+        for model in (BenchRequest, ResourceRequest):
+            expired = expire_pending_requests(model, cutoff, **batching)
+            self.stdout.write(f"Expired {expired} pending {model._meta.verbose_name_plural.lower()}")
+
+        closed = close_ended_listings(timezone.localdate(now), **batching)
+        self.stdout.write(f"Closed {closed} ended resource listings")
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_company_approved_admins'),
+        ('employees', '0002_resourcelisting_resourcerequest_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='benchrequest',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='benchrequest',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('employee', 'requesting_company'), name='unique_pending_bench_request'),
+        ),
+    ]
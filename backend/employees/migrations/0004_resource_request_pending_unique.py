@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_company_approved_admins'),
+        ('employees', '0003_bench_request_pending_unique'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='resourcerequest',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='resourcerequest',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('resource_listing', 'requesting_company'), name='unique_pending_resource_request'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_company_approved_admins'),
+        ('employees', '0004_resource_request_pending_unique'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='benchrequest',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('cancelled', 'Cancelled'), ('expired', 'Expired')], default='pending', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='resourcerequest',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('cancelled', 'Cancelled'), ('expired', 'Expired')], default='pending', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='benchrequest',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['requested_at'], name='bench_req_pending_age_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resourcerequest',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['requested_at'], name='resource_req_pending_age_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:06
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 2000
+
+
+def backfill_initial_statuses(apps, schema_editor):
+    # Earlier transitions were never recorded; start each timeline at creation
+    # with the employee's current status
+    Employee = apps.get_model('employees', 'Employee')
+    EmployeeStatusChange = apps.get_model('employees', 'EmployeeStatusChange')
+    rows = Employee.objects.values_list('pk', 'company_id', 'status', 'created_at')
+    batch = []
+    for employee_id, company_id, status, created_at in rows.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        batch.append(EmployeeStatusChange(
+            employee_id=employee_id, company_id=company_id, to_status=status, changed_at=created_at,
+        ))
+        if len(batch) == BACKFILL_BATCH_SIZE:
+            EmployeeStatusChange.objects.bulk_create(batch)
+            batch = []
+    EmployeeStatusChange.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_company_approved_admins'),
+        ('employees', '0005_request_expiry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeStatusChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('available', 'Available'), ('requested', 'Requested'), ('allocated', 'Allocated')], max_length=20)),
+                ('to_status', models.CharField(choices=[('available', 'Available'), ('requested', 'Requested'), ('allocated', 'Allocated')], max_length=20)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('company', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='companies.company')),
+                ('employee', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to='employees.employee')),
+            ],
+            options={
+                'verbose_name': 'Employee Status Change',
+                'verbose_name_plural': 'Employee Status Changes',
+                'ordering': ['changed_at', 'id'],
+                'indexes': [models.Index(fields=['employee', 'changed_at'], name='emp_status_timeline_idx'), models.Index(fields=['company', 'changed_at'], name='emp_status_company_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_initial_statuses, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,7 @@
-from django.db import models
+from collections import defaultdict
+
+from django.db import connections, models
+from django.utils import timezone
 from companies.models import Company
 
 
@@ -51,10 +54,83 @@ class Employee(models.Model):
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.job_title}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets post_save skip listing maintenance when skills did not change
+        instance._loaded_skills = instance.__dict__.get('skills')
+        # Lets post_save record status transitions
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+    
     def get_full_name(self):
         return f"{self.first_name} {self.last_name}"
 
 
+# Statuses in which an employee counts as on the bench
+BENCH_STATUSES = ('available', 'requested')
+
+
+class EmployeeStatusChangeManager(models.Manager):
+
+    def record_many(self, changes, changed_at=None):
+        """
+        Append transitions for rows changed without model instances.
+        ``changes`` yields ``(employee_id, company_id, from_status, to_status)``.
+        """
+        changed_at = changed_at or timezone.now()
+        return self.bulk_create([
+            self.model(
+                employee_id=employee_id,
+                company_id=company_id,
+                from_status=from_status,
+                to_status=to_status,
+                changed_at=changed_at,
+            )
+            for employee_id, company_id, from_status, to_status in changes
+        ])
+
+    def record_transition(self, employees, from_status, to_status, changed_at=None):
+        """Record the same transition for every employee in the ``employees`` queryset"""
+        return self.record_many((
+            (employee_id, company_id, from_status, to_status)
+            for employee_id, company_id in employees.values_list('pk', 'company_id')
+        ), changed_at)
+
+
+class EmployeeStatusChange(models.Model):
+    """
+    Append-only history of ``Employee.status``. Single saves are recorded by
+    a post_save handler; paths that change status with ``update()`` record
+    their transitions explicitly. ``from_status`` is empty for the status an
+    employee was created with.
+    """
+
+    # Both foreign keys lead a composite index below instead of having their own
+    employee = models.ForeignKey(
+        Employee, on_delete=models.CASCADE, related_name='status_changes', db_index=False
+    )
+    # The employee's company at the time of the change, for per-company range queries
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='+', db_index=False)
+    from_status = models.CharField(max_length=20, choices=Employee.STATUS_CHOICES, blank=True)
+    to_status = models.CharField(max_length=20, choices=Employee.STATUS_CHOICES)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    objects = EmployeeStatusChangeManager()
+
+    class Meta:
+        verbose_name = 'Employee Status Change'
+        verbose_name_plural = 'Employee Status Changes'
+        ordering = ['changed_at', 'id']
+        indexes = [
+            models.Index(fields=['employee', 'changed_at'], name='emp_status_timeline_idx'),
+            models.Index(fields=['company', 'changed_at'], name='emp_status_company_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id}: {self.from_status or '-'} -> {self.to_status} at {self.changed_at}"
+
+
 class BenchRequest(models.Model):
     """Request model for companies to request bench employees"""
 
@@ -63,6 +139,7 @@ class BenchRequest(models.Model):
         ('approved', 'Approved'),
         ('rejected', 'Rejected'),
         ('cancelled', 'Cancelled'),
+        ('expired', 'Expired'),
     )
 
     employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='requests')
@@ -83,12 +160,111 @@ class BenchRequest(models.Model):
         verbose_name = 'Bench Request'
         verbose_name_plural = 'Bench Requests'
         ordering = ['-requested_at']
-        unique_together = ['employee', 'requesting_company', 'status']
+        constraints = [
+            # Only one open request per employee and company; answered ones may repeat
+            models.UniqueConstraint(
+                fields=['employee', 'requesting_company'],
+                condition=models.Q(status='pending'),
+                name='unique_pending_bench_request',
+            ),
+        ]
+        indexes = [
+            # Expiry sweeps look for old pending requests
+            models.Index(
+                fields=['requested_at'],
+                condition=models.Q(status='pending'),
+                name='bench_req_pending_age_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Request for {self.employee.get_full_name()} by {self.requesting_company.name}"
 
 
+def normalize_skills(skills):
+    """Split a comma-separated skills string into trimmed, non-empty skills"""
+    return [skill.strip() for skill in (skills or '').split(',') if skill.strip()]
+
+
+def summarize_skills(skills_strings):
+    """The distinct skills of several employees, sorted and comma-joined"""
+    return ', '.join(sorted({
+        skill for skills in skills_strings for skill in normalize_skills(skills)
+    }))
+
+
+# Recompute total_resources and skills_summary in one statement, writing
+# only the rows that change. COLLATE "C" sorts by code point, matching the
+# Python fallback.
+REFRESH_COMPUTED_FIELDS_SQL = """
+WITH computed AS (
+    SELECT listing.id,
+        (SELECT count(*) FROM {members} m WHERE m.resourcelisting_id = listing.id) AS total,
+        COALESCE((
+            SELECT string_agg(DISTINCT btrim(skill) COLLATE "C", ', ' ORDER BY btrim(skill) COLLATE "C")
+            FROM {members} m
+            JOIN {employees} e ON e.id = m.employee_id
+            CROSS JOIN LATERAL regexp_split_to_table(e.skills, ',') AS skill
+            WHERE m.resourcelisting_id = listing.id AND btrim(skill) <> ''
+        ), '') AS summary
+    FROM {listings} listing
+    WHERE listing.id IN ({selected})
+)
+UPDATE {listings} AS listing
+SET total_resources = computed.total, skills_summary = computed.summary
+FROM computed
+WHERE listing.id = computed.id
+    AND (listing.total_resources, listing.skills_summary)
+        IS DISTINCT FROM (computed.total, computed.summary)
+"""
+
+
+class ResourceListingQuerySet(models.QuerySet):
+
+    def refresh_computed_fields(self):
+        """
+        Recompute ``total_resources`` and ``skills_summary`` for the listings
+        in this queryset from their current employees, aggregating in SQL on
+        PostgreSQL. Returns the number of listings whose values changed.
+        """
+        connection = connections[self.db]
+        selected = self.order_by().values('pk')
+        if connection.vendor != 'postgresql':
+            return self._refresh_computed_fields_in_python(selected)
+
+        selected_sql, params = selected.query.sql_with_params()
+        quote = connection.ops.quote_name
+        sql = REFRESH_COMPUTED_FIELDS_SQL.format(
+            members=quote(self.model.employees.through._meta.db_table),
+            employees=quote(Employee._meta.db_table),
+            listings=quote(self.model._meta.db_table),
+            selected=selected_sql,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    def _refresh_computed_fields_in_python(self, selected):
+        """Fallback for databases without string_agg(DISTINCT ...)"""
+        skills = defaultdict(list)
+        for listing_id, employee_skills in self.model.employees.through.objects.using(
+            self.db
+        ).filter(resourcelisting_id__in=selected).values_list('resourcelisting_id', 'employee__skills'):
+            skills[listing_id].append(employee_skills)
+
+        changed = []
+        for listing in self.model.objects.using(self.db).filter(pk__in=selected).only(
+            'total_resources', 'skills_summary'
+        ):
+            total = len(skills[listing.pk])
+            summary = summarize_skills(skills[listing.pk])
+            if (listing.total_resources, listing.skills_summary) != (total, summary):
+                listing.total_resources, listing.skills_summary = total, summary
+                changed.append(listing)
+        self.model.objects.using(self.db).bulk_update(changed, ['total_resources', 'skills_summary'])
+        return len(changed)
+
+
 class ResourceListing(models.Model):
     """Model for companies to post batch bench resources"""
 
@@ -132,7 +308,8 @@ class ResourceListing(models.Model):
         help_text="Expected end date of availability"
     )
 
-    # Aggregated information (computed from employees)
+    # Aggregated information (computed from employees, kept current by the
+    # signals in employees.signals; repair with manage.py recompute_listing_fields)
     total_resources = models.PositiveIntegerField(
         default=0,
         help_text="Total number of resources in this listing"
@@ -163,6 +340,8 @@ class ResourceListing(models.Model):
         help_text="Extensible field for additional parameters"
     )
 
+    objects = ResourceListingQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Resource Listing'
         verbose_name_plural = 'Resource Listings'
@@ -176,20 +355,6 @@ class ResourceListing(models.Model):
     def __str__(self):
         return f"{self.title} - {self.company.name} ({self.total_resources} resources)"
 
-    def update_computed_fields(self):
-        """Update computed fields based on selected employees"""
-        self.total_resources = self.employees.count()
-
-        # Aggregate skills
-        skills_set = set()
-        for emp in self.employees.all():
-            if emp.skills:
-                skills_list = [s.strip() for s in emp.skills.split(',')]
-                skills_set.update(skills_list)
-        self.skills_summary = ', '.join(sorted(skills_set))
-
-        self.save()
-
 
 class ResourceRequest(models.Model):
     """Request model for companies to request resource listings"""
@@ -199,6 +364,7 @@ class ResourceRequest(models.Model):
         ('approved', 'Approved'),
         ('rejected', 'Rejected'),
         ('cancelled', 'Cancelled'),
+        ('expired', 'Expired'),
     )
 
     # The resource listing being requested
@@ -245,10 +411,23 @@ class ResourceRequest(models.Model):
         verbose_name = 'Resource Request'
         verbose_name_plural = 'Resource Requests'
         ordering = ['-requested_at']
-        unique_together = ['resource_listing', 'requesting_company', 'status']
         indexes = [
             models.Index(fields=['requesting_company', 'status']),
             models.Index(fields=['resource_listing', 'status']),
+            # Expiry sweeps look for old pending requests
+            models.Index(
+                fields=['requested_at'],
+                condition=models.Q(status='pending'),
+                name='resource_req_pending_age_idx',
+            ),
+        ]
+        constraints = [
+            # Only one open request per listing and company; answered ones may repeat
+            models.UniqueConstraint(
+                fields=['resource_listing', 'requesting_company'],
+                condition=models.Q(status='pending'),
+                name='unique_pending_resource_request',
+            ),
         ]
 
     def __str__(self):
@@ -1,9 +1,38 @@
-from rest_framework import serializers
-from .models import Employee, BenchRequest, ResourceListing, ResourceRequest
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import exceptions, serializers
+from .models import Employee, BenchRequest, ResourceListing, ResourceRequest, summarize_skills
+from companies.models import Company
 from companies.serializers import CompanySerializer
+from main.serializers import (
+    BatchedListSerializer,
+    BatchedPrimaryKeyRelatedField,
+    BulkIdsSerializer,
+    SparseFieldsetMixin,
+    ValuesSerializer,
+)
+
+
+def managed_company(serializer, company):
+    """
+    ``company``, if the requesting user manages it; otherwise the whole
+    request is refused (403). The user's companies are read once per request.
+    """
+    context = serializer.context
+    if 'managed_company_ids' not in context:
+        request = context.get('request')
+        context['managed_company_ids'] = (
+            set(request.user.managed_companies.values_list('pk', flat=True)) if request else set()
+        )
+    if company.pk not in context['managed_company_ids']:
+        raise exceptions.PermissionDenied('You do not have permission to act for this company.')
+    return company
 
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Employee model"""
     
     company_name = serializers.CharField(source='company.name', read_only=True)
@@ -19,6 +48,7 @@ class EmployeeSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         )
         read_only_fields = ('id', 'created_at', 'updated_at')
+        field_lookups = {'full_name': ('first_name', 'last_name')}
 
 
 class EmployeeCreateSerializer(serializers.ModelSerializer):
@@ -34,7 +64,7 @@ class EmployeeCreateSerializer(serializers.ModelSerializer):
         )
 
 
-class EmployeeListSerializer(serializers.ModelSerializer):
+class EmployeeListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Lightweight serializer for employee listing"""
     
     company_name = serializers.CharField(source='company.name', read_only=True)
@@ -46,9 +76,50 @@ class EmployeeListSerializer(serializers.ModelSerializer):
             'id', 'full_name', 'email', 'job_title', 'experience_years',
             'experience_level', 'company_name', 'status', 'bench_start_date'
         )
+        field_lookups = {'full_name': ('first_name', 'last_name')}
+
+
+class EmployeeStatusChangeSerializer(serializers.Serializer):
+    """One entry of an employee's status timeline"""
+
+    from_status = serializers.CharField()
+    to_status = serializers.CharField()
+    changed_at = serializers.DateTimeField()
+    ended_at = serializers.DateTimeField(allow_null=True)
+
+
+class StatusHistoryReportSerializer(serializers.Serializer):
+    """Query parameters of the status history reports (dates are inclusive)"""
+
+    DEFAULT_DAYS = 90
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    company = serializers.IntegerField(required=False, min_value=1)
+    period = serializers.ChoiceField(choices=['day', 'week', 'month'], default='week')
+
+    def validate(self, attrs):
+        end = attrs.get('end') or timezone.localdate()
+        start = attrs.get('start') or end - timedelta(days=self.DEFAULT_DAYS)
+        if start > end:
+            raise serializers.ValidationError({'start': 'Must not be after end.'})
+        # As datetimes: [start 00:00, the day after end 00:00)
+        attrs['start'] = timezone.make_aware(datetime.combine(start, time.min))
+        attrs['end'] = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min))
+        return attrs
+
+
+class AvailabilityForecastSerializer(serializers.Serializer):
+    """Query parameters of the availability forecast"""
 
+    weeks = serializers.IntegerField(default=12, min_value=1, max_value=52)
+    interval = serializers.ChoiceField(choices=['day', 'week'], default='week')
+    company = serializers.IntegerField(required=False, min_value=1)
+    skill = serializers.CharField(required=False, trim_whitespace=True)
+    experience_level = serializers.ChoiceField(choices=Employee.EXPERIENCE_LEVEL_CHOICES, required=False)
 
-class BenchRequestSerializer(serializers.ModelSerializer):
+
+class BenchRequestSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for BenchRequest model"""
     
     employee_name = serializers.CharField(source='employee.get_full_name', read_only=True)
@@ -64,6 +135,25 @@ class BenchRequestSerializer(serializers.ModelSerializer):
             'status', 'message', 'response', 'requested_at', 'responded_at'
         )
         read_only_fields = ('id', 'requested_at', 'responded_at')
+        field_lookups = {'employee_name': ('employee__first_name', 'employee__last_name')}
+
+
+class EmployeeListValuesSerializer(ValuesSerializer):
+    """Fast read path producing the same output as EmployeeListSerializer"""
+
+    serializer_class = EmployeeListSerializer
+    computed = {
+        'full_name': (('first_name', 'last_name'), '{} {}'.format),
+    }
+
+
+class BenchRequestValuesSerializer(ValuesSerializer):
+    """Fast read path producing the same output as BenchRequestSerializer"""
+
+    serializer_class = BenchRequestSerializer
+    computed = {
+        'employee_name': (('employee__first_name', 'employee__last_name'), '{} {}'.format),
+    }
 
 
 class BenchRequestCreateSerializer(serializers.ModelSerializer):
@@ -72,6 +162,9 @@ class BenchRequestCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = BenchRequest
         fields = ('employee', 'requesting_company', 'message')
+
+    def validate_requesting_company(self, company):
+        return managed_company(self, company)
     
     def validate(self, attrs):
         # Check if employee is available
@@ -95,6 +188,21 @@ class BenchRequestCreateSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class BenchRequestBulkCreateSerializer(serializers.Serializer):
+    """Serializer for requesting many employees at once"""
+
+    requesting_company = serializers.PrimaryKeyRelatedField(queryset=Company.objects.all())
+    employees = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.BULK_MAX_IDS,
+    )
+    message = serializers.CharField(required=False, allow_blank=True)
+
+    def validate_requesting_company(self, company):
+        return managed_company(self, company)
+
+
 class BenchRequestResponseSerializer(serializers.Serializer):
     """Serializer for responding to a bench request"""
 
@@ -102,7 +210,11 @@ class BenchRequestResponseSerializer(serializers.Serializer):
     response = serializers.CharField(required=False, allow_blank=True)
 
 
-class ResourceListingSerializer(serializers.ModelSerializer):
+class BenchRequestBulkResponseSerializer(BulkIdsSerializer, BenchRequestResponseSerializer):
+    """Serializer for responding to many bench requests at once"""
+
+
+class ResourceListingSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for ResourceListing model"""
 
     company_name = serializers.CharField(source='company.name', read_only=True)
@@ -123,7 +235,7 @@ class ResourceListingSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'total_resources', 'skills_summary', 'created_at', 'updated_at')
 
 
-class ResourceListingListSerializer(serializers.ModelSerializer):
+class ResourceListingListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Lightweight serializer for resource listing - for /listings page"""
 
     company_name = serializers.CharField(source='company.name', read_only=True)
@@ -141,15 +253,54 @@ class ResourceListingListSerializer(serializers.ModelSerializer):
         )
 
 
+class ResourceListingListValuesSerializer(ValuesSerializer):
+    """Fast read path producing the same output as ResourceListingListSerializer"""
+
+    serializer_class = ResourceListingListSerializer
+
+
+class ResourceListingBulkCreateSerializer(BatchedListSerializer):
+    """Creates many listings and their employee rows with bulk inserts"""
+
+    def create(self, validated_data):
+        listings, memberships = [], []
+        for attrs in validated_data:
+            employees = list({employee.pk: employee for employee in attrs.pop('employees')}.values())
+            # bulk_create sends no m2m_changed, so fill in the computed fields here
+            listings.append(ResourceListing(
+                total_resources=len(employees),
+                skills_summary=summarize_skills(employee.skills for employee in employees),
+                **attrs,
+            ))
+            memberships.append(employees)
+
+        Membership = ResourceListing.employees.through
+        with transaction.atomic():
+            ResourceListing.objects.bulk_create(listings)
+            Membership.objects.bulk_create([
+                Membership(resourcelisting_id=listing.pk, employee_id=employee.pk)
+                for listing, employees in zip(listings, memberships)
+                for employee in employees
+            ])
+        return listings
+
+
 class ResourceListingCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating a resource listing"""
 
+    # Employees are fetched with one query, whatever their number
+    serializer_related_field = BatchedPrimaryKeyRelatedField
+
     class Meta:
         model = ResourceListing
         fields = (
             'company', 'employees', 'title', 'description', 'start_date',
             'expected_end_date', 'locations', 'status', 'additional_params'
         )
+        list_serializer_class = ResourceListingBulkCreateSerializer
+
+    def validate_company(self, company):
+        return managed_company(self, company)
 
     def validate(self, attrs):
         # Ensure at least one employee is selected
@@ -160,7 +311,7 @@ class ResourceListingCreateSerializer(serializers.ModelSerializer):
         # Ensure all employees belong to the same company
         company = attrs.get('company')
         for employee in employees:
-            if employee.company != company:
+            if employee.company_id != company.pk:
                 raise serializers.ValidationError(
                     f"Employee {employee.get_full_name()} does not belong to the selected company."
                 )
@@ -176,12 +327,12 @@ class ResourceListingCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         employees = validated_data.pop('employees')
         resource_listing = ResourceListing.objects.create(**validated_data)
+        # total_resources and skills_summary are filled in by the m2m_changed handler
         resource_listing.employees.set(employees)
-        resource_listing.update_computed_fields()
         return resource_listing
 
 
-class ResourceRequestSerializer(serializers.ModelSerializer):
+class ResourceRequestSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for ResourceRequest model"""
 
     resource_listing_title = serializers.CharField(source='resource_listing.title', read_only=True)
@@ -208,6 +359,9 @@ class ResourceRequestCreateSerializer(serializers.ModelSerializer):
         model = ResourceRequest
         fields = ('resource_listing', 'requesting_company', 'message', 'additional_params')
 
+    def validate_requesting_company(self, company):
+        return managed_company(self, company)
+
     def validate(self, attrs):
         resource_listing = attrs.get('resource_listing')
         requesting_company = attrs.get('requesting_company')
@@ -240,3 +394,7 @@ class ResourceRequestResponseSerializer(serializers.Serializer):
 
     status = serializers.ChoiceField(choices=['approved', 'rejected'])
     response = serializers.CharField(required=False, allow_blank=True)
+
+
+class ResourceRequestBulkResponseSerializer(BulkIdsSerializer, ResourceRequestResponseSerializer):
+    """Serializer for responding to many resource requests at once"""
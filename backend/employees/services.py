@@ -0,0 +1,577 @@
+"""
+State transitions for bench and resource requests that must stay consistent
+under concurrent responses.
+
+Transactions that lock several rows take them in one global order, so two
+responses touching the same rows queue behind each other instead of
+deadlocking: employees, then listings, then resource requests, then bench
+requests, each by ascending pk. Employees come first because saving an
+employee refreshes its listings (employees.signals). Entity rows are locked
+``FOR NO KEY UPDATE``, which does not block inserts referencing them.
+"""
+import time
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q, Subquery
+from django.utils import timezone
+
+from main.realtime import company_channels, publish, row_event
+from outbox.models import OutboxEvent
+from .models import BenchRequest, Employee, EmployeeStatusChange, ResourceListing, ResourceRequest
+
+AUTO_REJECT_RESPONSE = 'Automatically rejected: the employee was allocated to another request.'
+
+ALREADY_ANSWERED = 'This request has already been responded to.'
+EMPLOYEE_UNAVAILABLE = 'This employee is no longer available.'
+LISTING_INACTIVE = 'This resource listing is no longer active.'
+LISTING_UNAVAILABLE = 'Some employees in this listing are no longer available.'
+EMPLOYEE_NOT_FOUND = 'Employee not found.'
+EMPLOYEE_NOT_REQUESTABLE = 'Employee is not available for requests.'
+ALREADY_REQUESTED = 'A pending request already exists for this employee from your company.'
+EXPIRED_RESPONSE = 'Automatically expired: no response within the allowed time.'
+
+EVENT_PREFIXES = {
+    BenchRequest: 'bench_request',
+    ResourceRequest: 'resource_request',
+}
+
+# Company columns (besides requesting_company) whose users follow a request
+OWNER_COMPANY_FIELDS = {
+    BenchRequest: 'employee__company_id',
+    ResourceRequest: 'resource_listing__company_id',
+}
+
+
+class RequestConflict(Exception):
+    """The request can no longer be applied as asked (HTTP 409)"""
+
+
+def _lock(queryset, no_key=False):
+    """Lock ``queryset``'s rows in pk order (see the module docstring); returns their pks"""
+    return list(queryset.order_by('pk').select_for_update(no_key=no_key).values_list('pk', flat=True))
+
+
+def _answer(request_obj, status, response, now):
+    """Move ``request_obj`` out of pending, once; raise RequestConflict otherwise"""
+    answered = type(request_obj).objects.filter(pk=request_obj.pk, status='pending').update(
+        status=status, response=response, responded_at=now
+    )
+    if not answered:
+        raise RequestConflict(ALREADY_ANSWERED)
+
+
+def _auto_reject(queryset, now, cause):
+    """
+    Reject every pending request in ``queryset`` with one UPDATE, recording
+    outbox and real-time events for each. ``cause`` is added to the payloads.
+    """
+    model = queryset.model
+    prefix = EVENT_PREFIXES[model]
+    rows = list(
+        queryset.filter(status='pending')
+        .order_by('pk')
+        .select_for_update(of=('self',))
+        .values_list('pk', 'requesting_company_id', OWNER_COMPANY_FIELDS[model])
+    )
+    if not rows:
+        return rows
+
+    model.objects.filter(pk__in=[pk for pk, _, _ in rows]).update(
+        status='rejected', response=AUTO_REJECT_RESPONSE, responded_at=now
+    )
+    OutboxEvent.objects.record_many(model, (
+        (pk, f'{prefix}.rejected', {
+            'previous_status': 'pending',
+            'status': 'rejected',
+            'requesting_company_id': requesting_company_id,
+            **cause,
+        })
+        for pk, requesting_company_id, _ in rows
+    ))
+    # Conditional updates bypass post_save, so publish explicitly
+    for pk, requesting_company_id, owner_company_id in rows:
+        publish(
+            company_channels(requesting_company_id, owner_company_id),
+            row_event(model, pk, 'rejected'),
+        )
+    return rows
+
+
+def _record_answer(request_obj, status, owner_company_id, responded_by, **payload):
+    _record_answers(type(request_obj), [(
+        request_obj.pk, request_obj.requesting_company_id, owner_company_id, payload,
+    )], status, responded_by)
+
+
+def _record_answers(model, rows, status, responded_by):
+    """
+    Outbox and real-time events for answered requests. ``rows`` are
+    ``(pk, requesting_company_id, owner_company_id, extra_payload)`` tuples.
+    """
+    prefix = EVENT_PREFIXES[model]
+    OutboxEvent.objects.record_many(model, (
+        (pk, f'{prefix}.{status}', {
+            'previous_status': 'pending',
+            'status': status,
+            'requesting_company_id': requesting_company_id,
+            'responded_by': responded_by,
+            **payload,
+        })
+        for pk, requesting_company_id, _, payload in rows
+    ))
+    for pk, requesting_company_id, owner_company_id, _ in rows:
+        publish(
+            company_channels(requesting_company_id, owner_company_id),
+            row_event(model, pk, status),
+        )
+
+
+def respond_to_bench_request(bench_request, status, response='', responded_by=None):
+    """
+    Approve or reject a pending bench request.
+
+    Every change is a conditional UPDATE inside one transaction, so
+    concurrent responses cannot both win:
+
+    - the request only moves out of ``pending`` once;
+    - approval allocates the employee only ``WHERE status = 'available'``,
+      so of two approvals racing for the same employee exactly one succeeds;
+    - the other pending requests for that employee are rejected in one
+      set-based update.
+
+    An approval first locks the employee and then all of their pending
+    requests, in the module's lock order; a rejection only touches its own
+    request row.
+
+    Raises RequestConflict (and changes nothing) when the request was already
+    answered or the employee is no longer available. Updates ``bench_request``
+    (and its loaded employee) in place.
+    """
+    now = timezone.now()
+    employee_company_id = bench_request.employee.company_id
+
+    with transaction.atomic():
+        if status == 'approved':
+            _lock(Employee.objects.filter(pk=bench_request.employee_id), no_key=True)
+            _lock(BenchRequest.objects.filter(employee_id=bench_request.employee_id, status='pending'))
+
+        _answer(bench_request, status, response, now)
+
+        if status == 'approved':
+            allocated = Employee.objects.filter(
+                pk=bench_request.employee_id, status='available'
+            ).update(status='allocated', updated_at=now)
+            if not allocated:
+                # Rolls back the request update above
+                raise RequestConflict(EMPLOYEE_UNAVAILABLE)
+            EmployeeStatusChange.objects.record_many(
+                [(bench_request.employee_id, employee_company_id, 'available', 'allocated')], now
+            )
+
+            _auto_reject(
+                BenchRequest.objects.filter(employee_id=bench_request.employee_id)
+                .exclude(pk=bench_request.pk),
+                now, {'employee_id': bench_request.employee_id, 'auto_rejected_by': bench_request.pk},
+            )
+
+        _record_answer(
+            bench_request, status, employee_company_id, responded_by,
+            employee_id=bench_request.employee_id,
+        )
+
+    bench_request.status = status
+    bench_request.response = response
+    bench_request.responded_at = now
+    if status == 'approved':
+        bench_request.employee.status = 'allocated'
+        bench_request.employee.updated_at = now
+        # Already recorded; a later save() must not record it again
+        bench_request.employee._loaded_status = 'allocated'
+    return bench_request
+
+
+def respond_to_resource_request(resource_request, status, response='', responded_by=None):
+    """
+    Approve or reject a pending resource request.
+
+    Approval allocates the whole listing in one transaction and a fixed
+    number of queries, whatever the listing size:
+
+    - the listing is closed, only if it is still ``active``;
+    - all its employees move to ``allocated`` in one UPDATE, which must
+      cover every employee (none may have been allocated elsewhere);
+    - pending resource requests on any listing sharing those employees, and
+      pending bench requests for them, are rejected in one UPDATE each.
+
+    An approval first locks the listing's employees, the listing and then
+    the pending resource and bench requests it may reject, in the module's
+    lock order; a rejection only touches its own request row.
+
+    Raises RequestConflict (and changes nothing) when the request was already
+    answered, the listing is no longer active or an employee is no longer
+    available. Updates ``resource_request`` (and its loaded listing) in place.
+    """
+    now = timezone.now()
+    listing_id = resource_request.resource_listing_id
+    listing_company_id = resource_request.resource_listing.company_id
+    memberships = ResourceListing.employees.through.objects
+    listing_employee_ids = Subquery(
+        memberships.filter(resourcelisting_id=listing_id).values('employee_id')
+    )
+    # A subquery rather than a join: FOR UPDATE cannot be combined with DISTINCT
+    overlapping_listing_ids = Subquery(
+        memberships.filter(employee_id__in=listing_employee_ids).values('resourcelisting_id')
+    )
+
+    with transaction.atomic():
+        if status == 'approved':
+            employee_ids = _lock(Employee.objects.filter(pk__in=listing_employee_ids), no_key=True)
+            _lock(ResourceListing.objects.filter(pk=listing_id), no_key=True)
+            _lock(ResourceRequest.objects.filter(
+                Q(pk=resource_request.pk) | Q(resource_listing_id__in=overlapping_listing_ids),
+                status='pending',
+            ))
+            _lock(BenchRequest.objects.filter(employee_id__in=employee_ids, status='pending'))
+
+        _answer(resource_request, status, response, now)
+
+        if status == 'approved':
+            closed = ResourceListing.objects.filter(pk=listing_id, status='active').update(
+                status='closed', updated_at=now
+            )
+            if not closed:
+                raise RequestConflict(LISTING_INACTIVE)
+
+            allocated = Employee.objects.filter(
+                pk__in=employee_ids, status='available'
+            ).update(status='allocated', updated_at=now)
+            if allocated != len(employee_ids):
+                # Rolls back the request and listing updates above
+                raise RequestConflict(LISTING_UNAVAILABLE)
+            EmployeeStatusChange.objects.record_transition(
+                Employee.objects.filter(pk__in=employee_ids), 'available', 'allocated', now
+            )
+
+            cause = {'resource_listing_id': listing_id, 'auto_rejected_by': resource_request.pk}
+            _auto_reject(
+                ResourceRequest.objects.filter(resource_listing_id__in=overlapping_listing_ids)
+                .exclude(pk=resource_request.pk),
+                now, cause,
+            )
+            _auto_reject(BenchRequest.objects.filter(employee_id__in=employee_ids), now, cause)
+
+        _record_answer(
+            resource_request, status, listing_company_id, responded_by,
+            resource_listing_id=listing_id,
+        )
+
+    resource_request.status = status
+    resource_request.response = response
+    resource_request.responded_at = now
+    if status == 'approved':
+        resource_request.resource_listing.status = 'closed'
+        resource_request.resource_listing.updated_at = now
+    return resource_request
+
+
+def _lock_pending(model, ids, *fields):
+    """
+    Lock the pending requests among ``ids``; return ``{pk: (fields...)}`` and
+    ``{pk: error}`` for the ids that are no longer pending.
+    """
+    rows = {
+        pk: values
+        for pk, *values in model.objects.filter(pk__in=ids, status='pending')
+        .order_by('pk')
+        .select_for_update(of=('self',))
+        .values_list('pk', *fields)
+    }
+    return rows, {pk: ALREADY_ANSWERED for pk in ids if pk not in rows}
+
+
+def bulk_respond_to_bench_requests(ids, status, response='', responded_by=None):
+    """
+    Apply one decision to many bench requests with a fixed number of
+    set-based queries in one transaction.
+
+    Approvals are granted in ``ids`` order: a request whose employee is no
+    longer available (or was taken by an earlier id in the batch) is left
+    untouched, and the other pending requests for the allocated employees are
+    rejected. Returns ``{id: error}`` for the requests that were not applied.
+
+    Approvals lock the available employees first and then, in one statement,
+    the requests in ``ids`` and all other pending requests for those
+    employees, following the module's lock order.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        available = set()
+        if status == 'approved':
+            # A request's employee never changes, so it can be read before locking
+            employee_ids = BenchRequest.objects.filter(pk__in=ids, status='pending').values('employee_id')
+            available = set(_lock(Employee.objects.filter(pk__in=employee_ids, status='available'), no_key=True))
+            _lock(BenchRequest.objects.filter(Q(pk__in=ids) | Q(employee_id__in=available), status='pending'))
+
+        rows, errors = _lock_pending(
+            BenchRequest, ids, 'employee_id', 'requesting_company_id', 'employee__company_id'
+        )
+        answered = [pk for pk in ids if pk in rows]
+
+        allocated = set()
+        if status == 'approved' and answered:
+            winners = []
+            for pk in answered:
+                employee_id = rows[pk][0]
+                if employee_id in available:
+                    winners.append(pk)
+                    available.discard(employee_id)
+                    allocated.add(employee_id)
+                else:
+                    errors[pk] = EMPLOYEE_UNAVAILABLE
+            answered = winners
+            Employee.objects.filter(pk__in=allocated).update(status='allocated', updated_at=now)
+            EmployeeStatusChange.objects.record_many(
+                ((rows[pk][0], rows[pk][2], 'available', 'allocated') for pk in answered), now
+            )
+
+        BenchRequest.objects.filter(pk__in=answered).update(
+            status=status, response=response, responded_at=now
+        )
+
+        if allocated:
+            _auto_reject(
+                BenchRequest.objects.filter(employee_id__in=allocated).exclude(pk__in=answered),
+                now, {'auto_rejected_by': answered},
+            )
+
+        _record_answers(BenchRequest, [
+            (pk, rows[pk][1], rows[pk][2], {'employee_id': rows[pk][0]})
+            for pk in answered
+        ], status, responded_by)
+
+    return errors
+
+
+def bulk_respond_to_resource_requests(ids, status, response='', responded_by=None):
+    """
+    Apply one decision to many resource requests with a fixed number of
+    set-based queries in one transaction.
+
+    Approvals are granted in ``ids`` order: a request whose listing is no
+    longer active, or any of whose employees is no longer available (or was
+    taken by an earlier id in the batch), is left untouched. Competing
+    resource and bench requests for the allocated employees are rejected.
+    Returns ``{id: error}`` for the requests that were not applied.
+
+    Approvals lock the available employees, the active listings, then the
+    pending resource requests (those in ``ids`` and those they may reject)
+    and the pending bench requests for those employees, following the
+    module's lock order.
+    """
+    now = timezone.now()
+    memberships = ResourceListing.employees.through.objects
+
+    with transaction.atomic():
+        if status == 'approved':
+            # A request's listing never changes, so it can be read before locking
+            listing_ids = set(
+                ResourceRequest.objects.filter(pk__in=ids, status='pending')
+                .values_list('resource_listing_id', flat=True)
+            )
+            members = defaultdict(set)
+            for listing_id, employee_id in memberships.filter(
+                resourcelisting_id__in=listing_ids
+            ).values_list('resourcelisting_id', 'employee_id'):
+                members[listing_id].add(employee_id)
+
+            available = set(_lock(
+                Employee.objects.filter(pk__in=set().union(*members.values()), status='available'),
+                no_key=True,
+            ))
+            active = set(_lock(ResourceListing.objects.filter(pk__in=listing_ids, status='active'), no_key=True))
+            _lock(ResourceRequest.objects.filter(
+                Q(pk__in=ids)
+                | Q(resource_listing_id__in=Subquery(
+                    memberships.filter(employee_id__in=available).values('resourcelisting_id')
+                )),
+                status='pending',
+            ))
+            _lock(BenchRequest.objects.filter(employee_id__in=available, status='pending'))
+
+        rows, errors = _lock_pending(
+            ResourceRequest, ids,
+            'resource_listing_id', 'requesting_company_id', 'resource_listing__company_id',
+        )
+        answered = [pk for pk in ids if pk in rows]
+
+        allocated = set()
+        if status == 'approved' and answered:
+            winners = []
+            for pk in answered:
+                listing_id = rows[pk][0]
+                if listing_id not in active:
+                    errors[pk] = LISTING_INACTIVE
+                elif not members[listing_id] <= available:
+                    errors[pk] = LISTING_UNAVAILABLE
+                else:
+                    winners.append(pk)
+                    active.discard(listing_id)
+                    available -= members[listing_id]
+                    allocated |= members[listing_id]
+            answered = winners
+
+            ResourceListing.objects.filter(
+                pk__in={rows[pk][0] for pk in answered}
+            ).update(status='closed', updated_at=now)
+            allocated_employees = Employee.objects.filter(pk__in=allocated)
+            allocated_employees.update(status='allocated', updated_at=now)
+            EmployeeStatusChange.objects.record_transition(allocated_employees, 'available', 'allocated', now)
+
+        ResourceRequest.objects.filter(pk__in=answered).update(
+            status=status, response=response, responded_at=now
+        )
+
+        if allocated:
+            cause = {'auto_rejected_by': answered}
+            overlapping_listing_ids = Subquery(
+                memberships.filter(employee_id__in=allocated).values('resourcelisting_id')
+            )
+            _auto_reject(
+                ResourceRequest.objects.filter(resource_listing_id__in=overlapping_listing_ids)
+                .exclude(pk__in=answered),
+                now, cause,
+            )
+            _auto_reject(BenchRequest.objects.filter(employee_id__in=allocated), now, cause)
+
+        _record_answers(ResourceRequest, [
+            (pk, rows[pk][1], rows[pk][2], {'resource_listing_id': rows[pk][0]})
+            for pk in answered
+        ], status, responded_by)
+
+    return errors
+
+
+def _requestable(requesting_company_id, employee_ids):
+    """
+    Split ``employee_ids`` into ``{id: company_id}`` for those the company
+    can request and ``{id: error}`` for the rest, with one query for
+    availability and one for pending duplicates.
+    """
+    employees = {
+        pk: (status, company_id)
+        for pk, status, company_id in Employee.objects.filter(pk__in=employee_ids)
+        .values_list('pk', 'status', 'company_id')
+    }
+    already_requested = set(
+        BenchRequest.objects.filter(
+            requesting_company_id=requesting_company_id,
+            employee_id__in=employee_ids,
+            status='pending',
+        ).values_list('employee_id', flat=True)
+    )
+
+    requestable, errors = {}, {}
+    for employee_id in employee_ids:
+        if employee_id not in employees:
+            errors[employee_id] = EMPLOYEE_NOT_FOUND
+        elif employees[employee_id][0] != 'available':
+            errors[employee_id] = EMPLOYEE_NOT_REQUESTABLE
+        elif employee_id in already_requested:
+            errors[employee_id] = ALREADY_REQUESTED
+        else:
+            requestable[employee_id] = employees[employee_id][1]
+    return requestable, errors
+
+
+def bulk_create_bench_requests(requesting_company, employee_ids, message=''):
+    """
+    Request many employees for ``requesting_company`` at once.
+
+    Validation takes two queries for the whole set and the requests are
+    inserted with one ``bulk_create``. Employees that cannot be requested
+    are skipped. Returns ``({employee_id: request}, {employee_id: error})``.
+    """
+    for attempt in range(2):
+        requestable, errors = _requestable(requesting_company.pk, employee_ids)
+        try:
+            with transaction.atomic():
+                created = BenchRequest.objects.bulk_create([
+                    BenchRequest(
+                        employee_id=employee_id,
+                        requesting_company=requesting_company,
+                        message=message,
+                    )
+                    for employee_id in requestable
+                ])
+                break
+        except IntegrityError:
+            # A concurrent request for one of the employees committed in
+            # between; validate again so it is reported as a duplicate
+            if attempt:
+                raise
+
+    # bulk_create bypasses post_save, so publish explicitly
+    for bench_request in created:
+        publish(
+            company_channels(requesting_company.pk, requestable[bench_request.employee_id]),
+            row_event(BenchRequest, bench_request.pk, bench_request.status, created=True),
+        )
+    return {bench_request.employee_id: bench_request for bench_request in created}, errors
+
+
+def _sweep(queryset, fields, apply, batch_size, pause=0):
+    """
+    Call ``apply(rows)`` on ``queryset``'s ``values_list('pk', *fields)`` in
+    keyset-ordered batches of at most ``batch_size``, each locked and updated
+    in its own short transaction. Rows locked by a concurrent writer are
+    skipped until a later run. Returns the sum of what ``apply`` returns.
+    """
+    queryset = queryset.order_by('pk').select_for_update(of=('self',), skip_locked=True)
+    done = last_pk = 0
+    while True:
+        with transaction.atomic():
+            rows = list(queryset.filter(pk__gt=last_pk).values_list('pk', *fields)[:batch_size])
+            if not rows:
+                return done
+            done += apply(rows)
+        last_pk = rows[-1][0]
+        if pause:
+            time.sleep(pause)
+
+
+def expire_pending_requests(model, cutoff, batch_size, pause=0):
+    """
+    Expire ``model`` requests (bench or resource) pending since before
+    ``cutoff``. Returns the number expired.
+    """
+    def expire(rows):
+        now = timezone.now()
+        expired = model.objects.filter(pk__in=[pk for pk, _, _ in rows], status='pending').update(
+            status='expired', response=EXPIRED_RESPONSE, responded_at=now
+        )
+        _record_answers(model, [
+            (pk, requesting_company_id, owner_company_id, {})
+            for pk, requesting_company_id, owner_company_id in rows
+        ], 'expired', None)
+        return expired
+
+    return _sweep(
+        model.objects.filter(status='pending', requested_at__lt=cutoff),
+        ('requesting_company_id', OWNER_COMPANY_FIELDS[model]),
+        expire, batch_size, pause,
+    )
+
+
+def close_ended_listings(today, batch_size, pause=0):
+    """Close active listings whose expected end date is before ``today``"""
+    def close(rows):
+        return ResourceListing.objects.filter(
+            pk__in=[pk for pk, in rows], status='active'
+        ).update(status='closed', updated_at=timezone.now())
+
+    return _sweep(
+        ResourceListing.objects.filter(status='active', expected_end_date__lt=today),
+        (), close, batch_size, pause,
+    )
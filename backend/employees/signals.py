@@ -0,0 +1,90 @@
+"""
+Publish real-time events when bench and resource requests change, keep
+resource listings' computed fields current as their employees change, and
+record employee status transitions.
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from main.realtime import company_channels, model_event, publish
+from .models import BenchRequest, Employee, EmployeeStatusChange, ResourceListing, ResourceRequest
+
+
+def bench_request_channels(bench_request):
+    return company_channels(
+        bench_request.requesting_company_id, bench_request.employee.company_id
+    )
+
+
+def resource_request_channels(resource_request):
+    return company_channels(
+        resource_request.requesting_company_id, resource_request.resource_listing.company_id
+    )
+
+
+@receiver(post_save, sender=BenchRequest)
+def publish_bench_request(sender, instance, created=False, **kwargs):
+    publish(bench_request_channels(instance), model_event(instance, created))
+
+
+@receiver(post_save, sender=ResourceRequest)
+def publish_resource_request(sender, instance, created=False, **kwargs):
+    publish(resource_request_channels(instance), model_event(instance, created))
+
+
+@receiver(m2m_changed, sender=ResourceListing.employees.through)
+def refresh_listings_on_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Refresh the listings whose employees were added, removed or cleared"""
+    if action == 'pre_clear' and reverse:
+        # Which listings an employee leaves is unknown once the rows are gone
+        instance._cleared_listing_ids = list(instance.resource_listings.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        listings = ResourceListing.objects.filter(pk=instance.pk)
+    elif action == 'post_clear':
+        listings = ResourceListing.objects.filter(pk__in=instance.__dict__.pop('_cleared_listing_ids', []))
+    else:
+        listings = ResourceListing.objects.filter(pk__in=pk_set)
+    listings.refresh_computed_fields()
+
+
+@receiver(post_save, sender=Employee)
+def refresh_listings_on_skills_change(sender, instance, created=False, update_fields=None, **kwargs):
+    """Refresh the listings of an employee whose skills changed"""
+    if created or (update_fields is not None and 'skills' not in update_fields):
+        return
+    if instance.skills == getattr(instance, '_loaded_skills', None):
+        return
+    ResourceListing.objects.filter(employees=instance).refresh_computed_fields()
+    instance._loaded_skills = instance.skills
+
+
+@receiver(post_save, sender=Employee)
+def record_status_change(sender, instance, created=False, update_fields=None, **kwargs):
+    """Append to the status history when a save (admin, API) changes the status"""
+    if update_fields is not None and 'status' not in update_fields:
+        return
+    from_status = '' if created else getattr(instance, '_loaded_status', None)
+    if from_status is None or from_status == instance.status:
+        return
+    EmployeeStatusChange.objects.create(
+        employee=instance, company_id=instance.company_id,
+        from_status=from_status, to_status=instance.status,
+    )
+    instance._loaded_status = instance.status
+
+
+@receiver(pre_delete, sender=Employee)
+def remember_listings_of_deleted_employee(sender, instance, **kwargs):
+    # Deletion cascades to the membership rows without sending m2m_changed
+    instance._deleted_listing_ids = list(instance.resource_listings.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Employee)
+def refresh_listings_of_deleted_employee(sender, instance, **kwargs):
+    listing_ids = instance.__dict__.pop('_deleted_listing_ids', [])
+    if listing_ids:
+        ResourceListing.objects.filter(pk__in=listing_ids).refresh_computed_fields()
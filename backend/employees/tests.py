@@ -1,3 +1,362 @@
-from django.test import TestCase
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from unittest import skipUnless
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from companies.models import Company
+from outbox.models import OutboxEvent
+from . import analytics
+from .forecast import availability_forecast
+from .models import BenchRequest, Employee, EmployeeStatusChange, ResourceListing, ResourceRequest
+from .services import (
+    ALREADY_ANSWERED,
+    AUTO_REJECT_RESPONSE,
+    EMPLOYEE_UNAVAILABLE,
+    LISTING_INACTIVE,
+    LISTING_UNAVAILABLE,
+    RequestConflict,
+    bulk_respond_to_bench_requests,
+    bulk_respond_to_resource_requests,
+    respond_to_bench_request,
+    respond_to_resource_request,
+)
+
+
+class RequestFixtures:
+    """An owning company with employees, and companies competing for them"""
+
+    competitors = 3
+
+    def create_fixtures(self):
+        self.owner = User.objects.create_user(email='owner@example.com', first_name='Owner', last_name='User')
+        self.company = self.make_company(self.owner, 'owner')
+        self.requesters = [
+            self.make_company(
+                User.objects.create_user(email=f'requester{i}@example.com', first_name='Requester', last_name=str(i)),
+                f'requester{i}',
+            )
+            for i in range(self.competitors)
+        ]
+
+    def make_company(self, user, name):
+        return Company.objects.create(name=f'{name} company', email=f'{name}@example.com', admin_user=user)
+
+    def make_employee(self, name, company=None):
+        return Employee.objects.create(
+            first_name=name, last_name='Bench', email=f'{name}@example.com', job_title='Engineer',
+            experience_years=5, skills='Python, Django', company=company or self.company,
+            bench_start_date=date.today(),
+        )
+
+    def make_listing(self, *employees):
+        listing = ResourceListing.objects.create(company=self.company, title='Bench', start_date=date.today())
+        listing.employees.set(employees)
+        return listing
+
+    def bench_requests(self, employee):
+        return [
+            BenchRequest.objects.create(employee=employee, requesting_company=company)
+            for company in self.requesters
+        ]
+
+    def resource_requests(self, listing):
+        return [
+            ResourceRequest.objects.create(resource_listing=listing, requesting_company=company)
+            for company in self.requesters
+        ]
+
+    def statuses(self, requests):
+        return [type(request).objects.get(pk=request.pk).status for request in requests]
+
+
+class BenchRequestResponseTests(RequestFixtures, TestCase):
+
+    def setUp(self):
+        self.create_fixtures()
+        self.employee = self.make_employee('alice')
+        self.requests = self.bench_requests(self.employee)
+
+    def test_approval_allocates_and_rejects_competitors(self):
+        winner, *losers = self.requests
+        respond_to_bench_request(winner, 'approved', responded_by=self.owner.pk)
+
+        self.assertEqual(self.statuses(self.requests), ['approved', 'rejected', 'rejected'])
+        self.assertEqual(
+            set(BenchRequest.objects.filter(pk__in=[loser.pk for loser in losers]).values_list('response', flat=True)),
+            {AUTO_REJECT_RESPONSE},
+        )
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.status, 'allocated')
+        self.assertTrue(EmployeeStatusChange.objects.filter(
+            employee=self.employee, from_status='available', to_status='allocated'
+        ).exists())
+        self.assertEqual(
+            Counter(OutboxEvent.objects.filter(topic='employees.benchrequest').values_list('event_type', flat=True)),
+            {'bench_request.approved': 1, 'bench_request.rejected': 2},
+        )
+
+    def test_auto_rejected_request_cannot_be_approved(self):
+        winner, loser, _ = self.requests
+        respond_to_bench_request(winner, 'approved')
+
+        with self.assertRaisesMessage(RequestConflict, ALREADY_ANSWERED):
+            respond_to_bench_request(BenchRequest.objects.get(pk=loser.pk), 'approved')
+
+    def test_unavailable_employee_changes_nothing(self):
+        Employee.objects.filter(pk=self.employee.pk).update(status='allocated')
+
+        with self.assertRaisesMessage(RequestConflict, EMPLOYEE_UNAVAILABLE):
+            respond_to_bench_request(self.requests[0], 'approved')
+        self.assertEqual(self.statuses(self.requests), ['pending'] * self.competitors)
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_rejection_only_answers_its_request(self):
+        respond_to_bench_request(self.requests[0], 'rejected')
+
+        self.assertEqual(self.statuses(self.requests), ['rejected', 'pending', 'pending'])
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.status, 'available')
+
+    def test_respond_endpoint_reports_conflicts(self):
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        winner, loser, _ = self.requests
+
+        response = client.post(f'/api/requests/{winner.pk}/respond/', {'status': 'approved'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = client.post(f'/api/requests/{loser.pk}/respond/', {'status': 'approved'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data, {'error': ALREADY_ANSWERED})
+
+    def test_bulk_approval_grants_the_first_request_per_employee(self):
+        first, second, third = self.requests
+        errors = bulk_respond_to_bench_requests([first.pk, second.pk], 'approved')
+
+        self.assertEqual(errors, {second.pk: EMPLOYEE_UNAVAILABLE})
+        self.assertEqual(self.statuses(self.requests), ['approved', 'rejected', 'rejected'])
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.status, 'allocated')
+
+
+class ResourceRequestResponseTests(RequestFixtures, TestCase):
+
+    def setUp(self):
+        self.create_fixtures()
+        self.alice, self.bob, self.carol = (self.make_employee(name) for name in ('alice', 'bob', 'carol'))
+        self.listing = self.make_listing(self.alice, self.bob)
+        # Shares bob with the first listing
+        self.overlapping = self.make_listing(self.bob, self.carol)
+        self.requests = self.resource_requests(self.listing)
+        self.overlapping_requests = self.resource_requests(self.overlapping)
+        self.bench_request = BenchRequest.objects.create(employee=self.alice, requesting_company=self.requesters[0])
+
+    def test_approval_allocates_the_listing_and_rejects_competitors(self):
+        respond_to_resource_request(self.requests[0], 'approved')
+
+        self.assertEqual(self.statuses(self.requests), ['approved', 'rejected', 'rejected'])
+        self.assertEqual(self.statuses(self.overlapping_requests), ['rejected'] * self.competitors)
+        self.assertEqual(self.statuses([self.bench_request]), ['rejected'])
+        self.assertEqual(ResourceListing.objects.get(pk=self.listing.pk).status, 'closed')
+        self.assertEqual(
+            dict(Employee.objects.values_list('first_name', 'status')),
+            {'alice': 'allocated', 'bob': 'allocated', 'carol': 'available'},
+        )
+
+    def test_partly_allocated_listing_changes_nothing(self):
+        Employee.objects.filter(pk=self.bob.pk).update(status='allocated')
+
+        with self.assertRaisesMessage(RequestConflict, LISTING_UNAVAILABLE):
+            respond_to_resource_request(self.requests[0], 'approved')
+        self.assertEqual(self.statuses(self.requests), ['pending'] * self.competitors)
+        self.assertEqual(ResourceListing.objects.get(pk=self.listing.pk).status, 'active')
+        self.assertEqual(Employee.objects.get(pk=self.alice.pk).status, 'available')
+
+    def test_closed_listing_conflicts(self):
+        ResourceListing.objects.filter(pk=self.listing.pk).update(status='closed')
+
+        with self.assertRaisesMessage(RequestConflict, LISTING_INACTIVE):
+            respond_to_resource_request(self.requests[0], 'approved')
+        self.assertEqual(self.statuses(self.requests), ['pending'] * self.competitors)
+
+    def test_bulk_approval_skips_listings_sharing_allocated_employees(self):
+        first = self.requests[0]
+        overlapping = self.overlapping_requests[0]
+        errors = bulk_respond_to_resource_requests([first.pk, overlapping.pk], 'approved')
+
+        self.assertEqual(errors, {overlapping.pk: LISTING_UNAVAILABLE})
+        self.assertEqual(self.statuses([first, overlapping]), ['approved', 'rejected'])
+        self.assertEqual(ResourceListing.objects.get(pk=self.overlapping.pk).status, 'active')
+
+
+class CompanyPermissionTests(RequestFixtures, TestCase):
+    """Creating on behalf of a company needs to manage it"""
+
+    def setUp(self):
+        self.create_fixtures()
+        self.employee = self.make_employee('alice')
+        self.requester = self.requesters[0]
+        self.client = APIClient()
+        self.client.force_authenticate(self.requester.admin_user)
+
+    def test_bench_requests_for_another_company_are_refused(self):
+        other = self.requesters[1]
+        for path, data in (
+            ('/api/requests/', {'employee': self.employee.pk, 'requesting_company': other.pk}),
+            ('/api/requests/bulk-create/', {'employees': [self.employee.pk], 'requesting_company': other.pk}),
+        ):
+            response = self.client.post(path, data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN, path)
+        self.assertFalse(BenchRequest.objects.exists())
+
+        response = self.client.post('/api/requests/bulk-create/', {
+            'employees': [self.employee.pk], 'requesting_company': self.requester.pk,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_listing_batch_with_another_company_is_refused(self):
+        listing = {'title': 'Bench', 'start_date': date.today()}
+        theirs = self.make_employee('bob', company=self.requester)
+        self.client.force_authenticate(self.owner)
+
+        response = self.client.post('/api/resource-listings/bulk-create/', [
+            {**listing, 'company': self.company.pk, 'employees': [self.employee.pk]},
+            {**listing, 'company': self.requester.pk, 'employees': [theirs.pk]},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(ResourceListing.objects.exists())
+
+
+class AvailabilityForecastTests(RequestFixtures, TestCase):
+
+    def setUp(self):
+        self.create_fixtures()
+        self.today = date.today()
+        for name, skills in (('alice', 'Python, Django'), ('bob', 'python'), ('carol', 'Go, PYTHON, python')):
+            employee = self.make_employee(name)
+            Employee.objects.filter(pk=employee.pk).update(skills=skills, experience_level='senior')
+        Employee.objects.filter(first_name='bob').update(expected_availability_end=self.today + timedelta(days=3))
+
+    def skill_curves(self, **kwargs):
+        report = availability_forecast(Employee.objects.all(), self.today, 1, 'day', **kwargs)
+        return {(row['skill'], row['experience_level']): row['available'] for row in report['results']}, report
+
+    def test_skills_are_grouped_case_insensitively(self):
+        curves, _ = self.skill_curves()
+
+        self.assertEqual(set(curves), {('Django', 'senior'), ('Go', 'senior'), ('PYTHON', 'senior')})
+        # Carol lists Python twice but counts once
+        self.assertEqual(curves[('PYTHON', 'senior')], [3, 3, 3, 3, 2, 2, 2])
+
+    def test_skill_filter_matches_any_case(self):
+        curves, report = self.skill_curves(skill='pYthon')
+
+        self.assertEqual(list(curves), [('PYTHON', 'senior')])
+        self.assertEqual(report['total'], [3, 3, 3, 3, 2, 2, 2])
+
+
+class StatusHistoryReportTests(RequestFixtures, TestCase):
+    """Reports over a range must account for the state employees entered it in"""
+
+    def setUp(self):
+        self.create_fixtures()
+        self.end = timezone.now() - timedelta(days=10)
+        self.start = self.end - timedelta(days=20)
+        self.alice = self.make_employee('alice')
+        self.bob = self.make_employee('bob')
+        self.carol = self.make_employee('carol', company=self.requesters[0])
+        EmployeeStatusChange.objects.all().delete()
+        self.history(self.alice, [
+            (-40, '', 'available'), (-20, 'available', 'requested'), (5, 'requested', 'allocated'),
+            (8, 'allocated', 'available'), (21, 'available', 'allocated'),
+        ])
+        # Benched before the range and never changed within it
+        self.history(self.bob, [(-50, '', 'allocated'), (-10, 'allocated', 'available')])
+        self.history(self.carol, [(2, '', 'available'), (6, 'available', 'allocated')])
+
+    def history(self, employee, changes):
+        EmployeeStatusChange.objects.bulk_create([
+            EmployeeStatusChange(
+                employee=employee, company=employee.company, from_status=from_status,
+                to_status=to_status, changed_at=self.start + timedelta(days=days),
+            )
+            for days, from_status, to_status in changes
+        ])
+
+    def test_bench_duration_includes_spells_open_at_start(self):
+        results = analytics.bench_duration_by_company(self.start, self.end)
+
+        self.assertEqual(results, [
+            {'company': self.company.pk, 'employees': 2, 'avg_bench_days': 18.5,
+             'max_bench_days': 20.0, 'total_bench_days': 37.0},
+            {'company': self.requesters[0].pk, 'employees': 1, 'avg_bench_days': 4.0,
+             'max_bench_days': 4.0, 'total_bench_days': 4.0},
+        ])
+        scoped = analytics.bench_duration_by_company(self.start, self.end, [self.company.pk])
+        self.assertEqual(scoped, results[:1])
+
+    def test_allocations_measure_the_whole_bench_spell(self):
+        results = analytics.allocation_throughput(self.start, self.end, 'month', [self.company.pk])
+
+        self.assertEqual(sum(row['allocations'] for row in results), 1)
+        self.assertEqual([row['avg_bench_days'] for row in results if row['allocations']], [45.0])
+
+    def test_employee_bench_days(self):
+        self.assertEqual(analytics.employee_bench_days(self.alice.pk, end=self.end), 57.0)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Row locks need PostgreSQL')
+class ConcurrentApprovalTests(RequestFixtures, TransactionTestCase):
+    """Approvals racing from separate connections: exactly one may win"""
+
+    competitors = 8
+
+    def setUp(self):
+        self.create_fixtures()
+
+    def race(self, respond, requests):
+        barrier = threading.Barrier(len(requests))
+
+        def approve(request):
+            try:
+                request = type(request).objects.get(pk=request.pk)
+                barrier.wait()
+                respond(request, 'approved')
+                return 'approved'
+            except RequestConflict:
+                return 'conflict'
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+            return Counter(executor.map(approve, requests))
+
+    def test_bench_approvals_for_one_employee(self):
+        employee = self.make_employee('alice')
+        requests = self.bench_requests(employee)
+
+        outcomes = self.race(respond_to_bench_request, requests)
+
+        self.assertEqual(outcomes, {'approved': 1, 'conflict': self.competitors - 1})
+        self.assertEqual(Counter(self.statuses(requests)), {'approved': 1, 'rejected': self.competitors - 1})
+        self.assertEqual(Employee.objects.get(pk=employee.pk).status, 'allocated')
+
+    def test_resource_approvals_for_overlapping_listings(self):
+        alice, bob, carol = (self.make_employee(name) for name in ('alice', 'bob', 'carol'))
+        requests = self.resource_requests(self.make_listing(alice, bob)) + self.resource_requests(
+            self.make_listing(bob, carol)
+        )
+        bench_requests = self.bench_requests(bob)
+
+        outcomes = self.race(respond_to_resource_request, requests)
+
+        self.assertEqual(outcomes, {'approved': 1, 'conflict': len(requests) - 1})
+        self.assertEqual(Counter(self.statuses(requests)), {'approved': 1, 'rejected': len(requests) - 1})
+        self.assertEqual(self.statuses(bench_requests), ['rejected'] * self.competitors)
@@ -1,6 +1,7 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 from .views import EmployeeViewSet, BenchRequestViewSet, ResourceListingViewSet, ResourceRequestViewSet
+from . import async_views
 
 router = DefaultRouter()
 router.register(r'employees', EmployeeViewSet, basename='employee')
@@ -8,4 +9,12 @@ router.register(r'requests', BenchRequestViewSet, basename='bench-request')
 router.register(r'resource-listings', ResourceListingViewSet, basename='resource-listing')
 router.register(r'resource-requests', ResourceRequestViewSet, basename='resource-request')
 
-urlpatterns = router.urls
+# Native async read endpoints (served without thread hops under ASGI)
+async_urlpatterns = [
+    path('async/employees/', async_views.employee_list, name='async-employee-list'),
+    path('async/employees/<int:pk>/', async_views.employee_detail, name='async-employee-detail'),
+    path('async/resource-listings/', async_views.resource_listing_list, name='async-resource-listing-list'),
+    path('async/requests/pending/', async_views.pending_bench_requests, name='async-bench-request-pending'),
+]
+
+urlpatterns = router.urls + async_urlpatterns
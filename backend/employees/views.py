@@ -1,26 +1,46 @@
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.utils import timezone
+from main.mixins import BulkRespondMixin, QueryPlanMixin, ReplicaReadMixin, ValuesListMixin
+from . import analytics
 from .models import Employee, BenchRequest, ResourceListing, ResourceRequest
+from .services import (
+    RequestConflict,
+    bulk_create_bench_requests,
+    bulk_respond_to_bench_requests,
+    bulk_respond_to_resource_requests,
+    respond_to_bench_request,
+    respond_to_resource_request,
+)
 from .serializers import (
     EmployeeSerializer,
     EmployeeCreateSerializer,
     EmployeeListSerializer,
+    EmployeeListValuesSerializer,
+    EmployeeStatusChangeSerializer,
+    StatusHistoryReportSerializer,
+    AvailabilityForecastSerializer,
     BenchRequestSerializer,
+    BenchRequestValuesSerializer,
     BenchRequestCreateSerializer,
+    BenchRequestBulkCreateSerializer,
     BenchRequestResponseSerializer,
+    BenchRequestBulkResponseSerializer,
     ResourceListingSerializer,
     ResourceListingListSerializer,
+    ResourceListingListValuesSerializer,
     ResourceListingCreateSerializer,
     ResourceRequestSerializer,
     ResourceRequestCreateSerializer,
-    ResourceRequestResponseSerializer
+    ResourceRequestResponseSerializer,
+    ResourceRequestBulkResponseSerializer,
 )
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(ReplicaReadMixin, ValuesListMixin, viewsets.ModelViewSet):
     """API endpoint for employee management"""
     
     queryset = Employee.objects.all()
@@ -28,6 +48,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['first_name', 'last_name', 'job_title', 'skills']
     ordering_fields = ['created_at', 'bench_start_date', 'experience_years']
+    values_serializer_classes = {'list': EmployeeListValuesSerializer}
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -43,7 +64,8 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             return Employee.objects.none()
 
         user = self.request.user
-        queryset = Employee.objects.select_related('company')
+        # Joins are derived from the action's serializer in plan_queryset
+        queryset = Employee.objects.all()
 
         # Filter by status if provided
         status_param = self.request.query_params.get('status', None)
@@ -61,7 +83,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         if experience_level:
             queryset = queryset.filter(experience_level=experience_level)
 
-        return queryset.filter(is_active=True)
+        return self.plan_queryset(queryset.filter(is_active=True))
     
     @action(detail=False, methods=['get'])
     def available(self, request):
@@ -70,18 +92,101 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(employees, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'], url_path='status-history')
+    def status_history(self, request, pk=None):
+        """Status timeline of an employee and their total days on the bench"""
+        employee = self.get_object()
+        changes = analytics.status_timeline(employee.pk)
+        return Response({
+            'employee': employee.pk,
+            'bench_days': analytics.employee_bench_days(employee.pk),
+            'changes': EmployeeStatusChangeSerializer(changes, many=True).data,
+        })
+
+    def report_params(self, serializer_class=StatusHistoryReportSerializer):
+        """Validated report parameters and the companies they cover (None: all)"""
+        serializer = serializer_class(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
 
-class BenchRequestViewSet(viewsets.ModelViewSet):
+        user = self.request.user
+        company = params.get('company')
+        if user.role == 'admin':
+            company_ids = None if company is None else [company]
+        else:
+            company_ids = set(user.managed_companies.values_list('pk', flat=True))
+            if company is not None:
+                company_ids &= {company}
+        return params, company_ids
+
+    @action(detail=False, methods=['get'], url_path='bench-duration')
+    def bench_duration(self, request):
+        """Days on the bench per company between start and end"""
+        params, company_ids = self.report_params()
+        return Response({
+            'start': params['start'],
+            'end': params['end'],
+            'results': analytics.bench_duration_by_company(params['start'], params['end'], company_ids),
+        })
+
+    @action(detail=False, methods=['get'], url_path='allocation-throughput')
+    def allocation_throughput(self, request):
+        """Allocations from the bench per day, week or month between start and end"""
+        params, company_ids = self.report_params()
+        return Response({
+            'start': params['start'],
+            'end': params['end'],
+            'period': params['period'],
+            'results': analytics.allocation_throughput(
+                params['start'], params['end'], params['period'], company_ids
+            ),
+        })
+
+    @action(detail=False, methods=['get'], url_path='availability-forecast')
+    def availability_forecast(self, request):
+        """Projected available headcount per skill and experience level over the next weeks"""
+        # Imported on first use: NumPy would add to every worker's startup
+        from . import forecast
+
+        params, company_ids = self.report_params(AvailabilityForecastSerializer)
+        queryset = Employee.objects.all()
+        if company_ids is not None:
+            queryset = queryset.filter(company__in=company_ids)
+        if 'experience_level' in params:
+            queryset = queryset.filter(experience_level=params['experience_level'])
+        today = timezone.localdate()
+        return Response({
+            'start': today,
+            'weeks': params['weeks'],
+            'interval': params['interval'],
+            **forecast.availability_forecast(
+                queryset, today, params['weeks'], params['interval'], params.get('skill')
+            ),
+        })
+
+
+class BenchRequestViewSet(ReplicaReadMixin, BulkRespondMixin, ValuesListMixin, viewsets.ModelViewSet):
     """API endpoint for bench request management"""
     
     queryset = BenchRequest.objects.all()
     permission_classes = [IsAuthenticated]
+    values_serializer_classes = {
+        'list': BenchRequestValuesSerializer,
+        'pending': BenchRequestValuesSerializer,
+    }
+    bulk_respond_serializer_class = BenchRequestBulkResponseSerializer
+    bulk_respond_service = staticmethod(bulk_respond_to_bench_requests)
+    respond_owner_field = 'employee__company__admin_user'
     
     def get_serializer_class(self):
         if self.action == 'create':
             return BenchRequestCreateSerializer
+        elif self.action == 'bulk_create':
+            return BenchRequestBulkCreateSerializer
         elif self.action == 'respond':
             return BenchRequestResponseSerializer
+        elif self.action == 'bulk_respond':
+            return BenchRequestBulkResponseSerializer
         return BenchRequestSerializer
     
     def get_queryset(self):
@@ -101,7 +206,9 @@ class BenchRequestViewSet(viewsets.ModelViewSet):
             employee__company__in=user_companies
         )
 
-        return queryset.select_related('employee', 'requesting_company', 'employee__company')
+        return self.plan_queryset(
+            queryset.select_related('employee', 'requesting_company', 'employee__company')
+        )
     
     @action(detail=True, methods=['post'])
     def respond(self, request, pk=None):
@@ -118,31 +225,55 @@ class BenchRequestViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_403_FORBIDDEN
                 )
             
-            # Update request status
-            bench_request.status = serializer.validated_data['status']
-            bench_request.response = serializer.validated_data.get('response', '')
-            bench_request.responded_at = timezone.now()
-            bench_request.save()
-            
-            # Update employee status if approved
-            if bench_request.status == 'approved':
-                bench_request.employee.status = 'allocated'
-                bench_request.employee.save()
+            try:
+                respond_to_bench_request(
+                    bench_request,
+                    serializer.validated_data['status'],
+                    serializer.validated_data.get('response', ''),
+                    responded_by=request.user.pk,
+                )
+            except RequestConflict as exc:
+                return Response({'error': str(exc)}, status=status.HTTP_409_CONFLICT)
             
             response_serializer = BenchRequestSerializer(bench_request)
             return Response(response_serializer.data)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+    @action(detail=False, methods=['post'], url_path='bulk-create')
+    def bulk_create(self, request):
+        """Request many employees at once; failures are reported per employee"""
+        serializer = BenchRequestBulkCreateSerializer(data=request.data, context=self.get_serializer_context())
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        employee_ids = list(dict.fromkeys(serializer.validated_data['employees']))
+        created, errors = bulk_create_bench_requests(
+            serializer.validated_data['requesting_company'],
+            employee_ids,
+            serializer.validated_data.get('message', ''),
+        )
+
+        results = []
+        for employee_id in employee_ids:
+            if employee_id in created:
+                bench_request = created[employee_id]
+                results.append({'employee': employee_id, 'id': bench_request.pk, 'status': bench_request.status})
+            else:
+                results.append({'employee': employee_id, 'error': errors[employee_id]})
+        return Response(
+            {'results': results},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+    
     @action(detail=False, methods=['get'])
     def pending(self, request):
         """Get all pending requests"""
         pending_requests = self.get_queryset().filter(status='pending')
-        serializer = self.get_serializer(pending_requests, many=True)
-        return Response(serializer.data)
+        return self.values_response(pending_requests, paginate=False)
 
 
-class ResourceListingViewSet(viewsets.ModelViewSet):
+class ResourceListingViewSet(ReplicaReadMixin, ValuesListMixin, viewsets.ModelViewSet):
     """API endpoint for resource listing management"""
 
     queryset = ResourceListing.objects.all()
@@ -150,12 +281,15 @@ class ResourceListingViewSet(viewsets.ModelViewSet):
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'description', 'skills_summary', 'company__name']
     ordering_fields = ['created_at', 'start_date', 'total_resources']
+    values_serializer_classes = {'list': ResourceListingListValuesSerializer}
 
     def get_serializer_class(self):
         if self.action == 'create':
             return ResourceListingCreateSerializer
         elif self.action == 'list':
             return ResourceListingListSerializer
+        elif self.action == 'bulk_create':
+            return ResourceListingCreateSerializer
         return ResourceListingSerializer
 
     def get_queryset(self):
@@ -171,7 +305,8 @@ class ResourceListingViewSet(viewsets.ModelViewSet):
         if getattr(self, 'swagger_fake_view', False):
             return ResourceListing.objects.none()
 
-        queryset = ResourceListing.objects.select_related('company').prefetch_related('employees')
+        # Joins and prefetches are derived from the action's serializer in plan_queryset
+        queryset = ResourceListing.objects.all()
 
         # Filter by status if provided
         status_param = self.request.query_params.get('status', None)
@@ -194,7 +329,22 @@ class ResourceListingViewSet(viewsets.ModelViewSet):
         if not show_all:
             queryset = queryset.filter(is_active=True, status='active')
 
-        return queryset
+        return self.plan_queryset(queryset)
+
+    @action(detail=False, methods=['post'], url_path='bulk-create')
+    def bulk_create(self, request):
+        """Create many resource listings at once; all are validated before any is created"""
+        serializer = ResourceListingCreateSerializer(
+            data=request.data, many=True, allow_empty=False, max_length=settings.BULK_MAX_IDS,
+            context=self.get_serializer_context(),
+        )
+        if serializer.is_valid():
+            listings = serializer.save()
+            return Response(
+                ResourceListingListSerializer(listings, many=True).data,
+                status=status.HTTP_201_CREATED,
+            )
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=False, methods=['get'])
     def my_listings(self, request):
@@ -231,17 +381,22 @@ class ResourceListingViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class ResourceRequestViewSet(viewsets.ModelViewSet):
+class ResourceRequestViewSet(ReplicaReadMixin, BulkRespondMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """API endpoint for resource request management"""
 
     queryset = ResourceRequest.objects.all()
     permission_classes = [IsAuthenticated]
+    bulk_respond_serializer_class = ResourceRequestBulkResponseSerializer
+    bulk_respond_service = staticmethod(bulk_respond_to_resource_requests)
+    respond_owner_field = 'resource_listing__company__admin_user'
 
     def get_serializer_class(self):
         if self.action == 'create':
             return ResourceRequestCreateSerializer
         elif self.action == 'respond':
             return ResourceRequestResponseSerializer
+        elif self.action == 'bulk_respond':
+            return ResourceRequestBulkResponseSerializer
         return ResourceRequestSerializer
 
     def get_queryset(self):
@@ -261,11 +416,11 @@ class ResourceRequestViewSet(viewsets.ModelViewSet):
             resource_listing__company__in=user_companies
         )
 
-        return queryset.select_related(
+        return self.plan_queryset(queryset.select_related(
             'resource_listing',
             'resource_listing__company',
             'requesting_company'
-        )
+        ))
 
     @action(detail=True, methods=['post'])
     def respond(self, request, pk=None):
@@ -282,11 +437,15 @@ class ResourceRequestViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_403_FORBIDDEN
                 )
 
-            # Update request status
-            resource_request.status = serializer.validated_data['status']
-            resource_request.response = serializer.validated_data.get('response', '')
-            resource_request.responded_at = timezone.now()
-            resource_request.save()
+            try:
+                respond_to_resource_request(
+                    resource_request,
+                    serializer.validated_data['status'],
+                    serializer.validated_data.get('response', ''),
+                    responded_by=request.user.pk,
+                )
+            except RequestConflict as exc:
+                return Response({'error': str(exc)}, status=status.HTTP_409_CONFLICT)
 
             response_serializer = ResourceRequestSerializer(resource_request)
             return Response(response_serializer.data)
@@ -0,0 +1,13 @@
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Admin for background jobs"""
+
+    list_display = ('name', 'status', 'attempts', 'max_attempts', 'run_at', 'duration_ms', 'finished_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'last_error')
+    ordering = ('-created_at',)
+    readonly_fields = ('created_at', 'finished_at', 'locked_at', 'locked_by', 'duration_ms', 'last_error')
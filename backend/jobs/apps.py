@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs'
+
+    def ready(self):
+        # Register the @job functions declared in each app's jobs.py
+        from django.utils.module_loading import autodiscover_modules
+        autodiscover_modules('jobs')
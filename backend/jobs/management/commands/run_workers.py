@@ -0,0 +1,71 @@
+import os
+import signal
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Avg, Count, Max, Q
+
+from jobs.models import Job
+from jobs.worker import work
+
+
+class Command(BaseCommand):
+    help = 'Run background job workers (Postgres-backed, SELECT ... FOR UPDATE SKIP LOCKED)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help='Worker threads in this process')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to wait when idle')
+        parser.add_argument('--burst', action='store_true', help='Exit once no job is runnable')
+        parser.add_argument('--stats', action='store_true', help='Print job duration metrics and exit')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            return self.print_stats()
+
+        stop = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                # Finish the running jobs, then exit
+                signal.signal(sig, lambda *_: stop.set())
+
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self.stdout.write(f"Starting {options['concurrency']} workers ({prefix})")
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            futures = [
+                executor.submit(
+                    work, f"{prefix}:{i}", stop,
+                    burst=options['burst'], poll_interval=options['poll_interval'],
+                )
+                for i in range(options['concurrency'])
+            ]
+            results = [future.result() for future in futures]
+        connection.close()
+
+        succeeded = sum(result[0] for result in results)
+        failed = sum(result[1] for result in results)
+        self.stdout.write(self.style.SUCCESS(f"Done: {succeeded} succeeded, {failed} failed attempts"))
+
+    def print_stats(self):
+        rows = (
+            Job.objects.values('name')
+            .annotate(
+                queued=Count('id', filter=Q(status='queued')),
+                running=Count('id', filter=Q(status='running')),
+                succeeded=Count('id', filter=Q(status='succeeded')),
+                failed=Count('id', filter=Q(status='failed')),
+                avg_ms=Avg('duration_ms', filter=Q(status='succeeded')),
+                max_ms=Max('duration_ms', filter=Q(status='succeeded')),
+            )
+            .order_by('name')
+        )
+        self.stdout.write(
+            f"{'queued':>7} {'running':>7} {'done':>7} {'failed':>7} {'avg ms':>8} {'max ms':>8}  job"
+        )
+        for row in rows:
+            self.stdout.write(
+                f"{row['queued']:7} {row['running']:7} {row['succeeded']:7} {row['failed']:7} "
+                f"{row['avg_ms'] or 0:8.0f} {row['max_ms'] or 0:8}  {row['name']}"
+            )
@@ -0,0 +1,42 @@
+"""
+Registering and enqueueing background jobs.
+"""
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Job
+
+_registry = {}
+
+
+def job(func):
+    """Register ``func`` so workers can run it by name"""
+    func.job_name = f"{func.__module__}.{func.__qualname__}"
+    _registry[func.job_name] = func
+    return func
+
+
+def get_job(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f"No job registered as '{name}'.")
+
+
+def enqueue(func, *args, run_at=None, max_attempts=None, **kwargs):
+    """
+    Queue ``func(*args, **kwargs)`` for a worker. Arguments must be JSON
+    serialisable. Called inside a transaction, the job only becomes visible to
+    workers if that transaction commits.
+    """
+    name = getattr(func, 'job_name', None)
+    if name not in _registry:
+        raise LookupError(f"{func!r} is not registered with @job.")
+
+    return Job.objects.create(
+        name=name,
+        args=list(args),
+        kwargs=kwargs,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    )
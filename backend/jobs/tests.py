@@ -0,0 +1,91 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .models import Job
+from .registry import enqueue, job
+from .worker import claim, fail_abandoned, run, work
+
+calls = []
+
+
+@job
+def record(value):
+    calls.append(value)
+
+
+@job
+def explode():
+    raise ValueError('boom')
+
+
+@override_settings(JOBS_MAX_ATTEMPTS=2, JOBS_BACKOFF_SECONDS=10, JOBS_LOCK_TIMEOUT_SECONDS=60)
+class WorkerTests(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_claims_runs_and_records_success(self):
+        queued = enqueue(record, 'a')
+
+        claimed = claim('worker')
+        self.assertEqual((claimed.pk, claimed.status, claimed.attempts), (queued.pk, 'running', 1))
+        self.assertIsNone(claim('other'))
+        self.assertTrue(run(claimed))
+
+        queued.refresh_from_db()
+        self.assertEqual(calls, ['a'])
+        self.assertEqual(queued.status, 'succeeded')
+        self.assertIsNotNone(queued.duration_ms)
+
+    def test_failures_back_off_then_fail(self):
+        queued = enqueue(explode)
+
+        started = timezone.now()
+        self.assertFalse(run(claim('worker')))
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, 'queued')
+        self.assertGreaterEqual(queued.run_at, started + timedelta(seconds=10))
+        self.assertIn('ValueError: boom', queued.last_error)
+        # Not runnable until the backoff has passed
+        self.assertIsNone(claim('worker'))
+
+        Job.objects.filter(pk=queued.pk).update(run_at=timezone.now())
+        self.assertFalse(run(claim('worker')))
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('failed', 2))
+
+    def test_abandoned_jobs_are_reclaimed_until_their_last_attempt(self):
+        stale = timezone.now() - timedelta(seconds=120)
+        retry = Job.objects.create(name=record.job_name, args=['b'], status='running', attempts=1,
+                                   max_attempts=2, run_at=stale, locked_at=stale, locked_by='dead')
+        last = Job.objects.create(name=record.job_name, args=['c'], status='running', attempts=2,
+                                  max_attempts=2, run_at=stale, locked_at=stale, locked_by='dead')
+
+        self.assertEqual(claim('worker').pk, retry.pk)
+        self.assertIsNone(claim('worker'))
+        self.assertEqual(fail_abandoned(), 1)
+        last.refresh_from_db()
+        self.assertEqual(last.status, 'failed')
+
+    def test_idle_polls_do_not_write(self):
+        stop = threading.Event()
+        polls = 0
+
+        def wait(timeout):
+            nonlocal polls
+            polls += 1
+            if polls == 3:
+                stop.set()
+
+        with mock.patch.object(stop, 'wait', wait), CaptureQueriesContext(connection) as queries:
+            work('worker', stop)
+
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+        # Only the sweep when the worker started
+        self.assertEqual(len(updates), 1)
@@ -0,0 +1,142 @@
+"""
+Job worker: claims queued jobs with SELECT ... FOR UPDATE SKIP LOCKED.
+"""
+import logging
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_job
+
+logger = logging.getLogger(__name__)
+
+
+def backoff(attempts):
+    """Delay before retry number ``attempts``: exponential, capped"""
+    return timedelta(seconds=min(
+        settings.JOBS_BACKOFF_SECONDS * 2 ** (attempts - 1), settings.JOBS_BACKOFF_MAX_SECONDS
+    ))
+
+
+def fail_abandoned():
+    """
+    Mark failed the jobs left running by a worker that died during their last
+    attempt (their lock is older than ``JOBS_LOCK_TIMEOUT_SECONDS``), so a job
+    that keeps killing its worker is not retried forever. Returns how many.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT_SECONDS)
+    exhausted = Job.objects.filter(
+        status='running', locked_at__lt=stale, attempts__gte=F('max_attempts')
+    ).update(
+        status='failed', locked_at=None, locked_by='', finished_at=now,
+        last_error='The worker running the last attempt stopped before it finished.',
+    )
+    if exhausted:
+        logger.warning("Marked %s abandoned jobs failed after their last attempt", exhausted)
+    return exhausted
+
+
+def claim(worker_id):
+    """
+    Lock the next runnable job for ``worker_id`` and mark it running.
+
+    Jobs left running by a worker that died are reclaimed once their lock is
+    older than ``JOBS_LOCK_TIMEOUT_SECONDS`` and they have attempts left;
+    ``fail_abandoned`` settles the others.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT_SECONDS)
+    with transaction.atomic():
+        job = (
+            Job.objects
+            .filter(
+                Q(status='queued', run_at__lte=now)
+                | Q(status='running', locked_at__lt=stale, attempts__lt=F('max_attempts'))
+            )
+            .order_by('run_at', 'id')
+            .select_for_update(skip_locked=True)
+            .first()
+        )
+        if job is None:
+            return None
+        Job.objects.filter(pk=job.pk).update(
+            status='running', locked_at=now, locked_by=worker_id, attempts=F('attempts') + 1
+        )
+    job.refresh_from_db()
+    return job
+
+
+def run(job):
+    """Run a claimed job and record the outcome; returns True on success"""
+    started = time.monotonic()
+    try:
+        func = get_job(job.name)
+        func(*job.args, **job.kwargs)
+    except Exception:
+        duration_ms = int((time.monotonic() - started) * 1000)
+        error = traceback.format_exc()
+        now = timezone.now()
+        if job.attempts < job.max_attempts:
+            status, run_at = 'queued', now + backoff(job.attempts)
+        else:
+            status, run_at = 'failed', job.run_at
+        Job.objects.filter(pk=job.pk).update(
+            status=status, run_at=run_at, last_error=error, duration_ms=duration_ms,
+            locked_at=None, locked_by='', finished_at=now if status == 'failed' else None,
+        )
+        logger.warning(
+            "Job %s #%s failed (attempt %s/%s, %s ms)%s",
+            job.name, job.pk, job.attempts, job.max_attempts, duration_ms,
+            '' if status == 'failed' else f"; retrying at {run_at:%H:%M:%S}",
+        )
+        return False
+
+    duration_ms = int((time.monotonic() - started) * 1000)
+    Job.objects.filter(pk=job.pk).update(
+        status='succeeded', duration_ms=duration_ms, last_error='',
+        locked_at=None, locked_by='', finished_at=timezone.now(),
+    )
+    logger.info("Job %s #%s succeeded in %s ms", job.name, job.pk, duration_ms)
+    return True
+
+
+def work(worker_id, stop, burst=False, poll_interval=1.0):
+    """
+    Claim and run jobs until ``stop`` (a threading.Event) is set, or, with
+    ``burst``, until no job is runnable. Returns ``(succeeded, failed)``.
+    """
+    succeeded = failed = 0
+    # Jobs only become abandoned after a lock timeout, so sweeping for them
+    # once per timeout is enough; an idle worker's polls stay read-only
+    next_sweep = time.monotonic()
+    try:
+        while not stop.is_set():
+            close_old_connections()
+            try:
+                if time.monotonic() >= next_sweep:
+                    fail_abandoned()
+                    next_sweep = time.monotonic() + settings.JOBS_LOCK_TIMEOUT_SECONDS
+                job = claim(worker_id)
+            except Exception:
+                logger.exception("Worker %s could not claim a job", worker_id)
+                stop.wait(poll_interval)
+                continue
+            if job is None:
+                if burst:
+                    break
+                stop.wait(poll_interval)
+                continue
+            if run(job):
+                succeeded += 1
+            else:
+                failed += 1
+    finally:
+        close_old_connections()
+    return succeeded, failed
@@ -0,0 +1,51 @@
+"""
+Admin changelist filters that stay cheap on large tables.
+"""
+from django import forms
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+
+
+class AutocompleteListFilter(admin.RelatedFieldListFilter):
+    """
+    Foreign key filter that searches related objects through the admin
+    autocomplete view as you type, instead of rendering every one of them
+    into the sidebar. Only the selected object is loaded.
+
+    The related model's admin needs ``search_fields``, and the changelist's
+    admin must mix in ``AutocompleteFilterMixin`` for the widget's assets.
+    """
+
+    template = 'admin/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.admin_site = model_admin.admin_site
+        super().__init__(field, request, params, model, model_admin, field_path)
+
+    def field_choices(self, field, request, model_admin):
+        return []
+
+    def has_output(self):
+        return True
+
+    def render_widget(self):
+        form_field = forms.ModelChoiceField(
+            queryset=self.field.remote_field.model._default_manager.all(),
+            widget=AutocompleteSelect(self.field, self.admin_site, attrs={'data-filter-param': self.lookup_kwarg}),
+            required=False,
+        )
+        value = self.lookup_val[-1] if self.lookup_val else None
+        return form_field.widget.render(self.lookup_kwarg, value)
+
+
+class AutocompleteFilterMixin:
+    """ModelAdmin mixin adding the assets ``AutocompleteListFilter`` needs"""
+
+    @property
+    def media(self):
+        return (
+            super().media
+            + AutocompleteSelect(None, self.admin_site).media
+            # Listed with its dependencies so it is ordered after them
+            + forms.Media(js=['admin/js/jquery.init.js', 'admin/js/autocomplete.js', 'main/js/autocomplete_filter.js'])
+        )
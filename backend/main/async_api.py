@@ -0,0 +1,48 @@
+"""
+Plumbing shared by the async (non-DRF) API views.
+"""
+from functools import wraps
+
+from django.http import Http404, HttpResponse
+from rest_framework import exceptions, status
+
+from .authentication import authenticate
+from .renderers import FastJSONRenderer
+
+_renderer = FastJSONRenderer()
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(
+        _renderer.render(data), content_type='application/json', status=status_code
+    )
+
+
+def async_api_view(view_func=None, *, ticket_query_param=None):
+    """
+    Authenticate the caller and turn API errors into JSON responses, the way
+    DRF's APIView does for the sync endpoints. The view is called as
+    ``view(request, user, *args, **kwargs)``.
+    """
+    if view_func is None:
+        return lambda func: async_api_view(func, ticket_query_param=ticket_query_param)
+
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return json_response(
+                {'detail': f'Method "{request.method}" not allowed.'},
+                status.HTTP_405_METHOD_NOT_ALLOWED,
+            )
+        try:
+            user = await authenticate(request, ticket_param=ticket_query_param)
+            if user is None:
+                raise exceptions.NotAuthenticated()
+            return await view_func(request, user, *args, **kwargs)
+        except exceptions.APIException as exc:
+            detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+            return json_response(detail, exc.status_code)
+        except Http404 as exc:
+            return json_response({'detail': str(exc)}, status.HTTP_404_NOT_FOUND)
+
+    return wrapper
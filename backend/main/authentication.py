@@ -0,0 +1,73 @@
+"""
+Authentication helpers for the async (non-DRF) views.
+"""
+import secrets
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from rest_framework import exceptions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+_jwt_authentication = JWTAuthentication()
+
+TICKET_SALT = 'main.authentication.ticket'
+
+
+def issue_ticket(user):
+    """
+    A short-lived, single-use ticket standing in for ``user``'s access token
+    in a URL (EventSource cannot send headers). Unlike the JWT, a ticket
+    that ends up in an access log is useless by the time anyone reads it.
+    """
+    return signing.dumps({'user': user.pk, 'nonce': secrets.token_urlsafe(16)}, salt=TICKET_SALT)
+
+
+async def authenticate(request, ticket_param=None):
+    """
+    Async counterpart of JWTAuthentication: the token is validated in-process
+    and only the user lookup touches the database.
+
+    ``ticket_param`` also accepts a ticket from ``issue_ticket`` in the query
+    string, for clients that cannot send an Authorization header.
+    """
+    header = _jwt_authentication.get_header(request)
+    if header is not None:
+        raw_token = _jwt_authentication.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = _jwt_authentication.get_validated_token(raw_token)
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise exceptions.AuthenticationFailed('Token contained no recognizable user identification')
+        return await _active_user(**{jwt_settings.USER_ID_FIELD: user_id})
+
+    if ticket_param and request.GET.get(ticket_param):
+        return await _active_user(pk=await _redeem_ticket(request.GET[ticket_param]))
+    return None
+
+
+async def _redeem_ticket(ticket):
+    """The user id in ``ticket``; each ticket is accepted once"""
+    try:
+        payload = signing.loads(ticket, salt=TICKET_SALT, max_age=settings.REALTIME_TICKET_SECONDS)
+    except signing.BadSignature:
+        raise exceptions.AuthenticationFailed('Invalid or expired ticket')
+    # The first redemption claims the nonce until the ticket has expired anyway
+    if not await cache.aadd(f"auth-ticket:{payload['nonce']}", True, settings.REALTIME_TICKET_SECONDS):
+        raise exceptions.AuthenticationFailed('Ticket already used')
+    return payload['user']
+
+
+async def _active_user(**lookup):
+    User = get_user_model()
+    try:
+        user = await User.objects.aget(**lookup)
+    except User.DoesNotExist:
+        raise exceptions.AuthenticationFailed('User not found')
+    if not user.is_active:
+        raise exceptions.AuthenticationFailed('User is inactive')
+    return user
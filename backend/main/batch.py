@@ -0,0 +1,152 @@
+"""
+Batch endpoint: run several API calls in-process and return them together.
+"""
+import json
+import logging
+import time
+from io import BytesIO
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db.models import prefetch_related_objects
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from django.utils.http import urlencode
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+
+class BatchItemSerializer(serializers.Serializer):
+    """One sub-request of a batch"""
+
+    method = serializers.ChoiceField(choices=['GET', 'POST', 'PUT', 'PATCH', 'DELETE'], default='GET')
+    path = serializers.CharField()
+    params = serializers.DictField(required=False, default=dict)
+    body = serializers.JSONField(required=False)
+
+    def validate_path(self, value):
+        if not value.startswith('/api/'):
+            raise serializers.ValidationError("Only /api/ paths can be batched.")
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    """Serializer for a batch of sub-requests"""
+
+    requests = BatchItemSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, value):
+        limit = settings.BATCH_MAX_REQUESTS
+        if len(value) > limit:
+            raise serializers.ValidationError(f"A batch can contain at most {limit} requests.")
+        return value
+
+
+class BatchView(APIView):
+    """
+    API endpoint running up to ``BATCH_MAX_REQUESTS`` API calls in one
+    round-trip.
+
+    The caller is authenticated once; every sub-request runs in-process under
+    that same user, with their managed and accessible companies loaded once for
+    the whole batch. Sub-requests run in order and each gets its own status
+    code. Once ``BATCH_TIME_BUDGET_SECONDS`` is spent, the remaining ones are
+    answered with 503 without being run. The budget is checked between
+    sub-requests, so a slow one already running is not cut short and the
+    batch can overrun by up to that sub-request's duration.
+
+    Async views (``/api/async/...``, the event stream) cannot run inside
+    this synchronous view and are answered with 400; batch their regular
+    counterparts instead.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        # Company scope is resolved once and reused by every sub-request
+        prefetch_related_objects([request.user], 'managed_companies', 'accessible_companies')
+
+        deadline = time.monotonic() + settings.BATCH_TIME_BUDGET_SECONDS
+        responses = []
+        for item in serializer.validated_data['requests']:
+            if time.monotonic() > deadline:
+                responses.append({
+                    'status': status.HTTP_503_SERVICE_UNAVAILABLE,
+                    'body': {'detail': 'Batch time budget exceeded.'},
+                })
+                continue
+            responses.append(self.run(request, item))
+
+        return Response({'responses': responses})
+
+    def run(self, request, item):
+        """Run one sub-request and return its status and body"""
+        try:
+            match = resolve(item['path'])
+        except Resolver404:
+            return {'status': status.HTTP_404_NOT_FOUND, 'body': {'detail': 'Not found.'}}
+
+        if getattr(match.func, 'view_class', None) is type(self):
+            return {
+                'status': status.HTTP_400_BAD_REQUEST,
+                'body': {'detail': 'Batches cannot be nested.'},
+            }
+
+        if iscoroutinefunction(match.func):
+            return {
+                'status': status.HTTP_400_BAD_REQUEST,
+                'body': {'detail': 'Async endpoints cannot be batched; use the regular endpoint.'},
+            }
+
+        subrequest = self.build_subrequest(request, item)
+        subrequest.resolver_match = match
+        try:
+            response = match.func(subrequest, *match.args, **match.kwargs)
+        except Exception:
+            logger.exception("Batched %s %s failed", item['method'], item['path'])
+            return {
+                'status': status.HTTP_500_INTERNAL_SERVER_ERROR,
+                'body': {'detail': 'Internal server error.'},
+            }
+
+        if not hasattr(response, 'data'):
+            return {
+                'status': status.HTTP_400_BAD_REQUEST,
+                'body': {'detail': 'Only API endpoints can be batched.'},
+            }
+        return {'status': response.status_code, 'body': response.data}
+
+    def build_subrequest(self, request, item):
+        """Build an HttpRequest for ``item`` that reuses the caller's identity"""
+        body = b'' if item.get('body') is None else json.dumps(item['body']).encode()
+        query_string = urlencode(item['params'], doseq=True)
+
+        subrequest = HttpRequest()
+        subrequest.method = item['method']
+        subrequest.path = subrequest.path_info = item['path']
+        subrequest.META = {
+            **request._request.META,
+            'REQUEST_METHOD': item['method'],
+            'PATH_INFO': item['path'],
+            'QUERY_STRING': query_string,
+            'CONTENT_TYPE': 'application/json',
+            'CONTENT_LENGTH': str(len(body)),
+        }
+        subrequest.GET = QueryDict(query_string)
+        subrequest.COOKIES = request._request.COOKIES
+        subrequest._stream = BytesIO(body)
+        subrequest._read_started = False
+
+        # DRF skips authentication for forced users, so the JWT is not decoded again
+        subrequest.user = request.user
+        subrequest._force_auth_user = request.user
+        subrequest._force_auth_token = request.auth
+        return subrequest
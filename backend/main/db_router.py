@@ -0,0 +1,71 @@
+"""
+Read-replica routing with read-your-writes consistency.
+
+Reads go to the primary unless the current request opted in to a replica
+with ``read_from_replica()``; ``ReplicaReadMixin`` does so for safe
+viewset actions. Writes, migrations and everything outside a request
+(commands, jobs, signals) always use ``default``.
+
+Replicas lag behind the primary, so a user who just wrote (approved a
+request, say) is pinned to the primary for ``DB_REPLICA_PIN_SECONDS``: their
+next reads see their own changes. Pins live in the default cache, which must
+be shared by every worker (``CACHE_BACKEND`` 'database' or 'redis') for them
+to hold across processes; settings refuse replicas with the per-process one.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def _pin_key(user):
+    return f"db-primary-pin:{user.pk}"
+
+
+def is_pinned_to_primary(user):
+    return bool(settings.DATABASE_READ_REPLICAS) and user.is_authenticated and cache.get(_pin_key(user)) is not None
+
+
+def pin_to_primary(user):
+    """Keep ``user``'s reads on the primary until replicas have caught up"""
+    if settings.DATABASE_READ_REPLICAS and user.is_authenticated:
+        cache.set(_pin_key(user), True, settings.DB_REPLICA_PIN_SECONDS)
+
+
+def read_from_replica():
+    """
+    Send this context's reads to a replica. Returns a token for
+    ``read_from_primary``, or None when no replica is configured.
+    """
+    if not settings.DATABASE_READ_REPLICAS:
+        return None
+    return _read_alias.set(random.choice(settings.DATABASE_READ_REPLICAS))
+
+
+def read_from_primary(token):
+    """Undo ``read_from_replica``"""
+    if token is not None:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    """Route reads to the replica chosen for this context, everything else to ``default``"""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == 'django_cache':
+            # The database cache holds the pins: a lagging replica would miss them
+            return 'default'
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
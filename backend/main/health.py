@@ -0,0 +1,80 @@
+"""
+Liveness and readiness probes for load balancers and orchestrators.
+
+Neither needs authentication. Readiness runs ``SELECT 1`` on every database
+alias and reports this worker process's connection pool statistics, which
+are what to watch when sizing workers against ``DB_POOL_MAX_SIZE``: sustained
+high utilisation or a growing average wait means requests queue for
+connections.
+"""
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_safe
+
+
+def pool_stats(connection):
+    """This process's pool statistics for ``connection``, or None without a pool"""
+    # Only the PostgreSQL backend has pools; accessing ``pool`` opens it
+    pool = getattr(connection, 'pool', None)
+    if pool is None:
+        return None
+
+    stats = pool.get_stats()
+    size = stats.get('pool_size', 0)
+    in_use = size - stats.get('pool_available', 0)
+    queued = stats.get('requests_queued', 0)
+    return {
+        'min_size': stats['pool_min'],
+        'max_size': stats['pool_max'],
+        'size': size,
+        'available': stats.get('pool_available', 0),
+        'in_use': in_use,
+        'utilisation': round(in_use / stats['pool_max'], 3),
+        'requests': stats.get('requests_num', 0),
+        'requests_waiting': stats.get('requests_waiting', 0),
+        # Requests that found no free connection, and how long they waited
+        'requests_queued': queued,
+        'avg_wait_ms': round(stats.get('requests_wait_ms', 0) / queued, 1) if queued else 0.0,
+        'requests_errors': stats.get('requests_errors', 0),
+        'connections_lost': stats.get('connections_lost', 0),
+        'connections_errors': stats.get('connections_errors', 0),
+    }
+
+
+def probe(alias):
+    connection = connections[alias]
+    # Before the probe checks a connection out, so it is not counted in use
+    result = {'pool': pool_stats(connection)}
+    started = time.perf_counter()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    except Exception as exc:
+        result.update(ok=False, error=exc.__class__.__name__)
+    else:
+        result.update(ok=True, latency_ms=round((time.perf_counter() - started) * 1000, 1))
+    return result
+
+
+@never_cache
+@require_safe
+def liveness(request):
+    """The process is up; touches no database"""
+    return JsonResponse({'status': 'ok'})
+
+
+@never_cache
+@require_safe
+def readiness(request):
+    """503 unless every database answers"""
+    databases = {alias: probe(alias) for alias in settings.DATABASES}
+    ready = all(result['ok'] for result in databases.values())
+    return JsonResponse(
+        {'status': 'ok' if ready else 'unavailable', 'databases': databases},
+        status=200 if ready else 503,
+    )
@@ -0,0 +1,89 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a worker does before serving its first request
+BOOT_SCRIPT = """
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().reverse_dict
+"""
+
+WARM_UP_SCRIPT = BOOT_SCRIPT + """
+from main.warmup import warm_up
+warm_up()
+"""
+
+
+class Command(BaseCommand):
+    help = 'Measure worker cold-start time and report import cost per module (python -X importtime)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Cold starts to time')
+        parser.add_argument('--top', type=int, default=25, help='Modules to list, by cumulative import time')
+        parser.add_argument(
+            '--group', action='store_true', help='Aggregate self time by top-level package'
+        )
+        parser.add_argument('--warm-up', action='store_true', help='Include main.warmup.warm_up()')
+
+    def handle(self, *args, **options):
+        script = WARM_UP_SCRIPT if options['warm_up'] else BOOT_SCRIPT
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get(
+            'DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE
+        )}
+
+        timings = []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            self.boot(script, env)
+            timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f"Cold start: median {statistics.median(timings):.0f} ms, "
+            f"min {min(timings):.0f} ms over {len(timings)} runs"
+        )
+
+        modules = self.parse_importtime(self.boot(script, env, importtime=True))
+        if options['group']:
+            packages = defaultdict(int)
+            for name, (self_us, _) in modules.items():
+                packages[name.split('.')[0]] += self_us
+            rows = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+            self.stdout.write(f"\n{'self ms':>9}  package")
+            for name, self_us in rows[:options['top']]:
+                self.stdout.write(f"{self_us / 1000:9.1f}  {name}")
+            return
+
+        rows = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)
+        self.stdout.write(f"\n{'self ms':>9} {'cumul ms':>9}  module")
+        for name, (self_us, cumulative_us) in rows[:options['top']]:
+            self.stdout.write(f"{self_us / 1000:9.1f} {cumulative_us / 1000:9.1f}  {name}")
+
+    def boot(self, script, env, importtime=False):
+        command = [sys.executable]
+        if importtime:
+            command += ['-X', 'importtime']
+        result = subprocess.run(
+            command + ['-c', script], cwd=settings.BASE_DIR, env=env,
+            capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(f"Worker boot failed:\n{result.stderr}")
+        return result.stderr
+
+    @staticmethod
+    def parse_importtime(output):
+        """Return ``{module: (self_us, cumulative_us)}`` from -X importtime output"""
+        modules = {}
+        for line in output.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+        return modules
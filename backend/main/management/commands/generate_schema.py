@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from main.schema import CONTENT_TYPES, code_version, generate_schema
+
+
+class Command(BaseCommand):
+    help = 'Precompute the OpenAPI schema served at /swagger.json and /swagger.yaml'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--code-version',
+            default=None,
+            help='Version to key the files on (defaults to CODE_VERSION or a source fingerprint)',
+        )
+        parser.add_argument(
+            '--prune', action='store_true', help='Remove schema files left by other versions'
+        )
+
+    def handle(self, *args, **options):
+        version = generate_schema(options['code_version'] or code_version())
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote OpenAPI schema {version} to {settings.SCHEMA_CACHE_DIR}"
+        ))
+
+        if options['prune']:
+            keep = {f"openapi-{version}.{fmt}" for fmt in CONTENT_TYPES}
+            for path in settings.SCHEMA_CACHE_DIR.glob('openapi-*'):
+                if path.name not in keep:
+                    path.unlink()
+                    self.stdout.write(f"Removed {path.name}")
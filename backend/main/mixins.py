@@ -0,0 +1,152 @@
+"""
+Reusable viewset mixins shared by the app viewsets.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from .db_router import is_pinned_to_primary, pin_to_primary, read_from_primary, read_from_replica
+from .query_plan import plan_for_serializer
+from .serializers import select_fields
+
+
+class ReplicaReadMixin:
+    """
+    Serve safe requests from a read replica (see ``main.db_router``).
+
+    Users who wrote within the last ``DB_REPLICA_PIN_SECONDS`` keep reading
+    from the primary, so e.g. ``respond`` followed by ``pending`` reflects
+    the answer. Any unsafe request renews the caller's pin.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not is_pinned_to_primary(request.user):
+            self._replica_token = read_from_replica()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            read_from_primary(self.__dict__.pop('_replica_token', None))
+
+
+class QueryPlanMixin:
+    """
+    Shape each action's queryset from the serializer that action renders.
+
+    ``select_related`` and ``Prefetch(...)`` (with their own nested joins)
+    are derived from the serializer's readable fields, after ``?fields=`` /
+    ``?omit=`` pruning, so relations nothing reads are never joined or
+    prefetched. On safe requests unread columns are also deferred with
+    ``.only()``. Actions whose serializer is not a ModelSerializer keep the
+    queryset as built.
+
+    Viewsets pass their filtered queryset through ``plan_queryset`` at the
+    end of ``get_queryset``.
+    """
+
+    def plan_queryset(self, queryset):
+        if getattr(self, 'swagger_fake_view', False):
+            return queryset
+
+        serializer = self.get_serializer()
+        if not hasattr(getattr(serializer, 'Meta', None), 'model'):
+            return queryset
+
+        defer = self.request.method in SAFE_METHODS
+        return plan_for_serializer(serializer).apply(queryset, defer=defer)
+
+
+class ValuesListMixin(QueryPlanMixin):
+    """
+    Serve read actions through a ``ValuesSerializer`` when one is configured.
+
+    ``values_serializer_classes`` maps an action name to the ValuesSerializer
+    used for it; actions not listed fall back to the regular serializer.
+    """
+
+    values_serializer_classes = {}
+
+    def get_values_serializer_class(self):
+        return self.values_serializer_classes.get(self.action)
+
+    def plan_queryset(self, queryset):
+        if self.get_values_serializer_class() is not None:
+            # values_list() selects its own columns
+            return queryset
+        return super().plan_queryset(queryset)
+
+    def values_response(self, queryset, paginate=True):
+        """Render ``queryset`` with the action's ValuesSerializer"""
+        values_serializer_class = self.get_values_serializer_class()
+        fields = select_fields(self.request, values_serializer_class.field_names())
+        rows = values_serializer_class.values(queryset, fields)
+
+        if paginate:
+            page = self.paginate_queryset(rows)
+            if page is not None:
+                return self.get_paginated_response(values_serializer_class(page, fields).data)
+
+        return Response(values_serializer_class(rows, fields).data)
+
+    def list(self, request, *args, **kwargs):
+        if self.get_values_serializer_class() is None:
+            return super().list(request, *args, **kwargs)
+        return self.values_response(self.filter_queryset(self.get_queryset()))
+
+
+class BulkRespondMixin:
+    """
+    ``POST .../bulk-respond/``: answer many requests with one decision.
+
+    Visibility and permission for every id are checked with one query: a
+    request can be answered by the user at ``respond_owner_field``. The
+    permitted ids go to ``bulk_respond_service(ids, responded_by=..., **data)``,
+    which applies the decision set-based and returns ``{id: error}`` for those
+    it could not. The response lists a result per id, in the order given.
+    """
+
+    bulk_respond_serializer_class = None
+    bulk_respond_service = None
+    respond_owner_field = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for attribute in ('bulk_respond_serializer_class', 'bulk_respond_service', 'respond_owner_field'):
+            if getattr(cls, attribute) is None:
+                raise ImproperlyConfigured(f"{cls.__name__} must set {attribute} (BulkRespondMixin).")
+
+    @action(detail=False, methods=['post'], url_path='bulk-respond')
+    def bulk_respond(self, request):
+        """Respond to many requests at once (approve/reject)"""
+        serializer = self.bulk_respond_serializer_class(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = dict(serializer.validated_data)
+        ids = list(dict.fromkeys(data.pop('ids')))
+        owners = dict(
+            self.get_queryset().filter(pk__in=ids).values_list('pk', self.respond_owner_field)
+        )
+        permitted = [pk for pk in ids if owners.get(pk) == request.user.pk]
+        errors = self.bulk_respond_service(permitted, responded_by=request.user.pk, **data) if permitted else {}
+
+        results = []
+        for pk in ids:
+            if pk not in owners:
+                results.append({'id': pk, 'error': 'Not found.'})
+            elif owners[pk] != request.user.pk:
+                results.append({'id': pk, 'error': 'You do not have permission to respond to this request.'})
+            elif pk in errors:
+                results.append({'id': pk, 'error': errors[pk]})
+            else:
+                results.append({'id': pk, 'status': data['status']})
+        return Response({'results': results})
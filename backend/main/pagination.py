@@ -0,0 +1,188 @@
+"""
+Page-number pagination without exact counts over large result sets.
+
+An exact ``COUNT(*)`` over a large filtered queryset can cost more than
+fetching the page. ``count_rows`` first counts at most
+``PAGINATION_ESTIMATE_THRESHOLD + 1`` rows, in one query that stops there.
+Within the threshold that count is exact, and it is cached for
+``PAGINATION_COUNT_CACHE_SECONDS``. Only past the threshold does it ask the
+PostgreSQL planner: the table's ``pg_class.reltuples`` when the queryset has
+no filter, otherwise the row estimate from ``EXPLAIN``. Responses say so with
+``count_is_estimate``. Estimates of filtered querysets can be off by orders
+of magnitude either way; they are never taken below the capped count.
+
+An estimated or a cached count is not trusted to bound the pages. Any page
+number is accepted, each page is fetched with one extra row, and
+``settle_count`` runs on every such page. A page without the extra row is the
+last, so the count becomes exact. A page reaching past the count raises it to
+one more than the rows seen. Pages in between leave it as it was, so clients
+paging through the start of a large result see the estimate unchanged.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+
+def estimate_count(queryset):
+    """The planner's row estimate for ``queryset``, or None where there is none"""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    query = queryset.query
+    with connection.cursor() as cursor:
+        if not query.where and not query.distinct and not query.combinator and not query.is_sliced:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+            # -1 until the table is first analyzed
+            if row is not None and row[0] >= 0:
+                return int(row[0])
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def _count_key(queryset):
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.md5(repr((queryset.db, sql, params)).encode(), usedforsecurity=False).hexdigest()
+    return f"pagination-count:{digest}"
+
+
+def capped_count(queryset, limit):
+    """``COUNT(*)`` of ``queryset``, stopping at ``limit`` rows"""
+    query = queryset.query
+    if not query.distinct and not query.combinator and query.group_by is None:
+        # Only the primary key, which an index can supply
+        queryset = queryset.values('pk')
+    return queryset.order_by()[:limit].count()
+
+
+def count_rows(queryset):
+    """
+    ``(count, is_estimate, is_cached)`` for ``queryset``. Only a count that is
+    neither may bound the pages.
+    """
+    try:
+        key = _count_key(queryset)
+        count = cache.get(key)
+        if count is not None:
+            return count, False, True
+
+        threshold = settings.PAGINATION_ESTIMATE_THRESHOLD
+        count = capped_count(queryset, threshold + 1)
+        if count > threshold:
+            estimate = estimate_count(queryset)
+            if estimate is not None:
+                return max(estimate, count), True, False
+            count = queryset.count()
+        cache.set(key, count, settings.PAGINATION_COUNT_CACHE_SECONDS)
+        return count, False, False
+    except EmptyResultSet:
+        # e.g. ``pk__in=[]``: never reaches the database
+        return 0, False, False
+
+
+def settle_count(count, offset, rows, more, is_estimate=True):
+    """
+    ``(count, is_estimate)`` for an estimated or cached ``count`` once the
+    page of ``rows`` at ``offset`` is fetched, and whether ``more`` follow it
+    """
+    if not more:
+        # That was the last page
+        return offset + rows, False
+    if count > offset + rows:
+        # Still consistent with this page
+        return count, is_estimate
+    # At least one more row follows
+    return offset + rows + 1, True
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator whose ``count`` may be a planner estimate (``count_is_estimate``)"""
+
+    count_is_estimate = False
+    # An exact count from the cache, which may predate recent writes
+    count_is_cached = False
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        count, self.count_is_estimate, self.count_is_cached = count_rows(self.object_list)
+        return count
+
+    @property
+    def count_is_settled(self):
+        """Whether ``count`` may bound the pages: neither estimated nor cached"""
+        # Evaluating the count sets both flags
+        return self.count is not None and not self.count_is_estimate and not self.count_is_cached
+
+    def validate_number(self, number):
+        if self.count_is_settled:
+            return super().validate_number(number)
+        # Rows may continue past the estimated (or cached) last page; page() finds out
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if self.count_is_settled:
+            return super().page(number)
+
+        bottom = (number - 1) * self.per_page
+        # One row past the page tells whether another page follows
+        object_list = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not object_list and number > 1:
+            raise EmptyPage(self.error_messages['no_results'])
+
+        more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        self.count, self.count_is_estimate = settle_count(
+            self.count, bottom, len(object_list), more, self.count_is_estimate
+        )
+        self.count_is_cached = False
+        self.__dict__.pop('num_pages', None)
+        return self._get_page(object_list, number, self)
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """PageNumberPagination with ``count_is_estimate`` in every page"""
+
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count,
+            'count_is_estimate': self.page.paginator.count_is_estimate,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_is_estimate'] = {
+            'type': 'boolean',
+            'example': False,
+        }
+        return response_schema
@@ -0,0 +1,110 @@
+"""
+Derive ``select_related`` / ``Prefetch`` / ``only`` from the fields a
+serializer will actually read.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+
+class QueryPlan:
+    """Relations and columns of ``model`` needed to render one serializer"""
+
+    def __init__(self, model):
+        self.model = model
+        self.select_related = set()
+        # relation path -> QueryPlan for the related model
+        self.prefetch = {}
+        # None means some field needs the full row, so nothing is deferred
+        self.only = set()
+
+    def add_lookup(self, lookup):
+        """Record what is needed to read ``lookup`` (``company__name``)"""
+        path = []
+        current = self.model
+        parts = lookup.split('__')
+
+        for index, part in enumerate(parts):
+            try:
+                field = current._meta.get_field(part)
+            except FieldDoesNotExist:
+                # A method or property: its columns are unknown
+                self.only = None
+                return
+
+            path.append(part)
+            name = '__'.join(path)
+
+            if field.many_to_many or field.one_to_many:
+                child = self.prefetch.get(name)
+                if child is None:
+                    child = self.prefetch[name] = QueryPlan(field.related_model)
+                    if field.one_to_many and child.only is not None:
+                        # Prefetching a reverse FK needs the FK column itself
+                        child.only.add(field.field.name)
+                if index < len(parts) - 1:
+                    child.add_lookup('__'.join(parts[index + 1:]))
+                return
+
+            if self.only is not None and field.concrete:
+                self.only.add(name)
+
+            if not field.is_relation or index == len(parts) - 1:
+                return
+
+            self.select_related.add(name)
+            current = field.related_model
+
+    def apply(self, queryset, defer=True):
+        """
+        Return ``queryset`` with exactly this plan's joins and prefetches.
+        ``defer=False`` keeps every column, for instances that will be saved.
+        """
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if self.select_related:
+            queryset = queryset.select_related(*sorted(self.select_related))
+        if self.prefetch:
+            queryset = queryset.prefetch_related(*[
+                Prefetch(name, queryset=plan.apply(plan.model._default_manager.all(), defer))
+                for name, plan in sorted(self.prefetch.items())
+            ])
+        if defer and self.only is not None:
+            queryset = queryset.only(*sorted(self.only) or [self.model._meta.pk.name])
+        return queryset
+
+
+def serializer_lookups(serializer):
+    """
+    Yield the model lookups read by each field of ``serializer``.
+
+    Fields sourced from a model method list their columns in the serializer's
+    ``Meta.field_lookups`` (``{'full_name': ('first_name', 'last_name')}``).
+    """
+    field_lookups = getattr(getattr(serializer, 'Meta', None), 'field_lookups', {})
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in field_lookups:
+            yield from field_lookups[name]
+        elif field.source == '*':
+            # The whole instance is handed to the field
+            yield '*'
+        elif isinstance(field, BaseSerializer):
+            prefix = '__'.join(field.source_attrs)
+            nested = field.child if isinstance(field, ListSerializer) else field
+            for lookup in serializer_lookups(nested):
+                yield f"{prefix}__{lookup}"
+        else:
+            yield '__'.join(field.source_attrs)
+
+
+def plan_for_serializer(serializer):
+    """Build the QueryPlan for a (possibly pruned) ModelSerializer instance"""
+    if isinstance(serializer, ListSerializer):
+        serializer = serializer.child
+
+    plan = QueryPlan(serializer.Meta.model)
+    for lookup in serializer_lookups(serializer):
+        plan.add_lookup(lookup)
+    return plan
@@ -0,0 +1,272 @@
+"""
+Real-time push of request events over server-sent events (SSE).
+
+Model changes are published to channels (``company:<id>``, ``user:<id>``)
+once their transaction commits. Every worker process runs one in-process
+``Hub`` that fans events out to the SSE connections it serves; each
+connection has a bounded queue, and a client that falls behind gets a
+``reset`` event telling it to refetch instead of an ever-growing backlog.
+
+``REALTIME_BROKER`` selects how events reach the hubs:
+
+- ``local``: publish straight into this process's hub (single worker, or
+  development).
+- ``postgres``: publish with ``pg_notify`` and have every ASGI worker
+  ``LISTEN``, so events raised by any worker (including WSGI ones) reach
+  every stream without an external broker.
+
+Streams are only served by the ASGI app. Under WSGI each one would hold a
+worker thread for its whole life, so there they are refused with 501 and the
+frontend falls back to polling. EventSource cannot send an Authorization
+header, so a stream is opened with a short-lived, single-use ticket from
+``POST /api/events/ticket/`` rather than with the access token itself.
+Redeemed tickets are remembered in the default cache, which the ``postgres``
+broker requires to be shared by every worker.
+"""
+import asyncio
+import json
+import logging
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connection, connections, transaction
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .async_api import async_api_view, json_response
+from .authentication import issue_ticket
+
+logger = logging.getLogger(__name__)
+
+PG_CHANNEL = 'realtime_events'
+
+
+class Subscription:
+    """One SSE connection: the channels it follows and its bounded queue"""
+
+    def __init__(self, channels, maxsize):
+        self.channels = frozenset(channels)
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.loop = asyncio.get_running_loop()
+
+    def push(self, event):
+        """Queue ``event``; on overflow drop the backlog and ask for a resync"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({'type': 'reset'})
+
+
+class Hub:
+    """In-process fan-out of events to the subscriptions following a channel"""
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, channels):
+        subscription = Subscription(channels, settings.REALTIME_QUEUE_SIZE)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def channels(self):
+        """Every channel followed by at least one subscription"""
+        with self._lock:
+            return set().union(*(s.channels for s in self._subscriptions))
+
+    def deliver(self, channels, event):
+        """Hand ``event`` to every subscription on ``channels``; thread-safe"""
+        channels = set(channels)
+        with self._lock:
+            targets = [s for s in self._subscriptions if s.channels & channels]
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, event)
+            except RuntimeError:
+                # The connection's event loop has shut down
+                self.unsubscribe(subscription)
+
+
+hub = Hub()
+
+
+class LocalBroker:
+    """Deliver events to this process's hub only"""
+
+    def publish(self, channels, event):
+        hub.deliver(channels, event)
+
+    async def start(self):
+        pass
+
+
+class PostgresBroker:
+    """Relay events between worker processes with LISTEN/NOTIFY"""
+
+    def __init__(self):
+        self._listener = None
+
+    def publish(self, channels, event):
+        payload = json.dumps({'channels': sorted(channels), 'event': event})
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [PG_CHANNEL, payload])
+
+    async def start(self):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self):
+        import psycopg
+
+        database = settings.DATABASES['default']
+        while True:
+            try:
+                conn = await psycopg.AsyncConnection.connect(
+                    dbname=database['NAME'],
+                    user=database['USER'],
+                    password=database['PASSWORD'],
+                    host=database['HOST'],
+                    port=database['PORT'],
+                    autocommit=True,
+                )
+                async with conn:
+                    await conn.execute(f'LISTEN {PG_CHANNEL}')
+                    async for notify in conn.notifies():
+                        message = json.loads(notify.payload)
+                        hub.deliver(message['channels'], message['event'])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Realtime listener lost its connection; reconnecting")
+                # Streams may have missed events while disconnected
+                hub.deliver(hub.channels(), {'type': 'reset'})
+                await asyncio.sleep(settings.REALTIME_HEARTBEAT_SECONDS)
+
+
+BROKERS = {
+    'local': LocalBroker,
+    'postgres': PostgresBroker,
+}
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        _broker = BROKERS[settings.REALTIME_BROKER]()
+    return _broker
+
+
+def company_channels(*company_ids):
+    return {f"company:{company_id}" for company_id in company_ids if company_id is not None}
+
+
+def publish(channels, event):
+    """
+    Publish ``event`` to ``channels`` once the current transaction commits.
+
+    Signals cover single saves; bulk paths (``bulk_update``, ``update()``)
+    call this directly for the rows they change.
+    """
+    channels = set(channels)
+    if not channels:
+        return
+    transaction.on_commit(lambda: _publish_now(channels, event))
+
+
+def _publish_now(channels, event):
+    try:
+        get_broker().publish(channels, event)
+    except Exception:
+        # Push is best-effort; clients resync through the REST endpoints
+        logger.exception("Failed to publish realtime event %s", event)
+
+
+def model_event(instance, created):
+    """Event payload for a created or updated request row"""
+    return row_event(instance._meta.model, instance.pk, instance.status, created)
+
+
+def row_event(model, pk, status, created=False):
+    """Event payload for a row changed without a model instance (bulk paths)"""
+    return {
+        'type': model._meta.model_name,
+        'action': 'created' if created else 'updated',
+        'id': pk,
+        'status': status,
+    }
+
+
+async def _user_channels(user):
+    company_ids = [
+        pk async for pk in user.get_accessible_companies().values_list('pk', flat=True)
+    ]
+    return company_channels(*company_ids) | {f"user:{user.pk}"}
+
+
+def _format(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def _stream(subscription):
+    try:
+        yield f"retry: {settings.REALTIME_RETRY_MS}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), timeout=settings.REALTIME_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Comment line: keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                continue
+            yield _format(event)
+    finally:
+        hub.unsubscribe(subscription)
+
+
+NOT_ASGI = {'detail': 'Event streams are only served by the ASGI app (main.asgi:application).'}
+
+
+class EventTicketView(APIView):
+    """Issue a ticket opening one event stream as the caller"""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        return Response({'ticket': issue_ticket(request.user), 'expires_in': settings.REALTIME_TICKET_SECONDS})
+
+
+@async_api_view(ticket_query_param='ticket')
+async def event_stream(request, user):
+    """
+    Server-sent events for bench, resource and admin requests involving the
+    caller's companies, opened with ``?ticket=`` from EventTicketView.
+    Channels are fixed when the stream opens.
+    """
+    if not isinstance(request, ASGIRequest):
+        return json_response(NOT_ASGI, status.HTTP_501_NOT_IMPLEMENTED)
+
+    await get_broker().start()
+    subscription = hub.subscribe(await _user_channels(user))
+    # Django only closes this request's connections once the response does:
+    # give them back (to the pool) now, or every open stream would hold one
+    await sync_to_async(connections.close_all)()
+
+    response = StreamingHttpResponse(_stream(subscription), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
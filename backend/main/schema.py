@@ -0,0 +1,170 @@
+"""
+OpenAPI schema: generated once per code version and served from disk.
+"""
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_safe
+
+# drf_yasg is only imported once the schema or a documentation page is needed,
+# so workers that never serve them do not pay for it at boot.
+
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'yaml': 'application/yaml',
+}
+
+_generate_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def get_api_info():
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title="Employee Management System API",
+        default_version='v1',
+        description="""
+        # Employee Management System API Documentation
+        
+        This API allows companies to manage their bench employees and request employees from other companies.
+        
+        ## Authentication
+        This API uses JWT (JSON Web Token) authentication. To use authenticated endpoints:
+        1. Register a new user at `/api/auth/register/`
+        2. Login at `/api/auth/login/` to get your access token
+        3. Click the 'Authorize' button (🔒) at the top right
+        4. Enter: `Bearer <your_access_token>`
+        5. Click 'Authorize' and 'Close'
+        
+        ## Key Features
+        - User registration and authentication with email/password
+        - Company management
+        - Employee management with status tracking
+        - Bench request system for inter-company employee allocation
+        - Role-based access control (Admin, Company User)
+        
+        ## Roles
+        - **Admin**: Full access to all resources
+        - **Company User**: Access to their own company's data only
+        """,
+        terms_of_service="https://www.example.com/terms/",
+        contact=openapi.Contact(email="contact@example.com"),
+        license=openapi.License(name="MIT License"),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_schema_view():
+    """Swagger/OpenAPI schema view, built on first use"""
+    from drf_yasg.views import get_schema_view as build_schema_view
+    from rest_framework import permissions
+
+    return build_schema_view(
+        get_api_info(),
+        public=True,
+        permission_classes=(permissions.AllowAny,),
+    )
+
+
+@lru_cache(maxsize=None)
+def _ui_view(renderer):
+    return get_schema_view().with_ui(renderer, cache_timeout=settings.SCHEMA_CACHE_MAX_AGE)
+
+
+def schema_ui(request, renderer):
+    """Swagger UI or ReDoc page; both load the precomputed /swagger.json"""
+    return _ui_view(renderer)(request)
+
+
+def _codec(fmt):
+    from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+
+    return {'json': OpenAPICodecJson, 'yaml': OpenAPICodecYaml}[fmt](validators=[])
+
+
+def _source_files():
+    """The Python files of the project's own apps, sorted by path"""
+    base = Path(settings.BASE_DIR).resolve()
+    paths = []
+    for app_config in apps.get_app_configs():
+        root = Path(app_config.path).resolve()
+        if base not in root.parents:
+            # Django and third-party apps
+            continue
+        for dirpath, dirs, files in os.walk(root):
+            # Not code: dot-directories, caches and any virtualenv inside an app
+            dirs[:] = [
+                d for d in dirs
+                if not d.startswith(('.', '__')) and not os.path.exists(os.path.join(dirpath, d, 'pyvenv.cfg'))
+            ]
+            paths.extend(Path(dirpath, name) for name in files if name.endswith('.py'))
+    return base, sorted(paths)
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    """
+    Version the schema is keyed on: ``CODE_VERSION`` when set at deploy time,
+    otherwise a hash of the project apps' Python sources (relative paths and
+    contents), so identical code has the same version on every host.
+    """
+    if settings.CODE_VERSION:
+        return settings.CODE_VERSION
+
+    digest = hashlib.sha256()
+    base, paths = _source_files()
+    for path in paths:
+        digest.update(path.relative_to(base).as_posix().encode() + b'\0')
+        digest.update(path.read_bytes() + b'\0')
+    return digest.hexdigest()[:16]
+
+
+def schema_path(fmt, version=None):
+    return settings.SCHEMA_CACHE_DIR / f"openapi-{version or code_version()}.{fmt}"
+
+
+def generate_schema(version=None):
+    """Generate the schema and write every format for ``version`` to disk"""
+    version = version or code_version()
+    generator = get_schema_view().generator_class(get_api_info())
+    schema = generator.get_schema(request=None, public=True)
+
+    settings.SCHEMA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    for fmt in CONTENT_TYPES:
+        path = schema_path(fmt, version)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(_codec(fmt).encode(schema))
+        os.replace(tmp_path, path)
+    return version
+
+
+def load_schema(fmt):
+    """Return the schema bytes for the running code, generating them if missing"""
+    path = schema_path(fmt)
+    if not path.exists():
+        with _generate_lock:
+            if not path.exists():
+                generate_schema()
+    return path.read_bytes()
+
+
+def _schema_etag(request, format):
+    return f"{code_version()}-{format.lstrip('.')}"
+
+
+@require_safe
+@condition(etag_func=_schema_etag)
+def cached_schema(request, format):
+    """Serve the precomputed schema as JSON or YAML with long-lived caching"""
+    fmt = format.lstrip('.')
+    response = HttpResponse(load_schema(fmt), content_type=CONTENT_TYPES[fmt])
+    patch_cache_control(response, public=True, max_age=settings.SCHEMA_CACHE_MAX_AGE)
+    return response
@@ -0,0 +1,289 @@
+"""
+Shared serializer helpers used by the app-level serializers.
+"""
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import MANY_RELATION_KWARGS, ManyRelatedField, PrimaryKeyRelatedField
+
+
+def _split_param(request, name):
+    value = request.query_params.get(name, '')
+    return {part.strip() for part in value.split(',') if part.strip()}
+
+
+def select_fields(request, field_names):
+    """
+    Return the subset of ``field_names`` kept by ``?fields=`` / ``?omit=``,
+    preserving order, or None when the request asks for the full output.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+
+    wanted = _split_param(request, 'fields')
+    omitted = _split_param(request, 'omit')
+    if not wanted and not omitted:
+        return None
+
+    return tuple(
+        name for name in field_names
+        if (not wanted or name in wanted) and name not in omitted
+    )
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin that drops fields not selected by ``?fields=a,b`` or
+    listed in ``?omit=c`` on read requests. Only the top-level serializer is
+    pruned; nested serializers keep their declared fields.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = select_fields(self.context.get('request'), list(self.fields))
+        if selected is not None:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+
+
+def _column_accessor(index, convert):
+    """Return a callable reading one column of a values_list() row."""
+    if convert is None:
+        return itemgetter(index)
+
+    def access(row):
+        value = row[index]
+        return None if value is None else convert(value)
+
+    return access
+
+
+def _computed_accessor(indexes, function, convert):
+    """Return a callable deriving a value from several columns of a row."""
+    def access(row):
+        value = function(*[row[index] for index in indexes])
+        if value is None or convert is None:
+            return value
+        return convert(value)
+
+    return access
+
+
+class BulkIdsSerializer(serializers.Serializer):
+    """Base for bulk actions: the ids of the objects to apply the action to"""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.BULK_MAX_IDS,
+    )
+
+
+class BatchedPrimaryKeyRelatedField(PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField that resolves keys in bulk: its ``many=True`` form
+    loads all objects with one query instead of one per key, and
+    ``preload()`` lets BatchedListSerializer resolve the keys of every item
+    up front. Use it as a ModelSerializer's ``serializer_related_field``.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._preloaded = {}
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BatchedManyRelatedField(**list_kwargs)
+
+    def _to_pk(self, data):
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        if isinstance(data, bool):
+            raise TypeError
+        return self.get_queryset().model._meta.pk.to_python(data)
+
+    def preload(self, values):
+        """Fetch the objects for the raw keys ``values`` with one query"""
+        pks = set()
+        for value in values:
+            try:
+                pks.add(self._to_pk(value))
+            except (TypeError, ValueError, DjangoValidationError):
+                # Reported when the item itself is validated
+                continue
+        self._preloaded = self.get_queryset().in_bulk(pks) if pks else {}
+
+    def resolve(self, values):
+        """Map raw keys to objects, querying once for those not preloaded"""
+        pks = []
+        for value in values:
+            try:
+                pks.append(self._to_pk(value))
+            except (TypeError, ValueError, DjangoValidationError):
+                self.fail('incorrect_type', data_type=type(value).__name__)
+
+        objects = dict(self._preloaded)
+        missing = set(pks) - objects.keys()
+        if missing:
+            objects.update(self.get_queryset().in_bulk(missing))
+        for pk in pks:
+            if pk not in objects:
+                self.fail('does_not_exist', pk_value=pk)
+        return [objects[pk] for pk in pks]
+
+    def to_internal_value(self, data):
+        return self.resolve([data])[0]
+
+
+class BatchedManyRelatedField(ManyRelatedField):
+    """``many=True`` form of BatchedPrimaryKeyRelatedField"""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        return self.child_relation.resolve(data)
+
+
+class BatchedListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer that resolves the related keys of all items with one query
+    per BatchedPrimaryKeyRelatedField before validating the items.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            items = [item for item in data if isinstance(item, dict)]
+            for name, field in self.child.fields.items():
+                if field.read_only:
+                    continue
+                if isinstance(field, BatchedManyRelatedField):
+                    field.child_relation.preload(
+                        value
+                        for item in items if isinstance(item.get(name), list)
+                        for value in item[name]
+                    )
+                elif isinstance(field, BatchedPrimaryKeyRelatedField):
+                    field.preload(item[name] for item in items if name in item)
+        return super().to_internal_value(data)
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer that renders rows fetched with ``.values_list()``.
+
+    ``serializer_class`` points at an existing ModelSerializer. Its readable
+    fields are compiled once into column accessors (``company.name`` becomes
+    the ``company__name`` lookup) that reuse the original fields'
+    ``to_representation``, so the output is identical to the ModelSerializer
+    without building model instances or walking attributes per row.
+
+    Fields whose source is a model method rather than a column (for example
+    ``get_full_name``) are declared in ``computed`` as
+    ``field_name: (lookups, function)``.
+
+    ``fields`` restricts the output (and the selected columns) to a subset of
+    the serializer's fields, as returned by ``select_fields``.
+    """
+
+    serializer_class = None
+    computed = {}
+
+    def __init__(self, rows, fields=None):
+        self.rows = rows
+        self.fields = fields
+
+    @classmethod
+    def get_plan(cls, fields=None):
+        """Return the cached ``(lookups, accessors)`` plan for ``fields``"""
+        plans = cls.__dict__.get('_plans')
+        if plans is None:
+            plans = cls._plans = {}
+        key = None if fields is None else frozenset(fields)
+        plan = plans.get(key)
+        if plan is None:
+            plan = plans[key] = cls._compile(key)
+        return plan
+
+    @classmethod
+    def _compile(cls, fields):
+        if cls.serializer_class is None:
+            raise ImproperlyConfigured(f"{cls.__name__} must define 'serializer_class'.")
+
+        model = cls.serializer_class.Meta.model
+        lookups = []
+
+        def column(lookup):
+            if lookup not in lookups:
+                lookups.append(lookup)
+            return lookups.index(lookup)
+
+        accessors = []
+        for field in cls.serializer_class()._readable_fields:
+            if fields is not None and field.field_name not in fields:
+                continue
+
+            convert = field.to_representation
+            if isinstance(field, PrimaryKeyRelatedField):
+                # values_list() already yields the raw primary key
+                convert = field.pk_field.to_representation if field.pk_field else None
+
+            if field.field_name in cls.computed:
+                field_lookups, function = cls.computed[field.field_name]
+                indexes = [column(lookup) for lookup in field_lookups]
+                accessors.append((field.field_name, _computed_accessor(indexes, function, convert)))
+                continue
+
+            lookup = cls._lookup_for(model, field)
+            accessors.append((field.field_name, _column_accessor(column(lookup), convert)))
+
+        # values_list() without lookups would select every column
+        return tuple(lookups) or ('pk',), tuple(accessors)
+
+    @classmethod
+    def _lookup_for(cls, model, field):
+        """Translate a field's dotted source into a ``.values()`` lookup"""
+        current = model
+        for attr in field.source_attrs:
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                raise ImproperlyConfigured(
+                    f"{cls.__name__}: '{field.field_name}' is sourced from "
+                    f"'{field.source}', which is not a column; declare it in 'computed'."
+                )
+            if model_field.many_to_many or model_field.one_to_many:
+                raise ImproperlyConfigured(
+                    f"{cls.__name__}: '{field.field_name}' spans a to-many relation."
+                )
+            if model_field.is_relation:
+                current = model_field.related_model
+        return '__'.join(field.source_attrs)
+
+    @classmethod
+    def values(cls, queryset, fields=None):
+        """Return ``queryset`` as the values_list() this serializer expects"""
+        lookups, _ = cls.get_plan(fields)
+        # Prefetches only apply to model instances
+        return queryset.prefetch_related(None).values_list(*lookups)
+
+    @classmethod
+    def field_names(cls):
+        return [field.field_name for field in cls.serializer_class()._readable_fields]
+
+    @property
+    def data(self):
+        _, accessors = self.get_plan(self.fields)
+        return [
+            {name: access(row) for name, access in accessors}
+            for row in self.rows
+        ]
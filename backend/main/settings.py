@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 from decouple import config, Csv
+from django.core.exceptions import ImproperlyConfigured
 from datetime import timedelta
 import os
 
@@ -48,9 +49,12 @@ INSTALLED_APPS = [
     'drf_yasg',
     
     # Local apps
+    'main',
     'accounts',
     'companies',
     'employees',
+    'outbox',
+    'jobs',
 ]
 
 MIDDLEWARE = [
@@ -98,11 +102,76 @@ DATABASES = {
         'PORT': config('DB_PORT', default='5432'),
         'CONN_MAX_AGE': 600,  # Connection persistence
         'OPTIONS': {
-            'connect_timeout': 10,
+            'connect_timeout': config('DB_CONNECT_TIMEOUT', default=10, cast=int),
         },
     }
 }
 
+# Connection pooling (psycopg 3 with psycopg_pool). Each worker process keeps
+# a pool shared by its threads; connections go back to it after every request,
+# so persistent connections (CONN_MAX_AGE) are turned off while it is enabled.
+# Pool statistics are served at /api/health/ready/.
+if config('DB_POOL', default=True, cast=bool):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+        'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+        # Seconds a request waits for a free connection before failing
+        'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+        # Close idle connections above min_size, and recycle every connection
+        # periodically so a failover does not leave stale ones behind
+        'max_idle': config('DB_POOL_MAX_IDLE', default=300, cast=float),
+        'max_lifetime': config('DB_POOL_MAX_LIFETIME', default=1800, cast=float),
+        # Give up reconnecting (and fail readiness) after this many seconds
+        'reconnect_timeout': config('DB_POOL_RECONNECT_TIMEOUT', default=60, cast=float),
+    }
+    # Health check on checkout (ConnectionPool.check_connection): a connection
+    # broken by a failover is replaced instead of failing the request
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Read replicas (comma-separated host[:port], same name and credentials as the
+# primary). Safe viewset requests read from one at random; see main/db_router.py
+DATABASE_READ_REPLICAS = []
+for index, replica in enumerate(config('DB_REPLICAS', default='', cast=Csv()), start=1):
+    host, _, port = replica.partition(':')
+    alias = f'replica_{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        # Not shared with default's OPTIONS
+        'OPTIONS': {**DATABASES['default']['OPTIONS']},
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_READ_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['main.db_router.ReplicaRouter']
+
+# Seconds a user's reads stay on the primary after they write, to cover replica lag
+DB_REPLICA_PIN_SECONDS = config('DB_REPLICA_PIN_SECONDS', default=5, cast=int)
+
+# Cache (replica pins, event stream tickets, paginated counts). These must be
+# seen by every worker process: 'locmem' is per process and only suits a
+# single worker; 'database' needs `manage.py createcachetable`; 'redis' needs
+# the redis package and CACHE_LOCATION=redis://host:6379/0
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', ''),
+    'database': ('django.core.cache.backends.db.DatabaseCache', 'django_cache'),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://localhost:6379/0'),
+}
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(f"CACHE_BACKEND must be one of {', '.join(CACHE_BACKENDS)}.")
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': config('CACHE_LOCATION', default='') or CACHE_BACKENDS[CACHE_BACKEND][1],
+    }
+}
+if DATABASE_READ_REPLICAS and CACHE_BACKEND == 'locmem':
+    # Read-your-writes pins would not reach the worker serving the next read
+    raise ImproperlyConfigured("DB_REPLICAS needs a shared cache: set CACHE_BACKEND to 'database' or 'redis'.")
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -156,7 +225,17 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # orjson-backed JSON with a stdlib fallback when orjson is unavailable
+    'DEFAULT_RENDERER_CLASSES': (
+        'main.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'main.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'main.pagination.EstimatedCountPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': [
         'rest_framework.filters.SearchFilter',
@@ -164,6 +243,41 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Batch endpoint limits (/api/batch/)
+BATCH_MAX_REQUESTS = config('BATCH_MAX_REQUESTS', default=20, cast=int)
+BATCH_TIME_BUDGET_SECONDS = config('BATCH_TIME_BUDGET_SECONDS', default=5.0, cast=float)
+
+# Most objects one bulk action (e.g. bulk-respond) may touch
+BULK_MAX_IDS = config('BULK_MAX_IDS', default=500, cast=int)
+
+# Expiry sweeps (manage.py sweep_expired): pending requests older than the TTL
+# expire; listings past their expected end date close
+REQUEST_TTL_DAYS = config('REQUEST_TTL_DAYS', default=30, cast=int)
+SWEEP_BATCH_SIZE = config('SWEEP_BATCH_SIZE', default=500, cast=int)
+
+# Paginated counts (main/pagination.py): counts up to the threshold are exact
+# and cached briefly; past it the planner's row estimate replaces COUNT(*)
+PAGINATION_ESTIMATE_THRESHOLD = config('PAGINATION_ESTIMATE_THRESHOLD', default=10000, cast=int)
+PAGINATION_COUNT_CACHE_SECONDS = config('PAGINATION_COUNT_CACHE_SECONDS', default=10, cast=int)
+
+# Real-time events (SSE at /api/events/stream/, served by the ASGI app)
+# 'local' delivers within one process; 'postgres' fans out across workers with LISTEN/NOTIFY
+REALTIME_BROKER = config('REALTIME_BROKER', default='local')
+REALTIME_QUEUE_SIZE = config('REALTIME_QUEUE_SIZE', default=100, cast=int)
+REALTIME_HEARTBEAT_SECONDS = config('REALTIME_HEARTBEAT_SECONDS', default=15, cast=int)
+REALTIME_RETRY_MS = config('REALTIME_RETRY_MS', default=5000, cast=int)
+# Lifetime of the single-use tickets that open a stream (POST /api/events/ticket/)
+REALTIME_TICKET_SECONDS = config('REALTIME_TICKET_SECONDS', default=30, cast=int)
+if REALTIME_BROKER != 'local' and CACHE_BACKEND == 'locmem':
+    # A ticket redeemed on one worker could be redeemed again on another
+    raise ImproperlyConfigured("REALTIME_BROKER=postgres needs a shared cache: set CACHE_BACKEND to 'database' or 'redis'.")
+
+# Background jobs (`manage.py run_workers`)
+JOBS_MAX_ATTEMPTS = config('JOBS_MAX_ATTEMPTS', default=5, cast=int)
+JOBS_BACKOFF_SECONDS = config('JOBS_BACKOFF_SECONDS', default=10, cast=int)
+JOBS_BACKOFF_MAX_SECONDS = config('JOBS_BACKOFF_MAX_SECONDS', default=3600, cast=int)
+JOBS_LOCK_TIMEOUT_SECONDS = config('JOBS_LOCK_TIMEOUT_SECONDS', default=600, cast=int)
+
 # JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=config('JWT_ACCESS_TOKEN_LIFETIME_HOURS', default=1, cast=int)),
@@ -239,8 +353,20 @@ SWAGGER_SETTINGS = {
     'DOC_EXPANSION': 'list',
     'OPERATIONS_SORTER': 'alpha',
     'TAGS_SORTER': 'alpha',
+    # The UI fetches the precomputed schema instead of regenerating it
+    'SPEC_URL': ('schema-json', {'format': '.json'}),
 }
 
 REDOC_SETTINGS = {
     'LAZY_RENDERING': False,
+    'SPEC_URL': ('schema-json', {'format': '.json'}),
 }
+
+# Precomputed OpenAPI schema (see `manage.py generate_schema`)
+# CODE_VERSION keys the cached files; when empty a fingerprint of the sources is used
+CODE_VERSION = config('CODE_VERSION', default='')
+SCHEMA_CACHE_DIR = Path(config('SCHEMA_CACHE_DIR', default=str(BASE_DIR / 'schema_cache')))
+SCHEMA_CACHE_MAX_AGE = config('SCHEMA_CACHE_MAX_AGE', default=86400, cast=int)
+
+# Prime URL resolvers and serializer caches in wsgi.py/asgi.py before serving
+WARM_UP_ON_STARTUP = config('WARM_UP_ON_STARTUP', default=False, cast=bool)
@@ -0,0 +1,16 @@
+'use strict';
+{
+    const $ = django.jQuery;
+
+    // AutocompleteListFilter: reload the changelist filtered on the chosen object
+    $(function() {
+        $('select[data-filter-param]').on('change', function() {
+            const params = new URLSearchParams(this.closest('[data-filter-base]').dataset.filterBase);
+            params.delete('p');
+            if (this.value) {
+                params.set(this.dataset.filterParam, this.value);
+            }
+            window.location.search = params.toString();
+        });
+    });
+}
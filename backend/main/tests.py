@@ -0,0 +1,97 @@
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver
+
+from accounts.models import User
+from companies.models import Company
+from employees.serializers import BenchRequestBulkResponseSerializer, EmployeeCreateSerializer, EmployeeListSerializer
+from .authentication import issue_ticket
+from .pagination import count_rows
+from .warmup import _serializer_classes, _views
+
+
+def _holds_connection():
+    return connection.connection is not None
+
+
+class EventStreamTests(TransactionTestCase):
+    """Open event streams must not keep database connections"""
+
+    # More than the default DB_POOL_MAX_SIZE
+    streams = 12
+
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('In-memory SQLite connections are never closed')
+        self.user = User.objects.create_user(email='stream@example.com', first_name='Stream', last_name='User')
+        Company.objects.create(name='Stream Company', email='company@example.com', admin_user=self.user)
+
+    async def open_stream(self, client, ticket):
+        response = await client.get('/api/events/stream/', {'ticket': ticket})
+        self.assertEqual(response.status_code, 200)
+        # The retry hint: the view has returned and the stream is open
+        await anext(aiter(response.streaming_content))
+        return response
+
+    async def test_open_streams_hold_no_connection(self):
+        client = AsyncClient()
+        for _ in range(self.streams):
+            # Like the ASGI handler: each request's sync work on its own thread
+            async with ThreadSensitiveContext():
+                await self.open_stream(client, issue_ticket(self.user))
+                self.assertFalse(await sync_to_async(_holds_connection)())
+
+    async def test_ticket_opens_one_stream(self):
+        client = AsyncClient()
+        ticket = issue_ticket(self.user)
+        async with ThreadSensitiveContext():
+            await self.open_stream(client, ticket)
+        response = await client.get('/api/events/stream/', {'ticket': ticket})
+        self.assertEqual(response.status_code, 401)
+
+
+@override_settings(PAGINATION_ESTIMATE_THRESHOLD=3)
+class CountRowsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(email='counts@example.com')
+        Company.objects.bulk_create([
+            Company(name=f'Company {i}', email=f'company{i}@example.com', admin_user=user) for i in range(5)
+        ])
+
+    def count(self, queryset):
+        with CaptureQueriesContext(connection) as queries:
+            result = count_rows(queryset)
+        return result, len(queries)
+
+    def test_small_counts_take_one_query_then_the_cache(self):
+        companies = Company.objects.filter(name__in=['Company 1', 'Company 2'])
+
+        self.assertEqual(self.count(companies), ((2, False, False), 1))
+        self.assertEqual(self.count(companies), ((2, False, True), 0))
+
+    def test_counts_past_the_threshold_are_not_capped(self):
+        (count, is_estimate, _), _ = self.count(Company.objects.all())
+
+        if connection.vendor == 'postgresql':
+            self.assertTrue(is_estimate)
+            self.assertGreaterEqual(count, 4)
+        else:
+            self.assertEqual((count, is_estimate), (5, False))
+
+
+class WarmUpTests(TestCase):
+
+    def test_primes_the_serializer_of_every_action(self):
+        serializer_classes = {
+            serializer_class for view in _views(get_resolver()) for serializer_class in _serializer_classes(view)
+        }
+
+        self.assertLessEqual(
+            {EmployeeCreateSerializer, EmployeeListSerializer, BenchRequestBulkResponseSerializer},
+            serializer_classes,
+        )
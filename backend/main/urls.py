@@ -18,59 +18,31 @@ from django.contrib import admin
 from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-# Swagger/OpenAPI Schema
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Employee Management System API",
-        default_version='v1',
-        description="""
-        # Employee Management System API Documentation
-        
-        This API allows companies to manage their bench employees and request employees from other companies.
-        
-        ## Authentication
-        This API uses JWT (JSON Web Token) authentication. To use authenticated endpoints:
-        1. Register a new user at `/api/auth/register/`
-        2. Login at `/api/auth/login/` to get your access token
-        3. Click the 'Authorize' button (🔒) at the top right
-        4. Enter: `Bearer <your_access_token>`
-        5. Click 'Authorize' and 'Close'
-        
-        ## Key Features
-        - User registration and authentication with email/password
-        - Company management
-        - Employee management with status tracking
-        - Bench request system for inter-company employee allocation
-        - Role-based access control (Admin, Company User)
-        
-        ## Roles
-        - **Admin**: Full access to all resources
-        - **Company User**: Access to their own company's data only
-        """,
-        terms_of_service="https://www.example.com/terms/",
-        contact=openapi.Contact(email="contact@example.com"),
-        license=openapi.License(name="MIT License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
+from .batch import BatchView
+from .health import liveness, readiness
+from .realtime import EventTicketView, event_stream
+from .schema import cached_schema, schema_ui
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     
-    # Swagger/OpenAPI Documentation
-    re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
-    path('', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui-root'),  # Root URL shows Swagger
+    # Swagger/OpenAPI Documentation (the UIs load the precomputed /swagger.json)
+    re_path(r'^swagger(?P<format>\.json|\.yaml)$', cached_schema, name='schema-json'),
+    path('swagger/', schema_ui, {'renderer': 'swagger'}, name='schema-swagger-ui'),
+    path('redoc/', schema_ui, {'renderer': 'redoc'}, name='schema-redoc'),
+    path('', schema_ui, {'renderer': 'swagger'}, name='schema-swagger-ui-root'),  # Root URL shows Swagger
     
+    # Probes
+    path('api/health/', liveness, name='api-health'),
+    path('api/health/ready/', readiness, name='api-health-ready'),
+
     # API endpoints
+    path('api/batch/', BatchView.as_view(), name='api-batch'),
+    path('api/events/ticket/', EventTicketView.as_view(), name='api-event-ticket'),
+    path('api/events/stream/', event_stream, name='api-event-stream'),
     path('api/auth/', include('accounts.urls')),
     path('api/companies/', include('companies.urls')),
+    path('api/outbox/', include('outbox.urls')),
     path('api/', include('employees.urls')),
 ]
 
@@ -0,0 +1,77 @@
+"""
+Optional worker warm-up, run before a worker accepts traffic.
+"""
+import logging
+import time
+
+from django.apps import apps
+from django.urls import URLResolver, get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def _views(resolver):
+    """Yield the DRF view functions routed by ``resolver`` and its includes"""
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _views(pattern)
+            continue
+        if getattr(pattern.callback, 'cls', None) is not None:
+            yield pattern.callback
+
+
+def _serializer_classes(view):
+    """
+    Yield the serializer class ``view`` picks for each action it routes.
+    ``get_serializer_class()`` only sees ``action``, like under schema
+    generation, so it must not depend on the request.
+    """
+    view_class = view.cls
+    if not hasattr(view_class, 'get_serializer_class'):
+        return
+    # A viewset's callback routes one action per method; other views have none
+    for action in set((getattr(view, 'actions', None) or {}).values()) or {None}:
+        instance = view_class(**view.initkwargs)
+        instance.action = action
+        instance.request = None
+        instance.args, instance.kwargs = (), {}
+        try:
+            yield instance.get_serializer_class()
+        except AssertionError:
+            # A generic view without a serializer
+            continue
+
+
+def warm_up():
+    """
+    Prime the caches the first requests would otherwise fill: the URL
+    resolver (importing every included urlconf and view module), model
+    ``_meta`` field caches, field construction for every serializer the views
+    pick, and the compiled ValuesSerializer plans.
+    """
+    started = time.monotonic()
+
+    resolver = get_resolver()
+    resolver.reverse_dict  # populates the resolver and its includes
+
+    for model in apps.get_models():
+        model._meta.get_fields()
+        model._meta._forward_fields_map
+
+    views = list(_views(resolver))
+    serializer_classes = {
+        serializer_class for view in views for serializer_class in _serializer_classes(view)
+    }
+    for serializer_class in serializer_classes:
+        serializer_class().fields
+
+    view_classes = {view.cls for view in views}
+    for view_class in view_classes:
+        for values_serializer_class in getattr(view_class, 'values_serializer_classes', {}).values():
+            values_serializer_class.get_plan()
+
+    logger.info(
+        "Warm-up primed %d views, %d serializers and %d models in %.1f ms",
+        len(view_classes), len(serializer_classes), len(apps.get_models()),
+        (time.monotonic() - started) * 1000,
+    )
@@ -0,0 +1,29 @@
+from django.contrib import admin
+from .models import OutboxEvent, OutboxConsumer
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    """Read-only admin for the append-only outbox"""
+
+    list_display = ('offset', 'event_type', 'topic', 'aggregate_id', 'created_at')
+    list_filter = ('topic', 'event_type')
+    search_fields = ('event_type', 'aggregate_id')
+    ordering = ('-id',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(OutboxConsumer)
+class OutboxConsumerAdmin(admin.ModelAdmin):
+    """Admin for outbox consumer cursors"""
+
+    list_display = ('name', 'offset', 'updated_at')
+    readonly_fields = ('updated_at',)
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from outbox.relay import relay_batch
+
+
+class Command(BaseCommand):
+    help = 'Assign offsets to committed outbox events so consumers can tail them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Events relayed per transaction')
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds to sleep when idle')
+        parser.add_argument('--once', action='store_true', help='Relay what is pending and exit')
+
+    def handle(self, *args, **options):
+        while True:
+            relayed = relay_batch(options['batch_size'])
+            if relayed:
+                self.stdout.write(f"Relayed {relayed} events")
+                continue
+            if options['once']:
+                return
+            time.sleep(options['interval'])
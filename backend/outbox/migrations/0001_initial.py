@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxConsumer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('offset', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Outbox Consumer',
+                'verbose_name_plural': 'Outbox Consumers',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('offset', models.BigIntegerField(blank=True, editable=False, null=True, unique=True)),
+                ('topic', models.CharField(help_text='Model label, e.g. employees.benchrequest', max_length=100)),
+                ('event_type', models.CharField(help_text='e.g. bench_request.approved', max_length=100)),
+                ('aggregate_id', models.BigIntegerField()),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Outbox Event',
+                'verbose_name_plural': 'Outbox Events',
+                'ordering': ['offset'],
+                'indexes': [models.Index(condition=models.Q(('offset__isnull', True)), fields=['id'], name='outbox_unrelayed_idx'), models.Index(fields=['topic', 'aggregate_id'], name='outbox_outb_topic_8a9794_idx')],
+            },
+        ),
+    ]
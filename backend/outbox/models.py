@@ -0,0 +1,98 @@
+from django.db import models
+
+
+class OutboxEventManager(models.Manager):
+
+    def record(self, instance, event_type, payload=None):
+        """
+        Append an event about ``instance``. Call inside the transaction that
+        makes the change, so the event exists exactly when the change does.
+        """
+        return self.create(
+            topic=instance._meta.label_lower,
+            event_type=event_type,
+            aggregate_id=instance.pk,
+            payload=payload or {},
+        )
+
+    def record_many(self, model, events):
+        """
+        Append events for rows changed in bulk, without model instances.
+        ``events`` yields ``(aggregate_id, event_type, payload)`` tuples.
+        """
+        return self.bulk_create([
+            self.model(
+                topic=model._meta.label_lower,
+                event_type=event_type,
+                aggregate_id=aggregate_id,
+                payload=payload,
+            )
+            for aggregate_id, event_type, payload in events
+        ])
+
+
+class OutboxEvent(models.Model):
+    """
+    Append-only record of a state transition, written in the same
+    transaction as the change itself.
+
+    ``offset`` is assigned by the relay (``manage.py relay_outbox``) once the
+    row is committed, in a single increasing sequence. Unlike the id, it
+    never lets a slow transaction commit "behind" a consumer that has already
+    read past it, so consumers can tail by offset without missing events.
+    """
+
+    offset = models.BigIntegerField(unique=True, null=True, blank=True, editable=False)
+    topic = models.CharField(max_length=100, help_text="Model label, e.g. employees.benchrequest")
+    event_type = models.CharField(max_length=100, help_text="e.g. bench_request.approved")
+    aggregate_id = models.BigIntegerField()
+    payload = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = OutboxEventManager()
+
+    class Meta:
+        verbose_name = 'Outbox Event'
+        verbose_name_plural = 'Outbox Events'
+        ordering = ['offset']
+        indexes = [
+            models.Index(
+                fields=['id'],
+                condition=models.Q(offset__isnull=True),
+                name='outbox_unrelayed_idx',
+            ),
+            models.Index(fields=['topic', 'aggregate_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.offset}: {self.event_type} #{self.aggregate_id}"
+
+
+class OutboxConsumer(models.Model):
+    """
+    Position of a named consumer in the outbox. The relay keeps its own row
+    (``RELAY``) holding the last offset it assigned.
+    """
+
+    RELAY = 'relay'
+
+    name = models.CharField(max_length=100, unique=True)
+    offset = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Outbox Consumer'
+        verbose_name_plural = 'Outbox Consumers'
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name} @ {self.offset}"
+
+    def poll(self, limit=100):
+        """Relayed events after this consumer's offset, oldest first"""
+        return OutboxEvent.objects.filter(offset__gt=self.offset).order_by('offset')[:limit]
+
+    def acknowledge(self, offset):
+        """Move the cursor forward to ``offset`` (never backwards)"""
+        OutboxConsumer.objects.filter(pk=self.pk, offset__lt=offset).update(offset=offset)
+        self.offset = max(self.offset, offset)
@@ -0,0 +1,32 @@
+"""
+Outbox relay: assigns offsets to committed events in batches.
+"""
+from django.db import transaction
+
+from .models import OutboxConsumer, OutboxEvent
+
+
+def relay_batch(batch_size=500):
+    """
+    Give the next ``batch_size`` committed events consecutive offsets and
+    return how many were relayed. The relay row is locked for the whole
+    batch, so concurrent relays serialise instead of handing out the same
+    offsets.
+    """
+    with transaction.atomic():
+        OutboxConsumer.objects.get_or_create(name=OutboxConsumer.RELAY)
+        relay = OutboxConsumer.objects.select_for_update().get(name=OutboxConsumer.RELAY)
+
+        events = list(
+            OutboxEvent.objects.filter(offset__isnull=True).order_by('id').only('id')[:batch_size]
+        )
+        if not events:
+            return 0
+
+        for offset, event in enumerate(events, start=relay.offset + 1):
+            event.offset = offset
+        OutboxEvent.objects.bulk_update(events, ['offset'])
+
+        relay.offset = events[-1].offset
+        relay.save(update_fields=['offset', 'updated_at'])
+    return len(events)
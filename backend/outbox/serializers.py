@@ -0,0 +1,11 @@
+from rest_framework import serializers
+from .models import OutboxEvent
+
+
+class OutboxEventSerializer(serializers.ModelSerializer):
+    """Serializer for OutboxEvent model"""
+
+    class Meta:
+        model = OutboxEvent
+        fields = ('offset', 'topic', 'event_type', 'aggregate_id', 'payload', 'created_at')
+        read_only_fields = fields
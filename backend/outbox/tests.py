@@ -0,0 +1,49 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from .models import OutboxEvent
+from .relay import relay_batch
+
+
+class OutboxRelayTests(TestCase):
+
+    def record(self, count, topic='employees.benchrequest'):
+        return OutboxEvent.objects.bulk_create([
+            OutboxEvent(topic=topic, event_type='bench_request.approved', aggregate_id=i)
+            for i in range(count)
+        ])
+
+    def test_offsets_continue_across_batches(self):
+        self.record(5)
+
+        self.assertEqual(relay_batch(batch_size=3), 3)
+        self.assertEqual(relay_batch(batch_size=3), 2)
+        self.assertEqual(relay_batch(batch_size=3), 0)
+        self.assertEqual(
+            list(OutboxEvent.objects.order_by('id').values_list('offset', flat=True)), [1, 2, 3, 4, 5]
+        )
+
+        self.record(1)
+        relay_batch()
+        self.assertEqual(OutboxEvent.objects.order_by('-id').values_list('offset', flat=True)[0], 6)
+
+    def test_tail_by_offset(self):
+        self.record(3)
+        self.record(2, topic='employees.resourcerequest')
+        relay_batch()
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(email='staff@example.com', is_staff=True))
+
+        response = client.get('/api/outbox/events/', {'after': 1, 'limit': 2})
+        self.assertEqual([event['offset'] for event in response.data['events']], [2, 3])
+        self.assertEqual(response.data['next_after'], 3)
+
+        response = client.get('/api/outbox/events/', {'after': 3, 'topic': 'employees.resourcerequest'})
+        self.assertEqual([event['offset'] for event in response.data['events']], [4, 5])
+
+    def test_tail_is_staff_only(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(email='user@example.com'))
+
+        self.assertEqual(client.get('/api/outbox/events/').status_code, 403)
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import OutboxEventListView
+
+urlpatterns = [
+    path('events/', OutboxEventListView.as_view(), name='outbox-event-list'),
+]
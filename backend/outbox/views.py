@@ -0,0 +1,40 @@
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .models import OutboxEvent
+from .serializers import OutboxEventSerializer
+
+MAX_LIMIT = 1000
+
+
+class OutboxEventListView(APIView):
+    """
+    API endpoint to tail relayed outbox events (staff only).
+
+    Pass the last offset seen as ``?after=`` and continue from
+    ``next_after``; each page is a single index range scan.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            after = int(request.query_params.get('after', 0))
+            limit = min(int(request.query_params.get('limit', 100)), MAX_LIMIT)
+        except ValueError:
+            return Response(
+                {'error': 'after and limit must be integers.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        topic = request.query_params.get('topic')
+        events = OutboxEvent.objects.filter(offset__gt=after)
+        if topic:
+            events = events.filter(topic=topic)
+        events = list(events.order_by('offset')[:max(limit, 1)])
+
+        return Response({
+            'events': OutboxEventSerializer(events, many=True).data,
+            'next_after': events[-1].offset if events else after,
+        })
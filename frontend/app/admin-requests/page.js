@@ -3,7 +3,7 @@
 import { useState, useEffect } from 'react';
 import Link from 'next/link';
 import { useAuth } from '@/contexts/AuthContext';
-import { adminRequestAPI } from '@/lib/api';
+import { adminRequestAPI, subscribeToEvents } from '@/lib/api';
 import { useRouter } from 'next/navigation';
 import ProfileDropdown from '@/components/ProfileDropdown';
 
@@ -36,6 +36,12 @@ export default function AdminRequestsPage() {
     }
   }, [user, router]);
 
+  // Refetch when an admin access request for our companies changes
+  useEffect(() => {
+    if (!user || user.role !== 'company_user') return undefined;
+    return subscribeToEvents(['adminrequest'], () => fetchRequests());
+  }, [user]);
+
   const fetchRequests = async () => {
     setLoading(true);
     setError('');
@@ -3,7 +3,7 @@
 import { useState, useEffect } from "react";
 import Link from "next/link";
 import { useAuth } from "@/contexts/AuthContext";
-import { employeeAPI, companyAPI, requestAPI } from "@/lib/api";
+import { batchAPI } from "@/lib/api";
 import { useRouter } from "next/navigation";
 import ProfileDropdown from "@/components/ProfileDropdown";
 
@@ -42,11 +42,11 @@ export default function DashboardPage() {
     try {
       // Fetch employees with different statuses
       const [allEmployees, availableEmp, companies, requests] =
-        await Promise.all([
-          employeeAPI.getAll({ page_size: 100 }),
-          employeeAPI.getAvailable(),
-          companyAPI.getAll({ page_size: 100 }),
-          requestAPI.getPending(),
+        await batchAPI.all([
+          { path: "/api/employees/", params: { page_size: 100 } },
+          { path: "/api/employees/available/" },
+          { path: "/api/companies/", params: { page_size: 100 } },
+          { path: "/api/requests/pending/" },
         ]);
 
       // Calculate statistics
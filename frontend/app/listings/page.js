@@ -15,6 +15,7 @@ export default function ListingsPage() {
   const [error, setError] = useState('');
   const [currentPage, setCurrentPage] = useState(1);
   const [totalPages, setTotalPages] = useState(1);
+  const [countIsEstimate, setCountIsEstimate] = useState(false);
   const [filters, setFilters] = useState({
     search: '',
     status: 'active',
@@ -50,6 +51,8 @@ export default function ListingsPage() {
       if (response.data.count) {
         setTotalPages(Math.ceil(response.data.count / 10));
       }
+      // Large result sets report a planner estimate rather than an exact count
+      setCountIsEstimate(Boolean(response.data.count_is_estimate));
     } catch (err) {
       console.error('Failed to fetch listings:', err);
       setError('Failed to load resource listings');
@@ -333,7 +336,7 @@ export default function ListingsPage() {
                   Previous
                 </button>
                 <span className="text-sm text-gray-600">
-                  Page {currentPage} of {totalPages}
+                  Page {currentPage} of {countIsEstimate ? 'about ' : ''}{totalPages}
                 </span>
                 <button
                   onClick={() => setCurrentPage(prev => Math.min(totalPages, prev + 1))}
@@ -4,7 +4,7 @@ import { useState, useEffect } from 'react';
 import Link from 'next/link';
 import { useAuth } from '@/contexts/AuthContext';
 import { useRouter } from 'next/navigation';
-import { requestAPI } from '@/lib/api';
+import { requestAPI, subscribeToEvents } from '@/lib/api';
 import ProfileDropdown from '@/components/ProfileDropdown';
 
 export default function RequestsPage() {
@@ -33,6 +33,12 @@ export default function RequestsPage() {
     }
   }, [user]);
 
+  // Refetch when a bench request involving our companies changes
+  useEffect(() => {
+    if (!user) return undefined;
+    return subscribeToEvents(['benchrequest'], () => fetchRequests());
+  }, [user]);
+
   const fetchRequests = async () => {
     setLoading(true);
     setError('');
@@ -79,6 +85,7 @@ export default function RequestsPage() {
       case 'rejected':
         return 'badge-rejected';
       case 'cancelled':
+      case 'expired':
         return 'bg-gray-100 text-gray-800';
       default:
         return 'badge-pending';
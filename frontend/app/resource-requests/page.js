@@ -4,7 +4,7 @@ import { useState, useEffect } from 'react';
 import { useRouter } from 'next/navigation';
 import Link from 'next/link';
 import { useAuth } from '@/contexts/AuthContext';
-import { resourceRequestAPI } from '@/lib/api';
+import { resourceRequestAPI, subscribeToEvents } from '@/lib/api';
 import ProfileDropdown from '@/components/ProfileDropdown';
 
 export default function ResourceRequestsPage() {
@@ -33,6 +33,12 @@ export default function ResourceRequestsPage() {
     }
   }, [user, activeTab]);
 
+  // Refetch when a resource request involving our companies changes
+  useEffect(() => {
+    if (!user) return undefined;
+    return subscribeToEvents(['resourcerequest'], () => fetchRequests());
+  }, [user, activeTab]);
+
   const fetchRequests = async () => {
     setLoading(true);
     setError('');
@@ -91,6 +97,7 @@ export default function ResourceRequestsPage() {
       case 'rejected':
         return 'badge-rejected';
       case 'cancelled':
+      case 'expired':
         return 'bg-gray-100 text-gray-800';
       default:
         return 'badge-pending';
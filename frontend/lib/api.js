@@ -143,6 +143,87 @@ export const resourceRequestAPI = {
   delete: (id) => api.delete(`/api/resource-requests/${id}/`),
 };
 
+// Batch API: several calls in one round-trip
+export const batchAPI = {
+  run: (requests) => api.post('/api/batch/', { requests }),
+  // Resolves to one { status, data } per request, rejecting if any failed
+  all: async (requests) => {
+    const response = await api.post('/api/batch/', { requests });
+    const results = response.data.responses.map((item) => ({
+      status: item.status,
+      data: item.body,
+    }));
+    const failed = results.find((item) => item.status >= 400);
+    if (failed) {
+      throw new Error(`Batched request failed with status ${failed.status}`);
+    }
+    return results;
+  },
+};
+
+// Real-time events: calls onEvent for each pushed request event.
+// Streams need the ASGI server; when one never opens (e.g. WSGI answers 501)
+// this falls back to polling, sending 'reset' every EVENTS_POLL_MS.
+// Returns a function closing the stream.
+const EVENTS_RETRY_MS = 5000;
+const EVENTS_POLL_MS = 30000;
+
+export const subscribeToEvents = (types, onEvent) => {
+  if (!localStorage.getItem('access_token') || typeof EventSource === 'undefined') {
+    return () => {};
+  }
+
+  let closed = false;
+  let source = null;
+  let timer = null;
+  const handler = (message) => onEvent(JSON.parse(message.data));
+
+  const poll = () => {
+    timer = setInterval(() => onEvent({ type: 'reset' }), EVENTS_POLL_MS);
+  };
+
+  const connect = async () => {
+    let ticket;
+    try {
+      // Single-use and short-lived, so the access token stays out of URLs and logs
+      ({ data: { ticket } } = await api.post('/api/events/ticket/'));
+    } catch (err) {
+      if (!closed) poll();
+      return;
+    }
+    if (closed) return;
+
+    let opened = false;
+    source = new EventSource(
+      `${API_URL}/api/events/stream/?ticket=${encodeURIComponent(ticket)}`
+    );
+    source.onopen = () => {
+      opened = true;
+    };
+    // 'reset' means events were dropped; listeners should refetch
+    [...types, 'reset'].forEach((type) => source.addEventListener(type, handler));
+    source.onerror = () => {
+      // The ticket is spent, so EventSource's own reconnect would be refused
+      source.close();
+      if (closed) return;
+      if (!opened) {
+        poll();
+        return;
+      }
+      onEvent({ type: 'reset' });
+      timer = setTimeout(connect, EVENTS_RETRY_MS);
+    };
+  };
+
+  connect();
+  return () => {
+    closed = true;
+    if (source) source.close();
+    clearTimeout(timer);
+    clearInterval(timer);
+  };
+};
+
 // Helper functions
 export const setAuthTokens = (access, refresh) => {
   localStorage.setItem('access_token', access);